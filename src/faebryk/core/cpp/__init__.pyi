@@ -8,6 +8,34 @@ import enum
 from collections.abc import Callable, Sequence, Set
 from typing import overload
 
+class BFSProfile:
+    @property
+    def searches(self) -> int: ...
+    @property
+    def paths(self) -> int: ...
+    @property
+    def peak_queue(self) -> int: ...
+    @property
+    def peak_arena_bytes(self) -> int: ...
+    @property
+    def time_setup_s(self) -> float: ...
+    @property
+    def time_search_s(self) -> float: ...
+    @property
+    def time_edges_s(self) -> float: ...
+    @property
+    def time_check_visited_s(self) -> float: ...
+    @property
+    def time_new_path_s(self) -> float: ...
+    @property
+    def time_set_insert_s(self) -> float: ...
+    @property
+    def time_deque_insert_s(self) -> float: ...
+    @property
+    def time_non_filter_s(self) -> float: ...
+    @property
+    def time_filter_s(self) -> float: ...
+
 class Counter:
     @property
     def in_cnt(self) -> int: ...
@@ -40,13 +68,21 @@ class Graph:
     def get_edges(self, arg: GraphInterface, /) -> dict[GraphInterface, Link]: ...
     @property
     def edges(self) -> list[tuple[GraphInterface, GraphInterface, Link]]: ...
+    def edges_since(
+        self, n: int
+    ) -> list[tuple[GraphInterface, GraphInterface, Link]]: ...
     def get_gifs(self) -> set[GraphInterface]: ...
     def invalidate(self) -> None: ...
     @property
+    def generation(self) -> int: ...
+    @property
+    def path_cache(self) -> PathCache: ...
+    @property
     def node_count(self) -> int: ...
     @property
     def edge_count(self) -> int: ...
     def node_projection(self) -> set[Node]: ...
+    def nodes_of_types(self, types: Sequence[type]) -> set[Node]: ...
     def nodes_by_names(self, arg: Set[str], /) -> list[tuple[Node, str]]: ...
     def bfs_visit(
         self,
@@ -192,12 +228,42 @@ class Path:
     def iterate_edges(self, arg: Callable[[Edge], bool], /) -> None: ...
     def __getitem__(self, arg: int, /) -> GraphInterface: ...
 
+class PathCache:
+    @property
+    def hits(self) -> int: ...
+    @property
+    def misses(self) -> int: ...
+    def __len__(self) -> int: ...
+    def clear(self) -> None: ...
+
+class PathFinderProfile:
+    @property
+    def queries(self) -> int: ...
+    @property
+    def cache_hits(self) -> int: ...
+    @property
+    def index_hits(self) -> int: ...
+    @property
+    def time_s(self) -> float: ...
+    @property
+    def bfs(self) -> BFSProfile: ...
+    @property
+    def counters(self) -> list[Counter]: ...
+
 def add(i: int, j: int = 1) -> int:
     """A function that adds two numbers"""
 
 def call_python_function(func: Callable[[], int]) -> int: ...
 def find_paths(src: Node, dst: Sequence[Node]) -> tuple[list[Path], list[Counter]]: ...
+def find_paths_many(srcs: Sequence[Node]) -> list[tuple[list[Path], list[Counter]]]: ...
+def get_pathfinder_profile() -> PathFinderProfile: ...
 def print_obj(obj: object) -> None: ...
+def reset_pathfinder_profile() -> None: ...
+def set_connectivity_index(value: bool) -> None: ...
+def set_frozen_adjacency(value: bool) -> None: ...
 def set_indiv_measure(value: bool) -> None: ...
 def set_leak_warnings(value: bool) -> None: ...
 def set_max_paths(arg0: int, arg1: int, arg2: int, /) -> None: ...
+def set_path_cache(value: bool) -> None: ...
+def set_pathfinder_profile(value: bool) -> None: ...
+def set_pathfinder_threads(threads: int) -> None: ...
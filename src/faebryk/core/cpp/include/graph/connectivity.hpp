@@ -0,0 +1,113 @@
+/* This file is part of the faebryk project
+ * SPDX-License-Identifier: MIT
+ */
+
+#pragma once
+
+#include "graph/graph.hpp"
+
+inline bool CONNECTIVITY_INDEX = true;
+
+inline void set_connectivity_index(bool v) {
+    CONNECTIVITY_INDEX = v;
+}
+
+/**
+ * Disjoint-set index over the GraphInterfaceModuleConnection gifs of a graph.
+ *
+ * Only unconditional LinkDirect edges merge sets. When two sets merge, the
+ * same-named children of same-typed interfaces are merged as well (bus expansion),
+ * which mirrors the hierarchy stack resolution of the PathFinder.
+ * Conditional links are recorded but not merged. Queries from sets touched by
+ * conditional links, from sets containing differently typed buses, or from child
+ * sets that could be reached through those (dirty sets) return nothing and the
+ * caller falls back to the PathFinder.
+ *
+ * Next to the disjoint-set a spanning forest is kept, which is used to materialise
+ * Paths for the answered queries.
+ */
+class ConnectivityIndex {
+    struct Witness {
+        // direct link, nullptr if merged by bus expansion
+        Link_weak_ref link = nullptr;
+        // bus expansion: connection gifs of the parents of from & to
+        GI_ref_weak parent_from = nullptr;
+        GI_ref_weak parent_to = nullptr;
+
+        Witness reversed() const;
+    };
+
+    struct TreeNode {
+        GI_ref_weak parent = nullptr;
+        // how to get from this node to its parent
+        Witness witness;
+        size_t depth = 0;
+    };
+
+    struct SetData {
+        std::vector<GI_ref_weak> members;
+        // one representative per node type in this set
+        std::vector<std::pair<Node::Type, GI_ref_weak>> type_reps;
+        // contains differently typed buses
+        bool heterogeneous = false;
+    };
+
+    Graph &G;
+    bool stale = true;
+    bool taint_stale = true;
+
+    Map<Node *, GI_ref_weak> conn_gifs;
+    Map<GI_ref_weak, GI_ref_weak> dsu_parent;
+    Map<GI_ref_weak, SetData> sets;
+    Map<GI_ref_weak, TreeNode> tree;
+    // connection gifs of the conditional links
+    std::vector<std::pair<GI_ref_weak, GI_ref_weak>> conditional;
+    // sets that can be left through conditional links
+    Set<GI_ref_weak> conditional_roots;
+    Set<GI_ref_weak> dirty;
+
+    void reset();
+    void rebuild();
+    void replay(const std::vector<std::tuple<GI_ref_weak, GI_ref_weak, Link_ref>> &e);
+    void handle_edge(Link_ref link, bool live);
+    void register_gif(GI_ref_weak gif);
+    bool is_indexed(GI_ref_weak gif);
+
+    GI_ref_weak find(GI_ref_weak gif);
+    void unite(GI_ref_weak a, GI_ref_weak b, Witness witness);
+    void expand_children(GI_ref_weak a, GI_ref_weak b);
+    void attach_tree(GI_ref_weak from, GI_ref_weak to, Witness witness,
+                     const std::vector<GI_ref_weak> &members);
+    bool has_mif_children(Node *node);
+    bool is_heterogeneous(SetData &set);
+    void mark_children_dirty(GI_ref_weak root, std::vector<GI_ref_weak> &worklist);
+    void check_conditional_component(
+        const std::vector<GI_ref_weak> &component,
+        std::vector<std::pair<GI_ref_weak, GI_ref_weak>> &detours);
+    void update_dirty();
+
+    void append_tree_path(std::vector<GI_ref_weak> &out, GI_ref_weak from,
+                          GI_ref_weak to);
+    void append_hop(std::vector<GI_ref_weak> &out, GI_ref_weak from, GI_ref_weak to,
+                    const Witness &witness);
+
+  public:
+    ConnectivityIndex(Graph &G);
+
+    void on_add_edge(Link_ref link);
+    void on_remove_edge(Link_ref link);
+    void merge(ConnectivityIndex &other,
+               const std::vector<std::tuple<GI_ref_weak, GI_ref_weak, Link_ref>> &e);
+    void invalidate();
+
+    /**
+     * @brief Paths from src to all (or the given) connected interfaces of the same
+     * type, answered from the index.
+     *
+     * @return std::nullopt if the index can't answer the query exactly, e.g.
+     * because conditional links are involved or src is a bus (has interface
+     * children, for which the PathFinder also resolves split/join connections).
+     */
+    std::optional<std::vector<Path>> find_paths(Node_ref src,
+                                                std::vector<Node_ref> dst);
+};
@@ -14,6 +14,7 @@
 #include <nanobind/stl/unordered_map.h>
 #include <nanobind/stl/unordered_set.h>
 #include <nanobind/stl/vector.h>
+#include <span>
 #include <sstream>
 #include <vector>
 
@@ -22,6 +23,14 @@ namespace nb = nanobind;
 template <typename T> using Set = std::unordered_set<T>;
 template <typename K, typename V> using Map = std::unordered_map<K, V>;
 
+class ConnectivityIndex;
+class PathCache;
+
+inline bool FROZEN_ADJACENCY = false;
+
+inline void set_frozen_adjacency(bool v) {
+    FROZEN_ADJACENCY = v;
+}
 class Graph;
 class GraphInterface;
 class GraphInterfaceHierarchical;
@@ -145,6 +154,7 @@ class GraphInterface {
     template <typename T> static std::shared_ptr<T> factory();
     std::unordered_set<GI_ref_weak> get_gif_edges();
     std::unordered_map<GI_ref_weak, Link_ref> &get_edges();
+    const std::unordered_map<GI_ref_weak, Link_ref> &find_edges();
     std::optional<Link_ref> is_connected(GI_ref_weak to);
     Graph_ref get_graph();
     std::unordered_set<Node_ref> get_connected_nodes(std::vector<nb::type_object> types);
@@ -154,6 +164,7 @@ class GraphInterface {
     void connect(GI_refs_weak others, Link_ref link);
     // TODO replace with set_node(Node_ref node, std::string name)
     void set_node(Node_ref node);
+    bool has_node();
     Node_ref get_node();
     void set_name(std::string name);
     std::string get_name();
@@ -222,13 +233,43 @@ class Path {
 };
 
 class Graph {
+  public:
+    /**
+     * Compressed sparse row adjacency, indexed by v_i.
+     * The neighbours of gifs[i] are gifs[neighbours[offsets[i]:offsets[i + 1]]],
+     * connected by the links at the same positions.
+     */
+    struct Adjacency {
+        std::vector<GI_ref_weak> gifs;
+        std::vector<uint32_t> offsets;
+        std::vector<uint32_t> neighbours;
+        std::vector<Link_weak_ref> links;
+
+        std::span<const uint32_t> get_neighbours(size_t v_i) const;
+        std::span<const Link_weak_ref> get_links(size_t v_i) const;
+    };
+
+  private:
     Set<GI_ref> v;
     std::vector<std::tuple<GI_ref_weak, GI_ref_weak, Link_ref>> e;
 
     Map<GI_ref_weak, Map<GI_ref_weak, Link_ref>> e_cache = {};
-    Map<GI_ref_weak, Set<GI_ref_weak>> e_cache_simple = {};
     bool invalidated = false;
 
+    // bumped on every change of the edges, used to invalidate caches
+    size_t generation = 0;
+
+    std::unique_ptr<ConnectivityIndex> connectivity;
+    std::unique_ptr<PathCache> path_cache;
+
+    Adjacency adjacency;
+    std::optional<size_t> adjacency_generation;
+
+    // nodes by their exact python type
+    Map<PyObject *, Set<Node_ref>> nodes_by_type;
+
+    friend class ConnectivityIndex;
+
   public:
     void hold(GI_ref gi);
     void merge(Graph &other);
@@ -238,13 +279,30 @@ class Graph {
 
     std::unordered_set<GI_ref_weak> get_gif_edges(GI_ref_weak from);
     std::unordered_map<GI_ref_weak, Link_ref> &get_edges(GI_ref_weak from);
+    /**
+     * @brief Like get_edges, but never inserts into the edge cache.
+     * Safe to call concurrently while the graph is not mutated.
+     */
+    const std::unordered_map<GI_ref_weak, Link_ref> &find_edges(GI_ref_weak from);
 
     Graph();
     ~Graph();
 
     void remove_node(GI_ref node);
+    void add_node(Node_ref node);
 
     void invalidate();
+    ConnectivityIndex &get_connectivity();
+    size_t get_generation();
+    PathCache &get_path_cache();
+
+    /**
+     * @brief Frozen adjacency of the graph, rebuilt lazily after mutations.
+     * Renumbers the v_i of the gifs densely.
+     *
+     * @return nullptr if FROZEN_ADJACENCY is not set
+     */
+    const Adjacency *get_adjacency();
     int node_count();
     int edge_count();
 
@@ -252,9 +310,19 @@ class Graph {
 
     Set<GI_ref> get_gifs();
     std::vector<std::tuple<GI_ref_weak, GI_ref_weak, Link_ref>> all_edges();
+    /**
+     * @brief Edges in insertion order, starting at index n.
+     * Edges are only appended, unless removed or merged from another graph.
+     */
+    std::vector<std::tuple<GI_ref_weak, GI_ref_weak, Link_ref>> edges_since(size_t n);
 
     // Algorithms
     std::unordered_set<Node_ref> node_projection();
+    /**
+     * @brief Nodes that are instances of any of the types.
+     * Only the distinct node types of the graph are checked, not every node.
+     */
+    std::unordered_set<Node_ref> nodes_of_types(std::vector<nb::type_object> types);
     std::vector<std::pair<Node_ref, std::string>>
     nodes_by_names(std::unordered_set<std::string> names);
     std::unordered_set<GI_ref_weak>
@@ -0,0 +1,49 @@
+/* This file is part of the faebryk project
+ * SPDX-License-Identifier: MIT
+ */
+
+#pragma once
+
+#include "graph/graph.hpp"
+
+inline bool PATH_CACHE = true;
+
+inline void set_path_cache(bool v) {
+    PATH_CACHE = v;
+}
+
+/**
+ * Cache of full find_paths results (no destinations) of a graph, keyed by the self
+ * gif of the source.
+ *
+ * Entries are dropped as soon as the generation of the graph changes, which
+ * happens on every edge addition, removal or graph merge, and when the path limits
+ * change (set_max_paths).
+ */
+class PathCache {
+    Graph &G;
+    size_t generation = 0;
+    size_t limits_generation = 0;
+    Map<GI_ref_weak, std::vector<Path>> entries;
+    size_t hits = 0;
+    size_t misses = 0;
+
+    void sync();
+
+  public:
+    PathCache(Graph &G);
+
+    /**
+     * @brief Paths from src to the given destinations (all if empty).
+     *
+     * @return std::nullopt on a cache miss
+     */
+    std::optional<std::vector<Path>> get(Node_ref src,
+                                         const std::vector<Node_ref> &dst);
+    void put(Node_ref src, const std::vector<Path> &paths);
+    void clear();
+
+    size_t get_hits();
+    size_t get_misses();
+    size_t size();
+};
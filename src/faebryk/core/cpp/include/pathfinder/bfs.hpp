@@ -6,6 +6,7 @@
 
 #include "graph/graph.hpp"
 #include "graph/graphinterfaces.hpp"
+#include "pathfinder/profile.hpp"
 #include <optional>
 #include <string>
 #include <tuple>
@@ -39,9 +40,37 @@ struct PathData {
     PathStack split_stack;
 };
 
-class BFSPath : public Path {
+/**
+ * Parent-pointer storage for the paths of one bfs_visit.
+ * Paths share the entries of their common prefix, so extending a path appends a
+ * single entry instead of copying the whole path.
+ */
+struct PathArena {
+    static constexpr uint32_t NO_PARENT = UINT32_MAX;
+
+    struct Entry {
+        /*const*/ GI_ref_weak gif;
+        uint32_t parent;
+        uint32_t length;
+        // bloom filter over the gifs in the path, for fast negative contains
+        uint64_t signature;
+        // path contains a conditional link
+        bool conditional;
+    };
+
+    std::vector<Entry> entries;
+
+    uint32_t add(/*const*/ GI_ref_weak gif, uint32_t parent, bool conditional);
+    static uint64_t signature_of(/*const*/ GI_ref_weak gif);
+};
+
+class BFSPath {
+    std::shared_ptr<PathArena> arena;
+    uint32_t head;
     std::shared_ptr<PathData> path_data;
 
+    const PathArena::Entry &entry(uint32_t i) /*const*/;
+
   public:
     double confidence = 1.0;
     bool filtered = false;
@@ -49,13 +78,38 @@ class BFSPath : public Path {
 
     BFSPath(/*const*/ GI_ref_weak path_head);
     BFSPath(const BFSPath &other);
-    BFSPath(const BFSPath &other, /*const*/ GI_ref_weak new_head);
+    BFSPath(const BFSPath &other, /*const*/ GI_ref_weak new_head, Link_weak_ref link);
     BFSPath(BFSPath &&other);
-    BFSPath operator+(/*const*/ GI_ref_weak gif);
+    BFSPath extend(/*const*/ GI_ref_weak gif, Link_weak_ref link);
+
+    /*const*/ Link_weak_ref get_link(Edge edge) /*const*/;
+    std::optional<Edge> last_edge() /*const*/;
+    std::optional<TriEdge> last_tri_edge() /*const*/;
+    /*const*/ GI_ref_weak last() /*const*/;
+    /*const*/ GI_ref_weak first() /*const*/;
+    /*const*/ GI_ref_weak operator[](int idx) /*const*/;
+    size_t size() /*const*/;
+    bool contains(/*const*/ GI_ref_weak gif) /*const*/;
+    size_t index(/*const*/ GI_ref_weak gif) /*const*/;
+    bool has_conditional_link() /*const*/;
+    std::vector</*const*/ GI_ref_weak> get_path() /*const*/;
+    /**
+     * @brief Copy the path out of the arena, only done for the surviving paths
+     * and for paths that need to be handed to conditional link filters.
+     */
+    Path materialize() /*const*/;
+    std::shared_ptr<PathArena> get_arena() /*const*/;
+    std::string str() /*const*/;
 
     PathData &get_path_data_mut();
     PathData &get_path_data() /*const*/;
     bool strong() /*const*/;
 };
 
-void bfs_visit(/*const*/ GI_ref_weak root, std::function<void(BFSPath &)> visitor);
+/**
+ * @brief Breadth-first search over all simple paths starting at root.
+ *
+ * @param profile if given, phase timings and sizes are added to it
+ */
+void bfs_visit(/*const*/ GI_ref_weak root, std::function<void(BFSPath &)> visitor,
+               BFSProfile *profile = nullptr);
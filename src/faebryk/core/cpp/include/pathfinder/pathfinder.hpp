@@ -22,11 +22,24 @@ struct PathLimits {
 };
 
 inline PathLimits PATH_LIMITS;
+// changes with the limits, results of other limits are dropped from the PathCache
+inline size_t PATH_LIMITS_GENERATION = 0;
 
 inline void set_max_paths(uint32_t absolute, uint32_t no_new_weak, uint32_t no_weak) {
+    if (PATH_LIMITS.absolute == absolute && PATH_LIMITS.no_new_weak == no_new_weak &&
+        PATH_LIMITS.no_weak == no_weak) {
+        return;
+    }
     PATH_LIMITS.absolute = absolute;
     PATH_LIMITS.no_new_weak = no_new_weak;
     PATH_LIMITS.no_weak = no_weak;
+    PATH_LIMITS_GENERATION++;
+}
+
+inline size_t PATHFINDER_THREADS = 1;
+
+inline void set_pathfinder_threads(size_t threads) {
+    PATHFINDER_THREADS = threads;
 }
 
 class PathFinder;
@@ -62,4 +75,15 @@ class PathFinder {
     bool run_filters(BFSPath &p);
     std::pair<std::vector<Path>, std::vector<Counter>>
     find_paths(Node_ref src, std::vector<Node_ref> dst);
+
+    /**
+     * @brief Find all paths for each of the sources.
+     *
+     * With PATHFINDER_THREADS > 1 the sources are distributed over a worker pool
+     * and the GIL is released. It is only re-acquired for Python conditional link
+     * filters and split/join resolution. The graph must not be modified
+     * concurrently.
+     */
+    static std::vector<std::pair<std::vector<Path>, std::vector<Counter>>>
+    find_paths_concurrent(const std::vector<Node_ref> &srcs);
 };
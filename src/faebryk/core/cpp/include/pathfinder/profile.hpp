@@ -0,0 +1,65 @@
+/* This file is part of the faebryk project
+ * SPDX-License-Identifier: MIT
+ */
+
+#pragma once
+
+#include "pathfinder/pathcounter.hpp"
+#include <functional>
+#include <mutex>
+#include <vector>
+
+inline bool PATHFINDER_PROFILE = false;
+
+inline void set_pathfinder_profile(bool v) {
+    PATHFINDER_PROFILE = v;
+}
+
+/**
+ * Phase timings and sizes of bfs_visit, summed over all searches.
+ * Peak values are the maximum over the searches.
+ */
+struct BFSProfile {
+    size_t searches = 0;
+    // paths handed to the visitor
+    size_t paths = 0;
+    size_t peak_queue = 0;
+    size_t peak_arena_bytes = 0;
+
+    double time_setup_s = 0;
+    double time_search_s = 0;
+    double time_edges_s = 0;
+    double time_check_visited_s = 0;
+    double time_new_path_s = 0;
+    double time_set_insert_s = 0;
+    double time_deque_insert_s = 0;
+    double time_non_filter_s = 0;
+    double time_filter_s = 0;
+
+    void merge(const BFSProfile &other);
+};
+
+/**
+ * Pathfinder statistics aggregated over all find_paths calls made while
+ * PATHFINDER_PROFILE is set. Collected into a single process wide instance,
+ * also from the worker threads of find_paths_many.
+ */
+struct PathFinderProfile {
+    size_t queries = 0;
+    size_t cache_hits = 0;
+    size_t index_hits = 0;
+    double time_s = 0;
+    BFSProfile bfs;
+    // filter counters summed by name
+    std::vector<Counter> counters;
+
+    void add_counters(const std::vector<Counter> &other);
+
+    static void record(std::function<void(PathFinderProfile &)> f);
+    static PathFinderProfile snapshot();
+    static void reset();
+
+  private:
+    static std::mutex mutex;
+    static PathFinderProfile global;
+};
@@ -21,9 +21,12 @@ class PerfCounterAccumulating {
     std::chrono::high_resolution_clock::time_point start;
     int64_t time_ns = 0;
     bool paused = false;
+    bool enabled = true;
 
   public:
     PerfCounterAccumulating();
+    // disabled counters don't read the clock
+    PerfCounterAccumulating(bool enabled);
     void pause();
     void resume();
     int64_t ns();
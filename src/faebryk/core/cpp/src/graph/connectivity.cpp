@@ -0,0 +1,607 @@
+/* This file is part of the faebryk project
+ * SPDX-License-Identifier: MIT
+ */
+
+#include "graph/connectivity.hpp"
+#include "graph/graphinterfaces.hpp"
+#include "graph/links.hpp"
+
+static bool is_moduleinterface(Node &node) {
+    return node.get_py_handle() && node.get_type().is_moduleinterface();
+}
+
+ConnectivityIndex::Witness ConnectivityIndex::Witness::reversed() const {
+    return Witness{
+        .link = this->link,
+        .parent_from = this->parent_to,
+        .parent_to = this->parent_from,
+    };
+}
+
+ConnectivityIndex::ConnectivityIndex(Graph &G)
+  : G(G) {
+}
+
+// State -------------------------------------------------------------------------------
+
+void ConnectivityIndex::reset() {
+    this->conn_gifs.clear();
+    this->dsu_parent.clear();
+    this->sets.clear();
+    this->tree.clear();
+    this->conditional.clear();
+    this->conditional_roots.clear();
+    this->dirty.clear();
+    this->taint_stale = true;
+}
+
+void ConnectivityIndex::invalidate() {
+    if (this->stale) {
+        return;
+    }
+    this->reset();
+    this->stale = true;
+}
+
+void ConnectivityIndex::rebuild() {
+    this->reset();
+    this->stale = false;
+    this->replay(this->G.e);
+}
+
+void ConnectivityIndex::replay(
+    const std::vector<std::tuple<GI_ref_weak, GI_ref_weak, Link_ref>> &e) {
+    // register all connection gifs first, edge order is not guaranteed after merges
+    for (auto &[from, to, link] : e) {
+        if (dynamic_cast<LinkSibling *>(link.get())) {
+            this->handle_edge(link, false);
+        }
+    }
+    for (auto &[from, to, link] : e) {
+        if (!dynamic_cast<LinkSibling *>(link.get())) {
+            this->handle_edge(link, false);
+        }
+    }
+}
+
+void ConnectivityIndex::merge(
+    ConnectivityIndex &other,
+    const std::vector<std::tuple<GI_ref_weak, GI_ref_weak, Link_ref>> &e) {
+    if (this->stale) {
+        return;
+    }
+
+    if (other.stale) {
+        this->replay(e);
+        return;
+    }
+
+    this->conn_gifs.merge(other.conn_gifs);
+    this->dsu_parent.merge(other.dsu_parent);
+    this->sets.merge(other.sets);
+    this->tree.merge(other.tree);
+    this->conditional.insert(this->conditional.end(), other.conditional.begin(),
+                             other.conditional.end());
+    this->taint_stale = true;
+    other.invalidate();
+}
+
+void ConnectivityIndex::on_add_edge(Link_ref link) {
+    if (this->stale) {
+        return;
+    }
+    this->handle_edge(link, true);
+}
+
+void ConnectivityIndex::on_remove_edge(Link_ref link) {
+    if (this->stale) {
+        return;
+    }
+    auto [from, to] = link->get_connections();
+    if (this->is_indexed(from) || this->is_indexed(to)) {
+        this->invalidate();
+        return;
+    }
+    // removing a child from a bus
+    if (dynamic_cast<LinkParent *>(link.get())) {
+        this->handle_edge(link, true);
+    }
+}
+
+void ConnectivityIndex::handle_edge(Link_ref link, bool live) {
+    auto [from, to] = link->get_connections();
+
+    if (dynamic_cast<LinkSibling *>(link.get())) {
+        this->register_gif(from);
+        this->register_gif(to);
+        return;
+    }
+
+    if (auto link_parent = dynamic_cast<LinkParent *>(link.get())) {
+        // bus children are merged when the bus sets are merged,
+        // so a late hierarchy change of a bus requires a rebuild
+        if (!live) {
+            return;
+        }
+        auto parent = link_parent->get_parent();
+        auto child = link_parent->get_child();
+        if (!parent->has_node() || !child->has_node()) {
+            this->invalidate();
+            return;
+        }
+        auto &parent_node = *parent->get_node();
+        auto &child_node = *child->get_node();
+        if (!parent_node.get_py_handle() || !child_node.get_py_handle() ||
+            (is_moduleinterface(parent_node) && is_moduleinterface(child_node))) {
+            this->invalidate();
+        }
+        return;
+    }
+
+    if (!this->is_indexed(from) || !this->is_indexed(to)) {
+        return;
+    }
+
+    if (dynamic_cast<LinkDirectConditional *>(link.get())) {
+        this->conditional.push_back({from, to});
+        this->taint_stale = true;
+        return;
+    }
+
+    if (dynamic_cast<LinkDirect *>(link.get())) {
+        this->unite(from, to, Witness{.link = link.get()});
+    }
+}
+
+void ConnectivityIndex::register_gif(GI_ref_weak gif) {
+    if (!dynamic_cast<GraphInterfaceModuleConnection *>(gif) ||
+        this->dsu_parent.contains(gif) || !gif->has_node()) {
+        return;
+    }
+    auto node = gif->get_node();
+    if (!is_moduleinterface(*node)) {
+        return;
+    }
+
+    this->conn_gifs[node.get()] = gif;
+    this->dsu_parent[gif] = gif;
+    this->sets.emplace(gif, SetData{
+                                .members = {gif},
+                                .type_reps = {{node->get_type(), gif}},
+                            });
+    this->tree[gif] = TreeNode{};
+}
+
+bool ConnectivityIndex::is_indexed(GI_ref_weak gif) {
+    return this->dsu_parent.contains(gif);
+}
+
+// Disjoint-set ------------------------------------------------------------------------
+
+GI_ref_weak ConnectivityIndex::find(GI_ref_weak gif) {
+    auto root = gif;
+    while (this->dsu_parent[root] != root) {
+        root = this->dsu_parent[root];
+    }
+    // path compression
+    while (gif != root) {
+        auto next = this->dsu_parent[gif];
+        this->dsu_parent[gif] = root;
+        gif = next;
+    }
+    return root;
+}
+
+void ConnectivityIndex::unite(GI_ref_weak a, GI_ref_weak b, Witness witness) {
+    auto root_a = this->find(a);
+    auto root_b = this->find(b);
+    if (root_a == root_b) {
+        return;
+    }
+
+    // union by size: the set of b is attached to the set of a
+    if (this->sets[root_a].members.size() < this->sets[root_b].members.size()) {
+        std::swap(a, b);
+        std::swap(root_a, root_b);
+        witness = witness.reversed();
+    }
+
+    auto small = std::move(this->sets[root_b]);
+    this->sets.erase(root_b);
+    this->dsu_parent[root_b] = root_a;
+    this->attach_tree(b, a, witness.reversed(), small.members);
+
+    auto &large = this->sets[root_a];
+    large.members.insert(large.members.end(), small.members.begin(),
+                         small.members.end());
+    large.heterogeneous |= small.heterogeneous;
+
+    // buses of the same type have their children connected
+    std::vector<std::pair<GI_ref_weak, GI_ref_weak>> expansions;
+    for (auto &[type, rep] : small.type_reps) {
+        auto it = std::find_if(large.type_reps.begin(), large.type_reps.end(),
+                               [&type](auto &type_rep) {
+                                   return type_rep.first == type;
+                               });
+        if (it == large.type_reps.end()) {
+            large.type_reps.push_back({type, rep});
+        } else {
+            expansions.push_back({it->second, rep});
+        }
+    }
+
+    if (!large.heterogeneous && large.type_reps.size() > 1) {
+        large.heterogeneous = this->is_heterogeneous(large);
+    }
+    if (large.heterogeneous || !this->conditional.empty()) {
+        this->taint_stale = true;
+    }
+
+    for (auto &[x, y] : expansions) {
+        this->expand_children(x, y);
+    }
+}
+
+void ConnectivityIndex::expand_children(GI_ref_weak a, GI_ref_weak b) {
+    Map<std::string, Node_ref> children_b;
+    for (auto &[child, name] : b->get_node()->get_children_gif()->get_children_with_names()) {
+        children_b[name] = child;
+    }
+
+    for (auto &[child_a, name] :
+         a->get_node()->get_children_gif()->get_children_with_names()) {
+        auto it_b = children_b.find(name);
+        if (it_b == children_b.end()) {
+            continue;
+        }
+        auto child_b = it_b->second;
+        auto gif_a = this->conn_gifs.find(child_a.get());
+        auto gif_b = this->conn_gifs.find(child_b.get());
+        if (gif_a == this->conn_gifs.end() || gif_b == this->conn_gifs.end()) {
+            continue;
+        }
+        if (!(child_a->get_type() == child_b->get_type())) {
+            continue;
+        }
+        this->unite(gif_a->second, gif_b->second,
+                    Witness{.parent_from = a, .parent_to = b});
+    }
+}
+
+void ConnectivityIndex::attach_tree(GI_ref_weak from, GI_ref_weak to, Witness witness,
+                                    const std::vector<GI_ref_weak> &members) {
+    // reroot the tree of from at from
+    GI_ref_weak prev = nullptr;
+    Witness prev_witness{};
+    auto current = from;
+    while (current) {
+        auto &node = this->tree[current];
+        auto next = node.parent;
+        auto next_witness = node.witness;
+        node.parent = prev;
+        node.witness = prev_witness;
+        prev = current;
+        prev_witness = next_witness.reversed();
+        current = next;
+    }
+
+    auto &from_node = this->tree[from];
+    from_node.parent = to;
+    from_node.witness = witness;
+
+    // update depths of the attached tree
+    Set<GI_ref_weak> pending(members.begin(), members.end());
+    for (auto member : members) {
+        std::vector<GI_ref_weak> chain;
+        auto current = member;
+        while (pending.contains(current)) {
+            chain.push_back(current);
+            current = this->tree[current].parent;
+        }
+        auto depth = this->tree[current].depth;
+        for (auto it = chain.rbegin(); it != chain.rend(); ++it) {
+            this->tree[*it].depth = ++depth;
+            pending.erase(*it);
+        }
+    }
+}
+
+// Taint -------------------------------------------------------------------------------
+
+bool ConnectivityIndex::has_mif_children(Node *node) {
+    for (auto &child : node->get_children_gif()->get_children()) {
+        if (is_moduleinterface(*child)) {
+            return true;
+        }
+    }
+    return false;
+}
+
+bool ConnectivityIndex::is_heterogeneous(SetData &set) {
+    // The PathFinder can resolve split/join connections through differently typed
+    // buses, which the index does not model.
+    size_t bus_types = 0;
+    for (auto &[type, rep] : set.type_reps) {
+        if (this->has_mif_children(rep->get_node().get())) {
+            bus_types++;
+        }
+    }
+    return bus_types > 1;
+}
+
+void ConnectivityIndex::mark_children_dirty(GI_ref_weak root,
+                                            std::vector<GI_ref_weak> &worklist) {
+    for (auto member : this->sets[root].members) {
+        for (auto &child : member->get_node()->get_children_gif()->get_children()) {
+            auto it = this->conn_gifs.find(child.get());
+            if (it == this->conn_gifs.end()) {
+                continue;
+            }
+            auto child_root = this->find(it->second);
+            if (!this->dirty.contains(child_root)) {
+                worklist.push_back(child_root);
+            }
+        }
+    }
+}
+
+void ConnectivityIndex::check_conditional_component(
+    const std::vector<GI_ref_weak> &component,
+    std::vector<std::pair<GI_ref_weak, GI_ref_weak>> &detours) {
+    // A path from a child that climbs into the component, crosses conditional links
+    // and descends again ends in a child set of the same name & types.
+    // If that is the set it started in, the conditional links can't change the
+    // connectivity of the child set.
+    struct ChildRep {
+        Node::Type parent_type;
+        Node::Type type;
+        GI_ref_weak root;
+    };
+    Map<std::string, std::vector<ChildRep>> reps;
+
+    for (auto root : component) {
+        for (auto member : this->sets[root].members) {
+            auto node = member->get_node();
+            auto parent_type = node->get_type();
+            for (auto &[child, name] :
+                 node->get_children_gif()->get_children_with_names()) {
+                auto it = this->conn_gifs.find(child.get());
+                if (it == this->conn_gifs.end()) {
+                    continue;
+                }
+                auto child_root = this->find(it->second);
+                auto child_type = child->get_type();
+                auto &name_reps = reps[name];
+                auto rep = std::find_if(
+                    name_reps.begin(), name_reps.end(), [&](const ChildRep &r) {
+                        return r.parent_type == parent_type && r.type == child_type;
+                    });
+                if (rep == name_reps.end()) {
+                    name_reps.push_back(ChildRep{parent_type, child_type, child_root});
+                } else if (rep->root != child_root) {
+                    detours.push_back({rep->root, child_root});
+                }
+            }
+        }
+    }
+}
+
+void ConnectivityIndex::update_dirty() {
+    if (!this->taint_stale) {
+        return;
+    }
+
+    this->dirty.clear();
+    this->conditional_roots.clear();
+
+    // Group the sets between which a path can move by crossing conditional links,
+    // either directly or through the conditional links of their parents.
+    Map<GI_ref_weak, GI_ref_weak> group_parent;
+    Map<GI_ref_weak, std::vector<GI_ref_weak>> groups;
+    auto find_group = [&](GI_ref_weak root) {
+        if (!group_parent.contains(root)) {
+            group_parent[root] = root;
+            groups[root] = {root};
+        }
+        while (group_parent[root] != root) {
+            root = group_parent[root] = group_parent[group_parent[root]];
+        }
+        return root;
+    };
+    std::vector<GI_ref_weak> unchecked;
+    auto unite_groups = [&](GI_ref_weak a, GI_ref_weak b) {
+        a = find_group(a);
+        b = find_group(b);
+        if (a != b) {
+            if (groups[a].size() < groups[b].size()) {
+                std::swap(a, b);
+            }
+            group_parent[b] = a;
+            auto &group_a = groups[a];
+            group_a.insert(group_a.end(), groups[b].begin(), groups[b].end());
+            groups.erase(b);
+        }
+        unchecked.push_back(a);
+    };
+
+    for (auto &[from, to] : this->conditional) {
+        unite_groups(this->find(from), this->find(to));
+    }
+    while (!unchecked.empty()) {
+        auto group = unchecked.back();
+        unchecked.pop_back();
+        if (group_parent[group] != group) {
+            continue;
+        }
+        std::vector<std::pair<GI_ref_weak, GI_ref_weak>> detours;
+        this->check_conditional_component(groups[group], detours);
+        for (auto &[a, b] : detours) {
+            if (find_group(a) != find_group(b)) {
+                unite_groups(a, b);
+            }
+        }
+    }
+    for (auto &[root, _] : group_parent) {
+        this->conditional_roots.insert(root);
+    }
+
+    // a set is dirty if it is heterogeneous or contains a child of a dirty set
+    // a dirty set can be left through the conditional links of its group
+    std::vector<GI_ref_weak> worklist;
+    for (auto &[root, set] : this->sets) {
+        if (set.heterogeneous) {
+            worklist.push_back(root);
+        }
+    }
+    while (!worklist.empty()) {
+        auto root = worklist.back();
+        worklist.pop_back();
+        if (!this->dirty.insert(root).second) {
+            continue;
+        }
+        this->mark_children_dirty(root, worklist);
+        if (group_parent.contains(root)) {
+            auto &group = groups[find_group(root)];
+            worklist.insert(worklist.end(), group.begin(), group.end());
+        }
+    }
+
+    this->taint_stale = false;
+}
+
+// Paths -------------------------------------------------------------------------------
+
+void ConnectivityIndex::append_tree_path(std::vector<GI_ref_weak> &out,
+                                         GI_ref_weak from, GI_ref_weak to) {
+    std::vector<GI_ref_weak> up;
+    std::vector<GI_ref_weak> down;
+
+    // climb to the lowest common ancestor
+    auto a = from;
+    auto b = to;
+    while (this->tree[a].depth > this->tree[b].depth) {
+        up.push_back(a);
+        a = this->tree[a].parent;
+    }
+    while (this->tree[b].depth > this->tree[a].depth) {
+        down.push_back(b);
+        b = this->tree[b].parent;
+    }
+    while (a != b) {
+        up.push_back(a);
+        a = this->tree[a].parent;
+        down.push_back(b);
+        b = this->tree[b].parent;
+    }
+
+    for (auto gif : up) {
+        auto &node = this->tree[gif];
+        this->append_hop(out, gif, node.parent, node.witness);
+    }
+    for (auto it = down.rbegin(); it != down.rend(); ++it) {
+        auto &node = this->tree[*it];
+        this->append_hop(out, node.parent, *it, node.witness.reversed());
+    }
+}
+
+void ConnectivityIndex::append_hop(std::vector<GI_ref_weak> &out, GI_ref_weak from,
+                                   GI_ref_weak to, const Witness &witness) {
+    if (witness.link) {
+        out.push_back(to);
+        return;
+    }
+
+    // bus expansion: up to the parent bus, across to the other bus, down again
+    auto from_node = from->get_node();
+    auto to_node = to->get_node();
+    auto parent_from_node = witness.parent_from->get_node();
+    auto parent_to_node = witness.parent_to->get_node();
+
+    out.push_back(from_node->get_self_gif().get());
+    out.push_back(from_node->get_parent_gif().get());
+    out.push_back(parent_from_node->get_children_gif().get());
+    out.push_back(parent_from_node->get_self_gif().get());
+    out.push_back(witness.parent_from);
+    this->append_tree_path(out, witness.parent_from, witness.parent_to);
+    out.push_back(parent_to_node->get_self_gif().get());
+    out.push_back(parent_to_node->get_children_gif().get());
+    out.push_back(to_node->get_parent_gif().get());
+    out.push_back(to_node->get_self_gif().get());
+    out.push_back(to);
+}
+
+static std::vector<GI_ref_weak> erase_loops(const std::vector<GI_ref_weak> &walk) {
+    std::vector<GI_ref_weak> out;
+    Map<GI_ref_weak, size_t> index;
+    for (auto gif : walk) {
+        auto it = index.find(gif);
+        if (it != index.end()) {
+            auto keep = it->second + 1;
+            for (size_t i = keep; i < out.size(); i++) {
+                index.erase(out[i]);
+            }
+            out.resize(keep);
+            continue;
+        }
+        index[gif] = out.size();
+        out.push_back(gif);
+    }
+    return out;
+}
+
+std::optional<std::vector<Path>> ConnectivityIndex::find_paths(Node_ref src,
+                                                               std::vector<Node_ref> dst) {
+    if (!CONNECTIVITY_INDEX) {
+        return {};
+    }
+    if (this->stale) {
+        this->rebuild();
+    }
+    this->update_dirty();
+
+    auto src_it = this->conn_gifs.find(src.get());
+    if (src_it == this->conn_gifs.end()) {
+        return {};
+    }
+    if (this->has_mif_children(src.get())) {
+        return {};
+    }
+    auto src_gif = src_it->second;
+    auto root = this->find(src_gif);
+    if (this->dirty.contains(root) || this->conditional_roots.contains(root)) {
+        return {};
+    }
+
+    Set<Node *> dsts;
+    for (auto &d : dst) {
+        // let the PathFinder handle invalid destinations
+        if (!this->conn_gifs.contains(d.get())) {
+            return {};
+        }
+        dsts.insert(d.get());
+    }
+
+    auto src_type = src->get_type();
+    auto src_self = src->get_self_gif().get();
+    std::vector<Path> paths;
+    for (auto member : this->sets[root].members) {
+        auto node = member->get_node();
+        if (!(node->get_type() == src_type)) {
+            continue;
+        }
+        if (!dsts.empty() && !dsts.contains(node.get())) {
+            continue;
+        }
+        if (member == src_gif) {
+            paths.push_back(Path(src_self));
+            continue;
+        }
+
+        std::vector<GI_ref_weak> walk{src_self, src_gif};
+        this->append_tree_path(walk, src_gif, member);
+        walk.push_back(node->get_self_gif().get());
+        paths.push_back(Path(erase_loops(walk)));
+    }
+
+    return paths;
+}
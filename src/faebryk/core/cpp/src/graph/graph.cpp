@@ -3,10 +3,15 @@
  */
 
 #include "graph/graph.hpp"
+#include "graph/connectivity.hpp"
 #include "graph/links.hpp"
+#include "graph/pathcache.hpp"
+#include <algorithm>
 #include <queue>
 
-Graph::Graph() {
+Graph::Graph()
+  : connectivity(std::make_unique<ConnectivityIndex>(*this))
+  , path_cache(std::make_unique<PathCache>(*this)) {
 }
 
 Graph::~Graph() {
@@ -17,6 +22,7 @@ Graph::~Graph() {
 
 void Graph::hold(GI_ref gi) {
     this->v.insert(gi);
+    this->generation++;
 }
 
 Graph_ref Graph::merge_graphs(Graph_ref g1, Graph_ref g2) {
@@ -46,16 +52,17 @@ void Graph::add_edge(Link_ref link) {
     auto G = Graph::merge_graphs(from->G, to->G);
 
     // existing link
-    if (G->e_cache_simple[from].contains(to)) {
+    auto &from_edges = G->e_cache[from];
+    if (auto existing = from_edges.find(to); existing != from_edges.end()) {
         // handle policy in the caller
-        throw LinkExists(G->e_cache[from][to], link, "link already exists");
+        throw LinkExists(existing->second, link, "link already exists");
     }
 
-    G->e_cache_simple[from].insert(to);
-    G->e_cache_simple[to].insert(from);
-    G->e_cache[from][to] = link;
+    from_edges[to] = link;
     G->e_cache[to][from] = link;
     G->e.push_back(std::make_tuple(from, to, link));
+    G->generation++;
+    G->connectivity->on_add_edge(link);
 }
 
 void Graph::remove_edge(Link_ref link) {
@@ -65,24 +72,27 @@ void Graph::remove_edge(Link_ref link) {
         throw std::runtime_error("link not in graph");
     }
 
-    if (!G->e_cache_simple[from].contains(to)) {
+    auto &from_edges = G->e_cache[from];
+    auto existing = from_edges.find(to);
+    if (existing == from_edges.end()) {
         return;
     }
-    if (G->e_cache[from][to] != link) {
+    if (existing->second != link) {
         throw std::runtime_error("link not in graph");
     }
-    G->e_cache_simple[from].erase(to);
-    G->e_cache[from].erase(to);
+    from_edges.erase(existing);
     G->e_cache[to].erase(from);
     std::erase_if(G->e, [link](const auto &edge) {
         return std::get<2>(edge) == link;
     });
+    G->generation++;
+    G->connectivity->on_remove_edge(link);
 
     // TODO
-    if (G->e_cache_simple[from].empty()) {
+    if (G->e_cache[from].empty()) {
         //     G->remove_node(from);
     }
-    if (G->e_cache_simple[to].empty()) {
+    if (G->e_cache[to].empty()) {
         //     G->remove_node(to);
     }
 }
@@ -91,27 +101,55 @@ void Graph::merge(Graph &other) {
     this->v.merge(other.v);
     this->e.insert(this->e.end(), other.e.begin(), other.e.end());
     this->e_cache.merge(other.e_cache);
-    this->e_cache_simple.merge(other.e_cache_simple);
+    for (auto &[type, nodes] : other.nodes_by_type) {
+        this->nodes_by_type[type].merge(nodes);
+    }
+    other.nodes_by_type.clear();
+    this->generation++;
+    this->connectivity->merge(*other.connectivity, other.e);
 }
 
 std::unordered_set<GI_ref_weak> Graph::get_gif_edges(GI_ref_weak from) {
-    return this->e_cache_simple[from];
+    // no insertion, called concurrently by the PathFinder
+    auto it = this->e_cache.find(from);
+    if (it == this->e_cache.end()) {
+        return {};
+    }
+    std::unordered_set<GI_ref_weak> out;
+    out.reserve(it->second.size());
+    for (auto &[to, link] : it->second) {
+        out.insert(to);
+    }
+    return out;
 }
 
 std::unordered_map<GI_ref_weak, Link_ref> &Graph::get_edges(GI_ref_weak from) {
     return this->e_cache[from];
 }
 
+const std::unordered_map<GI_ref_weak, Link_ref> &Graph::find_edges(GI_ref_weak from) {
+    static const std::unordered_map<GI_ref_weak, Link_ref> empty;
+    auto it = this->e_cache.find(from);
+    if (it == this->e_cache.end()) {
+        return empty;
+    }
+    return it->second;
+}
+
 void Graph::remove_node(GI_ref node) {
     auto node_ptr = node.get();
     this->v.erase(node);
+    this->generation++;
+    this->connectivity->invalidate();
 
-    // TODO remove G ref from Gif
-
-    for (auto &[from, tos] : this->e_cache_simple) {
-        tos.erase(node_ptr);
+    if (dynamic_cast<GraphInterfaceSelf *>(node_ptr) && node->has_node()) {
+        auto n = node->get_node();
+        if (auto py_handle = n->get_py_handle()) {
+            this->nodes_by_type[py_handle->type().ptr()].erase(n);
+        }
     }
-    this->e_cache_simple.erase(node_ptr);
+
+    // TODO remove G ref from Gif
 
     for (auto &[to, link] : this->e_cache[node_ptr]) {
         this->e_cache[to].erase(node_ptr);
@@ -126,6 +164,63 @@ void Graph::remove_node(GI_ref node) {
 void Graph::invalidate() {
     this->invalidated = true;
     this->v.clear();
+    this->nodes_by_type.clear();
+    this->generation++;
+    this->connectivity->invalidate();
+}
+
+ConnectivityIndex &Graph::get_connectivity() {
+    return *this->connectivity;
+}
+
+size_t Graph::get_generation() {
+    return this->generation;
+}
+
+PathCache &Graph::get_path_cache() {
+    return *this->path_cache;
+}
+
+std::span<const uint32_t> Graph::Adjacency::get_neighbours(size_t v_i) const {
+    return std::span(this->neighbours)
+        .subspan(this->offsets[v_i], this->offsets[v_i + 1] - this->offsets[v_i]);
+}
+
+std::span<const Link_weak_ref> Graph::Adjacency::get_links(size_t v_i) const {
+    return std::span(this->links).subspan(this->offsets[v_i],
+                                          this->offsets[v_i + 1] - this->offsets[v_i]);
+}
+
+const Graph::Adjacency *Graph::get_adjacency() {
+    if (!FROZEN_ADJACENCY) {
+        return nullptr;
+    }
+    if (this->adjacency_generation == this->generation) {
+        return &this->adjacency;
+    }
+
+    auto &adj = this->adjacency;
+    adj = Adjacency{};
+    adj.gifs.reserve(this->v.size());
+    for (auto &gif : this->v) {
+        gif->v_i = adj.gifs.size();
+        adj.gifs.push_back(gif.get());
+    }
+
+    adj.offsets.reserve(adj.gifs.size() + 1);
+    adj.offsets.push_back(0);
+    for (auto gif : adj.gifs) {
+        if (auto it = this->e_cache.find(gif); it != this->e_cache.end()) {
+            for (auto &[to, link] : it->second) {
+                adj.neighbours.push_back(to->v_i);
+                adj.links.push_back(link.get());
+            }
+        }
+        adj.offsets.push_back(adj.neighbours.size());
+    }
+
+    this->adjacency_generation = this->generation;
+    return &adj;
 }
 
 int Graph::node_count() {
@@ -147,6 +242,16 @@ std::string Graph::repr() {
 
 std::unordered_set<Node_ref> Graph::node_projection() {
     std::unordered_set<Node_ref> nodes;
+    if (auto adj = this->get_adjacency()) {
+        for (auto gif : adj->gifs) {
+            if (auto self_gif = dynamic_cast<GraphInterfaceSelf *>(gif)) {
+                auto node = self_gif->get_node();
+                assert(node);
+                nodes.insert(node);
+            }
+        }
+        return nodes;
+    }
     for (auto &gif : this->v) {
         if (auto self_gif = dynamic_cast<GraphInterfaceSelf *>(gif.get())) {
             auto node = self_gif->get_node();
@@ -157,6 +262,26 @@ std::unordered_set<Node_ref> Graph::node_projection() {
     return nodes;
 }
 
+void Graph::add_node(Node_ref node) {
+    auto py_handle = node->get_py_handle();
+    assert(py_handle);
+    this->nodes_by_type[py_handle->type().ptr()].insert(node);
+}
+
+std::unordered_set<Node_ref> Graph::nodes_of_types(std::vector<nb::type_object> types) {
+    std::unordered_set<Node_ref> out;
+    for (auto &[type, nodes] : this->nodes_by_type) {
+        bool match = std::any_of(types.begin(), types.end(), [&](auto &t) {
+            return PyType_IsSubtype(reinterpret_cast<PyTypeObject *>(type),
+                                    reinterpret_cast<PyTypeObject *>(t.ptr()));
+        });
+        if (match) {
+            out.insert(nodes.begin(), nodes.end());
+        }
+    }
+    return out;
+}
+
 std::vector<std::pair<Node_ref, std::string>>
 Graph::nodes_by_names(std::unordered_set<std::string> names) {
     std::vector<std::pair<Node_ref, std::string>> nodes;
@@ -208,6 +333,14 @@ std::vector<std::tuple<GI_ref_weak, GI_ref_weak, Link_ref>> Graph::all_edges() {
     return this->e;
 }
 
+std::vector<std::tuple<GI_ref_weak, GI_ref_weak, Link_ref>>
+Graph::edges_since(size_t n) {
+    if (n >= this->e.size()) {
+        return {};
+    }
+    return {this->e.begin() + n, this->e.end()};
+}
+
 LinkExists::LinkExists(Link_ref existing_link, Link_ref new_link, const std::string &msg)
   : std::runtime_error(LinkExists::make_msg(existing_link, new_link, msg))
   , existing_link(existing_link)
@@ -16,6 +16,10 @@ void GraphInterface::set_node(Node_ref node) {
     this->node = node;
 }
 
+bool GraphInterface::has_node() {
+    return this->node != nullptr;
+}
+
 Node_ref GraphInterface::get_node() {
     assert(this->node);
     return this->node;
@@ -99,7 +103,7 @@ void GraphInterface::register_graph(std::shared_ptr<GraphInterface> gi) {
 }
 
 std::optional<Link_ref> GraphInterface::is_connected(GI_ref_weak to) {
-    auto &edges = this->get_edges();
+    auto &edges = this->find_edges();
     auto edge = edges.find(to);
     if (edge == edges.end()) {
         return {};
@@ -115,6 +119,10 @@ std::unordered_map<GI_ref_weak, Link_ref> &GraphInterface::get_edges() {
     return this->G->get_edges(this);
 }
 
+const std::unordered_map<GI_ref_weak, Link_ref> &GraphInterface::find_edges() {
+    return this->G->find_edges(this);
+}
+
 std::unordered_set<Node_ref>
 GraphInterface::get_connected_nodes(std::vector<nb::type_object> types) {
     auto edges = this->get_edges();
@@ -0,0 +1,81 @@
+/* This file is part of the faebryk project
+ * SPDX-License-Identifier: MIT
+ */
+
+#include "graph/pathcache.hpp"
+#include "graph/graphinterfaces.hpp"
+#include "pathfinder/pathfinder.hpp"
+
+PathCache::PathCache(Graph &G)
+  : G(G) {
+}
+
+void PathCache::sync() {
+    auto generation = this->G.get_generation();
+    if (this->generation == generation &&
+        this->limits_generation == PATH_LIMITS_GENERATION) {
+        return;
+    }
+    this->entries.clear();
+    this->generation = generation;
+    this->limits_generation = PATH_LIMITS_GENERATION;
+}
+
+std::optional<std::vector<Path>> PathCache::get(Node_ref src,
+                                                const std::vector<Node_ref> &dst) {
+    if (!PATH_CACHE) {
+        return {};
+    }
+    this->sync();
+
+    auto it = this->entries.find(src->get_self_gif().get());
+    if (it == this->entries.end()) {
+        this->misses++;
+        return {};
+    }
+    this->hits++;
+
+    if (dst.empty()) {
+        return it->second;
+    }
+
+    Set<GI_ref_weak> dsts;
+    for (auto &d : dst) {
+        dsts.insert(d->get_self_gif().get());
+    }
+    std::vector<Path> paths;
+    for (auto &path : it->second) {
+        if (dsts.contains(path.last())) {
+            paths.push_back(path);
+        }
+    }
+    return paths;
+}
+
+void PathCache::put(Node_ref src, const std::vector<Path> &paths) {
+    if (!PATH_CACHE) {
+        return;
+    }
+    this->sync();
+    // Path is not assignable
+    auto gif = src->get_self_gif().get();
+    this->entries.erase(gif);
+    this->entries.emplace(gif, paths);
+}
+
+void PathCache::clear() {
+    this->entries.clear();
+}
+
+size_t PathCache::get_hits() {
+    return this->hits;
+}
+
+size_t PathCache::get_misses() {
+    return this->misses;
+}
+
+size_t PathCache::size() {
+    this->sync();
+    return this->entries.size();
+}
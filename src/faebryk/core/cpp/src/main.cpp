@@ -2,11 +2,14 @@
  * SPDX-License-Identifier: MIT
  */
 
+#include "graph/connectivity.hpp"
 #include "graph/graph.hpp"
 #include "graph/graphinterfaces.hpp"
 #include "graph/links.hpp"
+#include "graph/pathcache.hpp"
 #include "nano.hpp"
 #include "pathfinder/pathfinder.hpp"
+#include "pathfinder/profile.hpp"
 #include <nanobind/nanobind.h>
 
 // check if c++20 is used
@@ -47,17 +50,103 @@ void print_obj_pyptr(PyObject *pyobj) {
     print_obj(obj);
 }
 
+void profile_queries(PerfCounter &pc, size_t queries, size_t cache_hits,
+                     size_t index_hits) {
+    if (!PATHFINDER_PROFILE) {
+        return;
+    }
+    auto time_s = pc.s();
+    PathFinderProfile::record([&](PathFinderProfile &profile) {
+        profile.queries += queries;
+        profile.cache_hits += cache_hits;
+        profile.index_hits += index_hits;
+        profile.time_s += time_s;
+    });
+}
+
 std::pair<std::vector<Path>, std::vector<Counter>>
 find_paths(Node_ref src, std::vector<Node_ref> dst) {
     PerfCounter pc;
 
+    auto &cache = src->get_graph()->get_path_cache();
+    if (auto paths = cache.get(src, dst)) {
+        profile_queries(pc, 1, 1, 0);
+        return std::make_pair(*paths, std::vector<Counter>{});
+    }
+
+    if (auto paths = src->get_graph()->get_connectivity().find_paths(src, dst)) {
+        if (dst.empty()) {
+            cache.put(src, *paths);
+        }
+        profile_queries(pc, 1, 0, 1);
+        return std::make_pair(*paths, std::vector<Counter>{});
+    }
+
     PathFinder pf;
     auto res = pf.find_paths(src, dst);
+    // searches with destinations stop early
+    if (dst.empty()) {
+        cache.put(src, res.first);
+    }
 
-    printf("TIME: %3.2lf ms C++ find paths\n", pc.ms());
+    profile_queries(pc, 1, 0, 0);
     return res;
 }
 
+std::vector<std::pair<std::vector<Path>, std::vector<Counter>>>
+find_paths_many(std::vector<Node_ref> srcs) {
+    PerfCounter pc;
+
+    std::vector<std::optional<std::pair<std::vector<Path>, std::vector<Counter>>>>
+        results(srcs.size());
+    Map<Node *, size_t> done;
+    std::vector<size_t> duplicates;
+    std::vector<Node_ref> pf_srcs;
+    std::vector<size_t> pf_indices;
+    size_t cache_hits = 0;
+    size_t index_hits = 0;
+    for (size_t i = 0; i < srcs.size(); i++) {
+        auto &src = srcs[i];
+        if (done.contains(src.get())) {
+            duplicates.push_back(i);
+            continue;
+        }
+        done[src.get()] = i;
+        auto &cache = src->get_graph()->get_path_cache();
+        if (auto paths = cache.get(src, {})) {
+            results[i].emplace(std::move(*paths), std::vector<Counter>{});
+            cache_hits++;
+            continue;
+        }
+        if (auto paths = src->get_graph()->get_connectivity().find_paths(src, {})) {
+            cache.put(src, *paths);
+            index_hits++;
+            results[i].emplace(std::move(*paths), std::vector<Counter>{});
+            continue;
+        }
+        pf_srcs.push_back(src);
+        pf_indices.push_back(i);
+    }
+
+    auto pf_out = PathFinder::find_paths_concurrent(pf_srcs);
+    for (size_t i = 0; i < pf_out.size(); i++) {
+        pf_srcs[i]->get_graph()->get_path_cache().put(pf_srcs[i], pf_out[i].first);
+        results[pf_indices[i]].emplace(std::move(pf_out[i]));
+    }
+    for (auto i : duplicates) {
+        results[i].emplace(*results[done[srcs[i].get()]]);
+    }
+
+    std::vector<std::pair<std::vector<Path>, std::vector<Counter>>> out;
+    out.reserve(results.size());
+    for (auto &result : results) {
+        out.push_back(std::move(*result));
+    }
+
+    profile_queries(pc, srcs.size(), cache_hits, index_hits);
+    return out;
+}
+
 PYMOD(m) {
     m.doc() = "faebryk core c++ module";
 
@@ -68,7 +157,15 @@ PYMOD(m) {
 
     // TODO why this rv_pol needed
     m.def("find_paths", &find_paths, "src"_a, "dst"_a, nb::rv_policy::reference);
+    m.def("find_paths_many", &find_paths_many, "srcs"_a, nb::rv_policy::reference);
     m.def("set_indiv_measure", &set_indiv_measure, "value"_a);
+    m.def("set_connectivity_index", &set_connectivity_index, "value"_a);
+    m.def("set_path_cache", &set_path_cache, "value"_a);
+    m.def("set_frozen_adjacency", &set_frozen_adjacency, "value"_a);
+    m.def("set_pathfinder_threads", &set_pathfinder_threads, "threads"_a);
+    m.def("set_pathfinder_profile", &set_pathfinder_profile, "value"_a);
+    m.def("get_pathfinder_profile", &PathFinderProfile::snapshot);
+    m.def("reset_pathfinder_profile", &PathFinderProfile::reset);
 
     m.def("set_max_paths", &set_max_paths);
     // Graph
@@ -97,16 +194,26 @@ PYMOD(m) {
         .def(nb::init<>())
         .def("get_edges", &Graph::get_edges, nb::rv_policy::reference)
         .def_prop_ro("edges", &Graph::all_edges, nb::rv_policy::reference)
+        .def("edges_since", &Graph::edges_since, "n"_a, nb::rv_policy::reference)
         .def("get_gifs", &Graph::get_gifs, nb::rv_policy::reference)
         .def("invalidate", &Graph::invalidate)
+        .def_prop_ro("generation", &Graph::get_generation)
+        .def_prop_ro("path_cache", &Graph::get_path_cache, nb::rv_policy::reference_internal)
         .def_prop_ro("node_count", &Graph::node_count)
         .def_prop_ro("edge_count", &Graph::edge_count)
         .def("node_projection", &Graph::node_projection)
+        .def("nodes_of_types", &Graph::nodes_of_types, "types"_a)
         .def("nodes_by_names", &Graph::nodes_by_names)
         .def("bfs_visit", &Graph::bfs_visit, "filter"_a, "start"_a,
              nb::rv_policy::reference)
         .def("__repr__", &Graph::repr);
 
+    nb::class_<PathCache>(m, "PathCache")
+        .def_prop_ro("hits", &PathCache::get_hits)
+        .def_prop_ro("misses", &PathCache::get_misses)
+        .def("__len__", &PathCache::size)
+        .def("clear", &PathCache::clear);
+
     nb::exception<LinkExists>(m, "LinkExists");
     // nb::class_<LinkExists>(m, "LinkExists")
     //     .def("existing_link", &LinkExists::get_existing_link,
@@ -203,6 +310,29 @@ PYMOD(m) {
         .def_ro("multi", &Counter::multi)
         .def_ro("total_counter", &Counter::total_counter);
 
+    nb::class_<BFSProfile>(m, "BFSProfile")
+        .def_ro("searches", &BFSProfile::searches)
+        .def_ro("paths", &BFSProfile::paths)
+        .def_ro("peak_queue", &BFSProfile::peak_queue)
+        .def_ro("peak_arena_bytes", &BFSProfile::peak_arena_bytes)
+        .def_ro("time_setup_s", &BFSProfile::time_setup_s)
+        .def_ro("time_search_s", &BFSProfile::time_search_s)
+        .def_ro("time_edges_s", &BFSProfile::time_edges_s)
+        .def_ro("time_check_visited_s", &BFSProfile::time_check_visited_s)
+        .def_ro("time_new_path_s", &BFSProfile::time_new_path_s)
+        .def_ro("time_set_insert_s", &BFSProfile::time_set_insert_s)
+        .def_ro("time_deque_insert_s", &BFSProfile::time_deque_insert_s)
+        .def_ro("time_non_filter_s", &BFSProfile::time_non_filter_s)
+        .def_ro("time_filter_s", &BFSProfile::time_filter_s);
+
+    nb::class_<PathFinderProfile>(m, "PathFinderProfile")
+        .def_ro("queries", &PathFinderProfile::queries)
+        .def_ro("cache_hits", &PathFinderProfile::cache_hits)
+        .def_ro("index_hits", &PathFinderProfile::index_hits)
+        .def_ro("time_s", &PathFinderProfile::time_s)
+        .def_ro("bfs", &PathFinderProfile::bfs)
+        .def_ro("counters", &PathFinderProfile::counters);
+
     // Path
     nb::class_<Edge>(m, "Edge")
         .def("__repr__", &Edge::str)
@@ -3,7 +3,9 @@
  */
 
 #include "pathfinder/bfs.hpp"
+#include "graph/links.hpp"
 #include "perf.hpp"
+#include <algorithm>
 #include <deque>
 #include <sstream>
 
@@ -38,40 +40,173 @@ std::string UnresolvedStackElement::str() /*const*/ {
     return ss.str();
 }
 
+// PathArena implementations
+uint32_t PathArena::add(/*const*/ GI_ref_weak gif, uint32_t parent, bool conditional) {
+    Entry entry{
+        .gif = gif,
+        .parent = parent,
+        .length = 1,
+        .signature = signature_of(gif),
+        .conditional = conditional,
+    };
+    if (parent != NO_PARENT) {
+        auto &parent_entry = entries[parent];
+        entry.length += parent_entry.length;
+        entry.signature |= parent_entry.signature;
+        entry.conditional |= parent_entry.conditional;
+    }
+    entries.push_back(entry);
+    return entries.size() - 1;
+}
+
+uint64_t PathArena::signature_of(/*const*/ GI_ref_weak gif) {
+    // fibonacci hashing of the pointer to one of 64 bits
+    auto h = reinterpret_cast<uintptr_t>(gif) * 0x9E3779B97F4A7C15ull;
+    return uint64_t(1) << (h >> 58);
+}
+
 // BFSPath implementations
 BFSPath::BFSPath(/*const*/ GI_ref_weak path_head)
-  : Path(path_head)
+  : arena(std::make_shared<PathArena>())
   , path_data(std::make_shared<PathData>()) {
+    head = arena->add(path_head, PathArena::NO_PARENT, false);
 }
 
 BFSPath::BFSPath(const BFSPath &other)
-  : Path(other)
+  : arena(other.arena)
+  , head(other.head)
   , path_data(std::make_shared<PathData>(*other.path_data))
   , confidence(other.confidence)
   , filtered(other.filtered)
   , stop(other.stop) {
 }
 
-BFSPath::BFSPath(const BFSPath &other, /*const*/ GI_ref_weak new_head)
-  : Path(other)
+BFSPath::BFSPath(const BFSPath &other, /*const*/ GI_ref_weak new_head,
+                 Link_weak_ref link)
+  : arena(other.arena)
   , path_data(other.path_data)
   , confidence(other.confidence)
   , filtered(other.filtered)
   , stop(other.stop) {
-    path.push_back(new_head);
     assert(!other.filtered);
+    head = arena->add(new_head, other.head,
+                      dynamic_cast<LinkDirectConditional *>(link) != nullptr);
 }
 
 BFSPath::BFSPath(BFSPath &&other)
-  : Path(std::move(other))
+  : arena(std::move(other.arena))
+  , head(other.head)
   , path_data(std::move(other.path_data))
   , confidence(other.confidence)
   , filtered(other.filtered)
   , stop(other.stop) {
 }
 
-BFSPath BFSPath::operator+(/*const*/ GI_ref_weak gif) {
-    return BFSPath(*this, gif);
+BFSPath BFSPath::extend(/*const*/ GI_ref_weak gif, Link_weak_ref link) {
+    return BFSPath(*this, gif, link);
+}
+
+const PathArena::Entry &BFSPath::entry(uint32_t i) /*const*/ {
+    return arena->entries[i];
+}
+
+/*const*/ Link_weak_ref BFSPath::get_link(Edge edge) /*const*/ {
+    auto out = edge.from->is_connected(edge.to);
+    assert(out);
+    return out->get();
+}
+
+std::optional<Edge> BFSPath::last_edge() /*const*/ {
+    auto &to = entry(head);
+    if (to.parent == PathArena::NO_PARENT) {
+        return {};
+    }
+    return Edge{entry(to.parent).gif, to.gif};
+}
+
+std::optional<TriEdge> BFSPath::last_tri_edge() /*const*/ {
+    auto &three = entry(head);
+    if (three.length < 3) {
+        return {};
+    }
+    auto &two = entry(three.parent);
+    auto &one = entry(two.parent);
+    return std::make_tuple(one.gif, two.gif, three.gif);
+}
+
+/*const*/ GI_ref_weak BFSPath::last() /*const*/ {
+    return entry(head).gif;
+}
+
+/*const*/ GI_ref_weak BFSPath::first() /*const*/ {
+    // every arena is started by a single root path
+    return entry(0).gif;
+}
+
+/*const*/ GI_ref_weak BFSPath::operator[](int idx) /*const*/ {
+    auto len = size();
+    if (idx < 0) {
+        idx = len + idx;
+    }
+    if (idx < 0 || size_t(idx) >= len) {
+        throw std::out_of_range("Path index out of range");
+    }
+    auto i = head;
+    for (size_t steps = len - 1 - idx; steps > 0; steps--) {
+        i = entry(i).parent;
+    }
+    return entry(i).gif;
+}
+
+size_t BFSPath::size() /*const*/ {
+    return entry(head).length;
+}
+
+bool BFSPath::contains(/*const*/ GI_ref_weak gif) /*const*/ {
+    if (!(entry(head).signature & PathArena::signature_of(gif))) {
+        return false;
+    }
+    for (auto i = head; i != PathArena::NO_PARENT; i = entry(i).parent) {
+        if (entry(i).gif == gif) {
+            return true;
+        }
+    }
+    return false;
+}
+
+size_t BFSPath::index(/*const*/ GI_ref_weak gif) /*const*/ {
+    for (auto i = head; i != PathArena::NO_PARENT; i = entry(i).parent) {
+        if (entry(i).gif == gif) {
+            return entry(i).length - 1;
+        }
+    }
+    return size();
+}
+
+bool BFSPath::has_conditional_link() /*const*/ {
+    return entry(head).conditional;
+}
+
+std::vector</*const*/ GI_ref_weak> BFSPath::get_path() /*const*/ {
+    std::vector</*const*/ GI_ref_weak> out(size());
+    auto i = head;
+    for (auto it = out.rbegin(); it != out.rend(); ++it) {
+        *it = entry(i).gif;
+        i = entry(i).parent;
+    }
+    return out;
+}
+
+std::shared_ptr<PathArena> BFSPath::get_arena() /*const*/ {
+    return arena;
+}
+
+Path BFSPath::materialize() /*const*/ {
+    return Path(get_path());
+}
+
+std::string BFSPath::str() /*const*/ {
+    return materialize().str();
 }
 
 PathData &BFSPath::get_path_data_mut() {
@@ -95,9 +230,16 @@ bool BFSPath::strong() /*const*/ {
     return confidence == 1.0;
 }
 
-void bfs_visit(/*const*/ GI_ref_weak root, std::function<void(BFSPath &)> visitor) {
-    PerfCounterAccumulating pc, pc_search, pc_set_insert, pc_setup, pc_deque_insert,
-        pc_edges, pc_check_visited, pc_filter, pc_new_path;
+void bfs_visit(/*const*/ GI_ref_weak root, std::function<void(BFSPath &)> visitor,
+               BFSProfile *profile) {
+    // timers don't touch the clock unless profiling
+    bool profiling = profile != nullptr;
+    PerfCounterAccumulating pc(profiling), pc_search(profiling),
+        pc_set_insert(profiling), pc_setup(profiling), pc_deque_insert(profiling),
+        pc_edges(profiling), pc_check_visited(profiling), pc_filter(profiling),
+        pc_new_path(profiling);
+    size_t path_cnt = 0;
+    size_t peak_queue = 0;
     pc_set_insert.pause();
     pc_search.pause();
     pc_deque_insert.pause();
@@ -106,7 +248,9 @@ void bfs_visit(/*const*/ GI_ref_weak root, std::function<void(BFSPath &)> visito
     pc_filter.pause();
     pc_new_path.pause();
 
-    auto node_count = root->get_graph()->node_count();
+    auto G = root->get_graph();
+    auto adjacency = G->get_adjacency();
+    auto node_count = G->node_count();
     std::vector<bool> visited(node_count, false);
     std::vector<bool> visited_weak(node_count, false);
     std::deque<BFSPath> open_path_queue;
@@ -115,6 +259,7 @@ void bfs_visit(/*const*/ GI_ref_weak root, std::function<void(BFSPath &)> visito
         pc.pause();
         pc_filter.resume();
         visitor(path);
+        path_cnt++;
         pc_filter.pause();
         pc.resume();
 
@@ -137,51 +282,77 @@ void bfs_visit(/*const*/ GI_ref_weak root, std::function<void(BFSPath &)> visito
 
         pc_deque_insert.resume();
         open_path_queue.push_back(std::move(path));
+        peak_queue = std::max(peak_queue, open_path_queue.size());
         pc_deque_insert.pause();
     };
 
     pc_setup.pause();
-    handle_path(std::move(BFSPath(root)));
+    BFSPath root_path(root);
+    auto arena = root_path.get_arena();
+    handle_path(std::move(root_path));
 
     pc_search.resume();
     while (!open_path_queue.empty()) {
         auto path = std::move(open_path_queue.front());
         open_path_queue.pop_front();
 
-        pc_edges.resume();
-        auto edges = path.last()->get_gif_edges();
-        pc_edges.pause();
-        for (auto &neighbour : edges) {
+        auto visit_neighbour = [&](GI_ref_weak neighbour, Link_weak_ref link) {
             pc_check_visited.resume();
             if (visited[neighbour->v_i]) {
                 pc_check_visited.pause();
-                continue;
+                return;
             }
             if (visited_weak[neighbour->v_i] && path.contains(neighbour)) {
                 pc_check_visited.pause();
-                continue;
+                return;
             }
             pc_check_visited.pause();
 
             pc_new_path.resume();
-            auto new_path = path + neighbour;
+            auto new_path = path.extend(neighbour, link);
             pc_new_path.pause();
             pc_search.pause();
             handle_path(std::move(new_path));
             pc_search.resume();
+        };
+
+        if (adjacency) {
+            auto v_i = path.last()->v_i;
+            auto neighbours = adjacency->get_neighbours(v_i);
+            auto links = adjacency->get_links(v_i);
+            for (size_t i = 0; i < neighbours.size(); i++) {
+                visit_neighbour(adjacency->gifs[neighbours[i]], links[i]);
+            }
+            continue;
+        }
+
+        pc_edges.resume();
+        auto &edges = path.last()->find_edges();
+        pc_edges.pause();
+        for (auto &[neighbour, link] : edges) {
+            visit_neighbour(neighbour, link.get());
         }
     }
     pc_set_insert.pause();
     pc_search.pause();
     pc.pause();
 
-    printf("   TIME: %3.2lf ms BFS Check Visited\n", pc_check_visited.ms());
-    printf("   TIME: %3.2lf ms BFS Edges\n", pc_edges.ms());
-    printf("   TIME: %3.2lf ms BFS New Path\n", pc_new_path.ms());
-    printf("  TIME: %3.2lf ms BFS Search\n", pc_search.ms());
-    printf("  TIME: %3.2lf ms BFS Setup\n", pc_setup.ms());
-    printf("  TIME: %3.2lf ms BFS Set Insert\n", pc_set_insert.ms());
-    printf("  TIME: %3.2lf ms BFS Deque Insert\n", pc_deque_insert.ms());
-    printf(" TIME: %3.2lf ms BFS Non-filter total\n", pc.ms());
-    printf(" TIME: %3.2lf ms BFS Filter total\n", pc_filter.ms());
+    if (!profile) {
+        return;
+    }
+    profile->searches++;
+    profile->paths += path_cnt;
+    profile->peak_queue = std::max(profile->peak_queue, peak_queue);
+    profile->peak_arena_bytes =
+        std::max(profile->peak_arena_bytes,
+                 arena->entries.capacity() * sizeof(PathArena::Entry));
+    profile->time_check_visited_s += pc_check_visited.s();
+    profile->time_edges_s += pc_edges.s();
+    profile->time_new_path_s += pc_new_path.s();
+    profile->time_search_s += pc_search.s();
+    profile->time_setup_s += pc_setup.s();
+    profile->time_set_insert_s += pc_set_insert.s();
+    profile->time_deque_insert_s += pc_deque_insert.s();
+    profile->time_non_filter_s += pc.s();
+    profile->time_filter_s += pc_filter.s();
 }
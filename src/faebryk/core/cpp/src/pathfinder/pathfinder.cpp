@@ -6,6 +6,8 @@
 #include "graph/links.hpp"
 #include "pathfinder/bfs.hpp"
 #include "pathfinder/pathcounter.hpp"
+#include <atomic>
+#include <thread>
 #include <unordered_map>
 #include <unordered_set>
 
@@ -123,9 +125,12 @@ PathFinder::find_paths(Node_ref src, std::vector<Node_ref> dst) {
 
     Counter total_counter{.name = "total", .total_counter = true};
 
-    PerfCounter pc_bfs;
+    std::optional<BFSProfile> bfs_profile;
+    if (PATHFINDER_PROFILE) {
+        bfs_profile.emplace();
+    }
 
-    bfs_visit(src->get_self_gif().get(), [&](BFSPath &p) {
+    auto visitor = [&](BFSPath &p) {
         bool res = total_counter.exec(this, &PathFinder::run_filters, p);
         if (!res) {
             return;
@@ -139,9 +144,9 @@ PathFinder::find_paths(Node_ref src, std::vector<Node_ref> dst) {
             }
         }
         paths.push_back(p);
-    });
-
-    printf("TIME: %3.2lf ms BFS\n", pc_bfs.ms());
+    };
+    bfs_visit(src->get_self_gif().get(), visitor,
+              bfs_profile ? &*bfs_profile : nullptr);
 
     Counter counter_split_join{
         .name = "split join",
@@ -151,11 +156,12 @@ PathFinder::find_paths(Node_ref src, std::vector<Node_ref> dst) {
         this, &PathFinder::_filter_paths_by_split_join, this->multi_paths);
 
     std::vector<Path> paths_out;
+    paths_out.reserve(paths.size() + multi_paths.size());
     for (auto &p : paths) {
-        paths_out.push_back(Path(std::move(p.get_path())));
+        paths_out.push_back(p.materialize());
     }
     for (auto &p : multi_paths) {
-        paths_out.push_back(Path(std::move(p.get_path())));
+        paths_out.push_back(p.materialize());
     }
 
     std::vector<Counter> counters;
@@ -169,14 +175,75 @@ PathFinder::find_paths(Node_ref src, std::vector<Node_ref> dst) {
     counters.push_back(counter_split_join);
     counters.push_back(total_counter);
 
+    if (bfs_profile) {
+        PathFinderProfile::record([&](PathFinderProfile &profile) {
+            profile.bfs.merge(*bfs_profile);
+            profile.add_counters(counters);
+        });
+    }
+
     return std::make_pair(paths_out, counters);
 }
 
+std::vector<std::pair<std::vector<Path>, std::vector<Counter>>>
+PathFinder::find_paths_concurrent(const std::vector<Node_ref> &srcs) {
+    std::vector<std::pair<std::vector<Path>, std::vector<Counter>>> out;
+    out.reserve(srcs.size());
+
+    auto threads = std::min(PATHFINDER_THREADS, srcs.size());
+    if (threads <= 1) {
+        for (auto &src : srcs) {
+            PathFinder pf;
+            out.push_back(pf.find_paths(src, {}));
+        }
+        return out;
+    }
+
+    std::vector<std::optional<std::pair<std::vector<Path>, std::vector<Counter>>>>
+        results(srcs.size());
+
+    // build lazy graph state before the workers read it concurrently
+    for (auto &src : srcs) {
+        src->get_graph()->get_adjacency();
+    }
+
+    std::atomic<size_t> next = 0;
+    std::vector<std::exception_ptr> errors(threads);
+    {
+        nb::gil_scoped_release release;
+
+        std::vector<std::thread> workers;
+        for (size_t t = 0; t < threads; t++) {
+            workers.emplace_back([&, t]() {
+                try {
+                    for (auto i = next++; i < srcs.size(); i = next++) {
+                        PathFinder pf;
+                        results[i].emplace(pf.find_paths(srcs[i], {}));
+                    }
+                } catch (...) {
+                    errors[t] = std::current_exception();
+                    next = srcs.size();
+                }
+            });
+        }
+        for (auto &worker : workers) {
+            worker.join();
+        }
+    }
+
+    for (auto &error : errors) {
+        if (error) {
+            std::rethrow_exception(error);
+        }
+    }
+    for (auto &result : results) {
+        out.push_back(std::move(*result));
+    }
+    return out;
+}
+
 bool PathFinder::_count(BFSPath &p) {
     path_cnt++;
-    if (path_cnt % 50000 == 0) {
-        printf("path_cnt: %lld\n", path_cnt);
-    }
     if (path_cnt > PATH_LIMITS.absolute) {
         p.stop = true;
     }
@@ -308,25 +375,30 @@ bool PathFinder::_filter_path_by_dead_end_split(BFSPath &p) {
 }
 
 bool PathFinder::_filter_conditional_link(BFSPath &p) {
-    auto edge = p.last_edge();
-    if (!edge) {
+    // tracked by the arena while extending the path
+    if (!p.has_conditional_link()) {
         return true;
     }
-    /*const*/ auto linkobj = p.get_link(*edge);
     // printf("Path: %s\n", p.str().c_str());
-    // printf("Edge: %s\n", edge->str().c_str());
 
+    auto path = p.materialize();
     bool ok = true;
-    p.iterate_edges([&](Edge &edge) {
-        auto link_conditional = dynamic_cast<LinkDirectConditional *>(p.get_link(edge));
+    // filters might be implemented in Python, acquire the GIL once per path
+    std::optional<nb::gil_scoped_acquire> gil;
+    path.iterate_edges([&](Edge &edge) {
+        auto link_conditional =
+            dynamic_cast<LinkDirectConditional *>(path.get_link(edge));
         if (!link_conditional) {
             return true;
         }
-        bool is_last_edge = edge.to == p.last();
+        bool is_last_edge = edge.to == path.last();
         if (link_conditional->needs_to_check_only_first_in_path() && !is_last_edge) {
             return true;
         }
-        bool filtered_out = link_conditional->run_filter(p) !=
+        if (!gil) {
+            gil.emplace();
+        }
+        bool filtered_out = link_conditional->run_filter(path) !=
                             LinkDirectConditional::FilterResult::FILTER_PASS;
         ok &= !filtered_out;
         // no need to iterate further
@@ -378,6 +450,12 @@ PathFinder::_filter_paths_by_split_join(std::vector<BFSPath> &paths) {
     //            start_gif->get_full_name().c_str());
     // }
 
+    // get_children filters by Python types
+    std::optional<nb::gil_scoped_acquire> gil;
+    if (!split.empty()) {
+        gil.emplace();
+    }
+
     // check split map
     for (auto &[start_gif, split_paths] : split) {
         auto children = start_gif->get_node()->get_children(
@@ -421,6 +499,5 @@ PathFinder::_filter_paths_by_split_join(std::vector<BFSPath> &paths) {
         p.confidence = 1.0;
         paths_out.push_back(p);
     }
-    printf("Filtered paths: %zu\n", paths_out.size());
     return paths_out;
 }
@@ -0,0 +1,60 @@
+/* This file is part of the faebryk project
+ * SPDX-License-Identifier: MIT
+ */
+
+#include "pathfinder/profile.hpp"
+#include <algorithm>
+#include <cstring>
+
+std::mutex PathFinderProfile::mutex;
+PathFinderProfile PathFinderProfile::global;
+
+void BFSProfile::merge(const BFSProfile &other) {
+    searches += other.searches;
+    paths += other.paths;
+    peak_queue = std::max(peak_queue, other.peak_queue);
+    peak_arena_bytes = std::max(peak_arena_bytes, other.peak_arena_bytes);
+
+    time_setup_s += other.time_setup_s;
+    time_search_s += other.time_search_s;
+    time_edges_s += other.time_edges_s;
+    time_check_visited_s += other.time_check_visited_s;
+    time_new_path_s += other.time_new_path_s;
+    time_set_insert_s += other.time_set_insert_s;
+    time_deque_insert_s += other.time_deque_insert_s;
+    time_non_filter_s += other.time_non_filter_s;
+    time_filter_s += other.time_filter_s;
+}
+
+void PathFinderProfile::add_counters(const std::vector<Counter> &other) {
+    for (auto &counter : other) {
+        auto it = std::find_if(counters.begin(), counters.end(), [&](auto &c) {
+            return std::strcmp(c.name, counter.name) == 0;
+        });
+        if (it == counters.end()) {
+            counters.push_back(counter);
+            continue;
+        }
+        it->in_cnt += counter.in_cnt;
+        it->weak_in_cnt += counter.weak_in_cnt;
+        it->out_weaker += counter.out_weaker;
+        it->out_stronger += counter.out_stronger;
+        it->out_cnt += counter.out_cnt;
+        it->time_spent_s += counter.time_spent_s;
+    }
+}
+
+void PathFinderProfile::record(std::function<void(PathFinderProfile &)> f) {
+    std::lock_guard<std::mutex> lock(mutex);
+    f(global);
+}
+
+PathFinderProfile PathFinderProfile::snapshot() {
+    std::lock_guard<std::mutex> lock(mutex);
+    return global;
+}
+
+void PathFinderProfile::reset() {
+    std::lock_guard<std::mutex> lock(mutex);
+    global = PathFinderProfile{};
+}
@@ -28,6 +28,14 @@ PerfCounterAccumulating::PerfCounterAccumulating() {
     start = std::chrono::high_resolution_clock::now();
 }
 
+PerfCounterAccumulating::PerfCounterAccumulating(bool enabled)
+  : paused(!enabled)
+  , enabled(enabled) {
+    if (enabled) {
+        start = std::chrono::high_resolution_clock::now();
+    }
+}
+
 void PerfCounterAccumulating::pause() {
     if (paused) {
         return;
@@ -39,7 +47,7 @@ void PerfCounterAccumulating::pause() {
 }
 
 void PerfCounterAccumulating::resume() {
-    if (!paused) {
+    if (!paused || !enabled) {
         return;
     }
     start = std::chrono::high_resolution_clock::now();
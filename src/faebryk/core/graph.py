@@ -2,16 +2,25 @@
 # SPDX-License-Identifier: MIT
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
-from faebryk.core.cpp import Graph
+from faebryk.core.cpp import Graph, set_frozen_adjacency
 from faebryk.core.node import Node
+from faebryk.libs.util import ConfigFlag
 
 if TYPE_CHECKING:
     from faebryk.core.trait import Trait
 
 logger = logging.getLogger(__name__)
 
+# Also in C++
+FROZEN_ADJACENCY = ConfigFlag(
+    "FROZEN_ADJACENCY",
+    default=False,
+    descr="Traverse graphs via a compact adjacency, rebuilt after mutations",
+)
+set_frozen_adjacency(bool(FROZEN_ADJACENCY))
+
 
 # TODO move these to C++
 # just here for making refactoring easier for the moment
@@ -26,24 +35,35 @@ class GraphFunctions:
         return list(self.nodes_of_type(Node))
 
     def nodes_with_trait[T: "Trait"](self, trait: type[T]) -> list[tuple["Node", T]]:
-        return [
-            (n, n.get_trait(trait))
-            for n in self.node_projection()
-            if n.has_trait(trait)
-        ]
+        from faebryk.core.trait import TraitImpl
+
+        # trait impls are nodes of the trait type, so find them instead of
+        # checking every node
+        out: dict[Node, T] = {}
+        for impl in self.nodes_of_type(trait):
+            if not TraitImpl.is_traitimpl(impl) or not (p := impl.get_parent()):
+                continue
+            n = cast(Node, p[0])
+            if n in out:
+                continue
+            if (t := n.try_get_trait(trait)) is not None:
+                out[n] = t
+        return list(out.items())
 
     # TODO: Waiting for python to add support for type mapping
     def nodes_with_traits[*Ts](
         self, traits: tuple[*Ts]
     ):  # -> list[tuple[Node, tuple[*Ts]]]:
+        if not traits:
+            return [(n, ()) for n in self.node_projection()]
         return [
             (n, tuple(n.get_trait(trait) for trait in traits))  # type: ignore
-            for n in self.node_projection()
-            if all(n.has_trait(trait) for trait in traits)  # type: ignore
+            for n, _ in self.nodes_with_trait(traits[0])  # type: ignore
+            if all(n.has_trait(trait) for trait in traits[1:])  # type: ignore
         ]
 
     def nodes_of_type[T: "Node"](self, t: type[T]) -> set[T]:
-        return {n for n in self.graph.node_projection() if isinstance(n, t)}
+        return cast(set[T], self.graph.nodes_of_types([t]))
 
     def nodes_of_types(self, t: tuple[type["Node"], ...]) -> set["Node"]:
-        return {n for n in self.graph.node_projection() if isinstance(n, t)}
+        return self.graph.nodes_of_types(list(t))
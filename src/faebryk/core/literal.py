@@ -0,0 +1,533 @@
+# This file is part of the faebryk project
+# SPDX-License-Identifier: MIT
+
+"""
+Immutable values of fully resolved parameters.
+
+Parameter nodes are expensive to create, they live in the graph.
+The operators of Parameter only need the values of their operands though,
+so they compute on these plain values and promote the result to a Parameter
+node only when it is handed back to the design.
+
+Semantics (tolerant equality, bound ordering, intersections) mirror the ones of
+Constant, Range and Set.
+"""
+
+import math
+import operator
+from dataclasses import dataclass
+from functools import reduce
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Optional, Sequence
+
+import numpy as np
+
+from faebryk.libs.units import Quantity, Unit
+from faebryk.libs.util import TwistArgs
+
+if TYPE_CHECKING:
+    from faebryk.core.parameter import Parameter
+
+
+# np.allclose defaults
+_RTOL = 1e-5
+_ATOL = 1e-8
+
+
+def _close(a: float, b: float) -> bool:
+    # same as np.allclose for scalars, without the array dispatch
+    if a == b:
+        return True
+    if math.isinf(a) or math.isinf(b):
+        return False
+    return abs(a - b) <= _ATOL + _RTOL * abs(b)
+
+
+def values_equal(a: Any, b: Any) -> bool:
+    """
+    Equality of Constant values, tolerant for numeric values (incl. quantities).
+    """
+    if type(a) in (int, float) and type(b) in (int, float):
+        return _close(a, b)
+    if (
+        isinstance(a, Quantity)
+        and isinstance(b, Quantity)
+        and type(a.magnitude) in (int, float)
+        and type(b.magnitude) in (int, float)
+        and a.units == b.units
+    ):
+        return _close(a.magnitude, b.magnitude)
+
+    try:
+        return bool(np.allclose(a, b))
+    except (TypeError, np.exceptions.DTypePromotionError):
+        ...
+
+    return a == b
+
+
+def _lt(a: Any, b: Any) -> bool:
+    return not values_equal(a, b) and a < b
+
+
+def _gt(a: Any, b: Any) -> bool:
+    return not values_equal(a, b) and a > b
+
+
+def _le(a: Any, b: Any) -> bool:
+    return values_equal(a, b) or a <= b
+
+
+def _ge(a: Any, b: Any) -> bool:
+    return values_equal(a, b) or a >= b
+
+
+def _min(values: list[Any]) -> Any:
+    # same pick as builtin min on Constants
+    return reduce(lambda acc, v: v if _lt(v, acc) else acc, values)
+
+
+def _max(values: list[Any]) -> Any:
+    return reduce(lambda acc, v: v if _gt(v, acc) else acc, values)
+
+
+class LiteralValue:
+    """
+    Base of the immutable parameter values.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def from_parameter(param: "Parameter") -> Optional["LiteralValue"]:
+        """
+        Value of an already narrowed parameter.
+
+        :return: None if the parameter is not fully resolved
+        (e.g. TBD, ANY, Operation or a Range with unresolved bounds)
+        """
+        from faebryk.core.parameter import Parameter
+        from faebryk.library.Constant import Constant
+        from faebryk.library.Range import Range
+        from faebryk.library.Set import Set
+
+        def scalar_value(p: Parameter) -> tuple[bool, Any]:
+            if not isinstance(p, Constant) or isinstance(p.value, Parameter):
+                return False, None
+            return True, p.value
+
+        if isinstance(param, Constant):
+            ok, value = scalar_value(param)
+            return Scalar(value) if ok else None
+
+        if isinstance(param, Range):
+            values = []
+            for bound in param._get_narrowed_bounds():
+                ok, value = scalar_value(bound)
+                if not ok:
+                    return None
+                values.append(value)
+            try:
+                return Interval(_min(values), _max(values))
+            except (TypeError, ValueError):
+                return None
+
+        if isinstance(param, Set):
+            values = []
+            for p in param.params:
+                ok, value = scalar_value(p)
+                if not ok:
+                    return None
+                values.append(Scalar(value))
+            return Discrete(frozenset(values))
+
+        return None
+
+    @staticmethod
+    def from_parameters(
+        *params: "Parameter",
+    ) -> Optional[tuple["LiteralValue", ...]]:
+        out = []
+        for p in params:
+            lit = LiteralValue.from_parameter(p)
+            if lit is None:
+                return None
+            out.append(lit)
+        return tuple(out)
+
+    def to_parameter(self) -> "Parameter":
+        raise NotImplementedError()
+
+    def arithmetic_op(
+        self, other: "LiteralValue", op: Callable
+    ) -> Optional["LiteralValue"]:
+        """
+        :return: None if the result is not representable as literal value
+        """
+
+        def _is_pair[T, U](
+            type1: type[T], type2: type[U]
+        ) -> Optional[tuple[T, U, Callable]]:
+            if isinstance(self, type1) and isinstance(other, type2):
+                return self, other, op
+            if isinstance(self, type2) and isinstance(other, type1):
+                return other, self, TwistArgs(op)
+            return None
+
+        try:
+            if pair := _is_pair(Scalar, Scalar):
+                return Scalar(op(pair[0].value, pair[1].value))
+
+            if pair := _is_pair(Interval, Interval):
+                p0, p1 = pair[0], pair[1]
+                values = [
+                    op(p0.min, p1.min),
+                    op(p0.max, p1.max),
+                    op(p0.min, p1.max),
+                    op(p0.max, p1.min),
+                ]
+                return Interval(_min(values), _max(values))
+
+            if pair := _is_pair(Scalar, Interval):
+                sop = pair[2]
+                values = [sop(pair[0].value, bound) for bound in pair[1].bounds]
+                return Interval(_min(values), _max(values))
+        except (TypeError, ValueError):
+            return None
+
+        # TODO: Set arithmetic is left to the Parameter implementation
+        return None
+
+    def intersect(self, other: "LiteralValue") -> "LiteralValue":
+        """
+        Intersection, returns one of the operands if it is the result.
+        """
+        if self == other:
+            return self
+
+        def _is_pair[T, U](type1: type[T], type2: type[U]) -> Optional[tuple[T, U]]:
+            if isinstance(self, type1) and isinstance(other, type2):
+                return self, other
+            if isinstance(self, type2) and isinstance(other, type1):
+                return other, self
+            return None
+
+        if _is_pair(Scalar, Scalar):
+            return Discrete.EMPTY
+        if pair := _is_pair(Discrete, Discrete):
+            return Discrete(pair[0].values & pair[1].values)
+        if pair := _is_pair(Interval, Interval):
+            min_ = _max([pair[0].min, pair[1].min])
+            max_ = _min([pair[0].max, pair[1].max])
+            if _gt(min_, max_):
+                return Discrete.EMPTY
+            if values_equal(min_, max_):
+                return Scalar(min_)
+            return Interval(min_, max_)
+        if pair := _is_pair(Scalar, Interval):
+            return pair[0] if pair[0] in pair[1] else Discrete.EMPTY
+        if pair := _is_pair(Scalar, Discrete):
+            return pair[0] if pair[0] in pair[1] else Discrete.EMPTY
+        if pair := _is_pair(Interval, Discrete):
+            return Discrete(frozenset(v for v in pair[1].values if v in pair[0]))
+
+        raise NotImplementedError()
+
+    def is_subset_of(self, other: "LiteralValue") -> bool:
+        return self.intersect(other) == self
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Scalar(LiteralValue):
+    value: Any
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Scalar):
+            return False
+        return values_equal(self.value, other.value)
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def to_parameter(self) -> "Parameter":
+        from faebryk.library.Constant import Constant
+
+        return Constant(self.value)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Interval(LiteralValue):
+    min: Any
+    max: Any
+
+    @property
+    def bounds(self) -> tuple[Any, Any]:
+        return self.min, self.max
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Interval):
+            return False
+        return values_equal(self.min, other.min) and values_equal(self.max, other.max)
+
+    def __hash__(self) -> int:
+        return hash((self.min, self.max))
+
+    def __contains__(self, other: Scalar) -> bool:
+        return _le(self.min, other.value) and _ge(self.max, other.value)
+
+    def to_parameter(self) -> "Parameter":
+        from faebryk.library.Range import Range
+
+        return Range(self.min, self.max)
+
+
+@dataclass(frozen=True, slots=True)
+class Discrete(LiteralValue):
+    values: frozenset[Scalar]
+
+    EMPTY: ClassVar["Discrete"]
+
+    def __contains__(self, other: Scalar) -> bool:
+        # not hash based, equality of values is tolerant
+        return any(other == v for v in self.values)
+
+    def to_parameter(self) -> "Parameter":
+        from faebryk.library.Set import Set
+
+        return Set(v.value for v in self.values)
+
+
+Discrete.EMPTY = Discrete(frozenset())
+
+
+# Vectorized ---------------------------------------------------------------------------
+
+
+def _conversion(from_: Optional[Unit], to: Optional[Unit]) -> tuple[float, float]:
+    """
+    Scale and offset converting magnitudes between units, None is unitless.
+    """
+    if from_ == to:
+        return 1.0, 0.0
+    offset = Quantity(0, from_).to(to).magnitude
+    return Quantity(1, from_).to(to).magnitude - offset, offset
+
+
+def _result_units(
+    op: Callable, lhs: Optional[Unit], rhs: Optional[Unit]
+) -> Optional[Unit]:
+    if lhs is None and rhs is None:
+        return None
+    return op(Quantity(1, lhs), Quantity(1, rhs)).units
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class IntervalBatch:
+    """
+    Many Scalars and Intervals as float64 arrays of lower and upper bounds.
+
+    All magnitudes are in the same unit, the units are checked and converted once
+    per distinct unit of the values instead of per value.
+    Scalars are intervals with equal bounds that are marked in `scalar`.
+    """
+
+    lower: np.ndarray
+    upper: np.ndarray
+    scalar: np.ndarray
+    # None for plain numbers
+    units: Optional[Unit] = None
+
+    @classmethod
+    def from_literals(
+        cls, values: "Sequence[Scalar | Interval]", units: Optional[Unit] = None
+    ) -> "IntervalBatch":
+        """
+        :param units: unit of the batch, defaults to the one of the first quantity
+        :raises DimensionalityError: if the values don't fit the unit
+        :raises TypeError, ValueError: if the values are not numeric
+        """
+        bounds = [
+            b
+            for v in values
+            for b in ((v.value, v.value) if isinstance(v, Scalar) else v.bounds)
+        ]
+        if units is None:
+            units = next((b.units for b in bounds if isinstance(b, Quantity)), None)
+
+        conversions: dict[Optional[Unit], tuple[float, float]] = {}
+        magnitudes = np.empty(len(bounds), dtype=np.float64)
+        for i, b in enumerate(bounds):
+            b_units = b.units if isinstance(b, Quantity) else None
+            if b_units not in conversions:
+                conversions[b_units] = _conversion(b_units, units)
+            scale, offset = conversions[b_units]
+            magnitude = b.magnitude if isinstance(b, Quantity) else b
+            magnitudes[i] = magnitude * scale + offset
+
+        return cls(
+            magnitudes[0::2],
+            magnitudes[1::2],
+            np.array([isinstance(v, Scalar) for v in values], dtype=bool),
+            units,
+        )
+
+    def to_literals(self) -> "list[Scalar | Interval]":
+        def wrap(m: float) -> Any:
+            return m if self.units is None else Quantity(m, self.units)
+
+        return [
+            Scalar(wrap(lower)) if scalar else Interval(wrap(lower), wrap(upper))
+            for lower, upper, scalar in zip(
+                self.lower.tolist(), self.upper.tolist(), self.scalar.tolist()
+            )
+        ]
+
+    def to(self, units: Optional[Unit]) -> "IntervalBatch":
+        scale, offset = _conversion(self.units, units)
+        if (scale, offset) == (1.0, 0.0):
+            return IntervalBatch(self.lower, self.upper, self.scalar, units)
+        lower = self.lower * scale + offset
+        upper = self.upper * scale + offset
+        if scale < 0:
+            lower, upper = upper, lower
+        return IntervalBatch(lower, upper, self.scalar, units)
+
+    def _combine(
+        self, other: "IntervalBatch", op: Callable, units: Optional[Unit]
+    ) -> "IntervalBatch":
+        # all combinations of the bounds, like Range x Range
+        with np.errstate(all="ignore"):
+            combinations = np.stack(
+                [
+                    op(self.lower, other.lower),
+                    op(self.upper, other.upper),
+                    op(self.lower, other.upper),
+                    op(self.upper, other.lower),
+                ]
+            )
+        return IntervalBatch(
+            combinations.min(axis=0),
+            combinations.max(axis=0),
+            self.scalar & other.scalar,
+            units,
+        )
+
+    def __add__(self, other: "IntervalBatch") -> "IntervalBatch":
+        return self._combine(other.to(self.units), operator.add, self.units)
+
+    def __sub__(self, other: "IntervalBatch") -> "IntervalBatch":
+        return self._combine(other.to(self.units), operator.sub, self.units)
+
+    def __mul__(self, other: "IntervalBatch") -> "IntervalBatch":
+        units = _result_units(operator.mul, self.units, other.units)
+        return self._combine(other, operator.mul, units)
+
+    def __truediv__(self, other: "IntervalBatch") -> "IntervalBatch":
+        units = _result_units(operator.truediv, self.units, other.units)
+        return self._combine(other, operator.truediv, units)
+
+    def __pow__(self, other: "IntervalBatch") -> "IntervalBatch":
+        exponent = other.to(None)
+        if self.units is None:
+            return self._combine(exponent, operator.pow, None)
+
+        # the unit of the result depends on the exponent
+        exponents = np.unique(np.concatenate([exponent.lower, exponent.upper]))
+        if len(exponents) > 1:
+            raise ValueError("Exponents of quantities have to be the same")
+        units = self.units ** exponents[0].item() if len(exponents) else self.units
+        return self._combine(exponent, operator.pow, units)
+
+    def intersect(self, other: "IntervalBatch") -> "list[LiteralValue]":
+        other = other.to(self.units)
+        lower = np.maximum(self.lower, other.lower)
+        upper = np.minimum(self.upper, other.upper)
+        point = np.isclose(lower, upper)
+        empty = (lower > upper) & ~point
+        return [
+            Discrete.EMPTY if e else lit
+            for lit, e in zip(
+                IntervalBatch(lower, upper, point, self.units).to_literals(),
+                empty.tolist(),
+            )
+        ]
+
+    def is_subset_of(self, other: "IntervalBatch") -> np.ndarray:
+        """
+        Elementwise LiteralValue.is_subset_of
+        """
+        other = other.to(self.units)
+        lower = np.maximum(self.lower, other.lower)
+        upper = np.minimum(self.upper, other.upper)
+
+        close = np.isclose
+        equal = close(self.lower, other.lower) & close(self.upper, other.upper)
+        scalar_in_interval = (
+            close(other.lower, self.lower) | (other.lower <= self.lower)
+        ) & (close(other.upper, self.upper) | (other.upper >= self.upper))
+        interval_in_interval = (
+            ~close(lower, upper)
+            & ~(lower > upper)
+            & close(self.lower, lower)
+            & close(self.upper, upper)
+        )
+
+        return np.where(
+            self.scalar,
+            np.where(other.scalar, equal, scalar_in_interval),
+            ~other.scalar & (equal | interval_in_interval),
+        )
+
+
+_BATCH_OPS: dict[Callable, Callable[[IntervalBatch, IntervalBatch], IntervalBatch]] = {
+    operator.add: IntervalBatch.__add__,
+    operator.sub: IntervalBatch.__sub__,
+    operator.mul: IntervalBatch.__mul__,
+    operator.truediv: IntervalBatch.__truediv__,
+    operator.pow: IntervalBatch.__pow__,
+}
+
+
+def batch_arithmetic_op(
+    lhs: "Sequence[Optional[LiteralValue]]",
+    rhs: "Sequence[Optional[LiteralValue]]",
+    op: Callable,
+) -> "list[Optional[LiteralValue]]":
+    """
+    Elementwise LiteralValue.arithmetic_op in one vectorized pass.
+
+    :param op: one of operator.add, sub, mul, truediv, pow
+    :return: None for the elements that have to be computed one by one
+    (sets, non-numeric values, mixed dimensions, division by zero, ...)
+    """
+    if len(lhs) != len(rhs):
+        raise ValueError("Operands have to be of the same length")
+
+    out: list[Optional[LiteralValue]] = [None] * len(lhs)
+    batch_op = _BATCH_OPS.get(op)
+    indices = [
+        i
+        for i, (a, b) in enumerate(zip(lhs, rhs))
+        if isinstance(a, (Scalar, Interval)) and isinstance(b, (Scalar, Interval))
+    ]
+    if batch_op is None or not indices:
+        return out
+
+    try:
+        a = IntervalBatch.from_literals([lhs[i] for i in indices])  # type: ignore
+        b = IntervalBatch.from_literals([rhs[i] for i in indices])  # type: ignore
+        result = batch_op(a, b)
+    except (TypeError, ValueError):
+        return out
+
+    valid = ~(np.isnan(result.lower) | np.isnan(result.upper))
+    if op is operator.truediv:
+        valid &= (b.lower != 0) & (b.upper != 0)
+
+    for i, lit, ok in zip(indices, result.to_literals(), valid.tolist()):
+        if ok:
+            out[i] = lit
+    return out
@@ -23,7 +23,7 @@ from faebryk.core.link import (
     LinkDirectDerived,
 )
 from faebryk.core.node import CNode, Node, NodeException
-from faebryk.core.pathfinder import find_paths
+from faebryk.core.pathfinder import find_paths, find_paths_many
 from faebryk.core.trait import Trait
 from faebryk.library.can_specialize import can_specialize
 from faebryk.libs.util import ConfigFlag, cast_assert, groupby, once
@@ -139,7 +139,24 @@ class ModuleInterface(Node):
         return self.connect(*other, link=type(self).LinkDirectShallow())
 
     def get_connected(self, include_self: bool = False) -> dict[Self, Path]:
-        paths = find_paths(self, [])
+        return self._get_connected_from_paths(find_paths(self, []), include_self)
+
+    @staticmethod
+    def get_connected_many[T: ModuleInterface](
+        mifs: Iterable[T], include_self: bool = False
+    ) -> dict[T, dict[T, Path]]:
+        """
+        Like get_connected, but for many interfaces in one pathfinder call.
+        """
+        paths_per_src = find_paths_many(list(dict.fromkeys(mifs)))
+        return {
+            mif: mif._get_connected_from_paths(paths, include_self)
+            for mif, paths in paths_per_src.items()
+        }
+
+    def _get_connected_from_paths(
+        self, paths: Sequence[Path], include_self: bool
+    ) -> dict[Self, Path]:
         # TODO theoretically we could get multiple paths for the same MIF
         # practically this won't happen in the current implementation
         paths_per_mif = groupby(paths, lambda p: cast_assert(type(self), p[-1].node))
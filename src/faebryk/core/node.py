@@ -3,6 +3,7 @@
 import logging
 from abc import abstractmethod
 from dataclasses import InitVar as dataclass_InitVar
+from dataclasses import dataclass
 from itertools import chain
 from typing import (
     TYPE_CHECKING,
@@ -175,6 +176,21 @@ class InitVar(dataclass_InitVar):
     """
 
 
+@dataclass(frozen=True)
+class _FieldRecipe:
+    """
+    Construction plan of the fields of a Node class, see Node._get_field_recipe.
+    """
+
+    clsfields: dict[str, Any]
+    # fields built by calling a factory, in definition order
+    factories: list[tuple[str, Callable[[], Any]]]
+    # fields built from the node instance, after the factory fields
+    constructed: list[tuple[str, constructed_field]]
+    # __preinit__ & __postinit__ of the bases in call order
+    init_funcs: list[Callable[[Any], None]]
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -365,8 +381,69 @@ class Node(CNode):
 
         return dict(fabfields), dict(nonfabfields)
 
+    @classmethod
+    def _get_field_recipe(cls) -> _FieldRecipe:
+        # only depends on the class, so build it once per class
+        # looked up in the class dict to not pick up the recipe of a base
+        if (recipe := cls.__dict__.get("_field_recipe")) is not None:
+            return recipe
+
+        # check if accidentally added a node instance instead of field
+        node_instances = [
+            (name, f)
+            for name, f in vars(cls).items()
+            if isinstance(f, Node) and not name.startswith("_")
+        ]
+        if node_instances:
+            raise FieldError(f"Node instances not allowed: {node_instances}")
+
+        clsfields, _ = cls.__faebryk_fields__()
+
+        def unsupported(*args: object) -> Callable[[], Any]:
+            def _():
+                raise NotImplementedError(*args)
+
+            return _
+
+        def factory(obj) -> Callable[[], Any]:
+            if isinstance(obj, str):
+                return unsupported()
+
+            if (origin := get_origin(obj)) is not None:
+                if isinstance(origin, type):
+                    return origin
+                return unsupported(origin)
+
+            if isinstance(obj, _d_field):
+                return obj.default_factory
+
+            if isinstance(obj, type):
+                return obj
+
+            return unsupported()
+
+        factories, constructed = partition(
+            lambda x: isinstance(x[1], constructed_field), clsfields.items()
+        )
+
+        init_funcs = []
+        if cls._init:
+            for f_name in ("__preinit__", "__postinit__"):
+                for base in reversed(cls.mro()):
+                    if hasattr(base, f_name):
+                        init_funcs.append(getattr(base, f_name))
+
+        recipe = _FieldRecipe(
+            clsfields=clsfields,
+            factories=[(name, factory(obj)) for name, obj in factories],
+            constructed=list(constructed),
+            init_funcs=init_funcs,
+        )
+        setattr(cls, "_field_recipe", recipe)
+        return recipe
+
     def _setup_fields(self, cls):
-        clsfields, _ = self.__faebryk_fields__()
+        recipe = cls._get_field_recipe()
         LL_Types = (Node, GraphInterface)
 
         # for name, obj in clsfields_unf.items():
@@ -411,29 +488,12 @@ class Node(CNode):
             return inst
 
         def _setup_field(name, obj):
-            if isinstance(obj, str):
-                raise NotImplementedError()
-
-            if (origin := get_origin(obj)) is not None:
-                if isinstance(origin, type):
-                    setattr(self, name, append(name, origin()))
-                    return
-                raise NotImplementedError(origin)
-
-            if isinstance(obj, _d_field):
-                setattr(self, name, append(name, obj.default_factory()))
-                return
-
-            if isinstance(obj, type):
-                setattr(self, name, append(name, obj()))
-                return
-
             if isinstance(obj, constructed_field):
                 if (constructed := obj.__construct__(self)) is not None:
                     append(name, constructed)
                 return
 
-            raise NotImplementedError()
+            setattr(self, name, append(name, obj()))
 
         def setup_field(name, obj):
             try:
@@ -449,23 +509,20 @@ class Node(CNode):
                     f'An exception occurred while constructing field "{name}"',
                 ) from e
 
-        nonrt, rt = partition(
-            lambda x: isinstance(x[1], constructed_field), clsfields.items()
-        )
-        for name, obj in nonrt:
-            setup_field(name, obj)
+        for name, factory in recipe.factories:
+            setup_field(name, factory)
 
         for name, obj in list(objects.items()):
             handle_add(name, obj)
 
         # rt fields depend on full self
-        for name, obj in rt:
+        for name, obj in recipe.constructed:
             setup_field(name, obj)
 
             for name, obj in list(objects.items()):
                 handle_add(name, obj)
 
-        return added_objects, clsfields
+        return added_objects, recipe.clsfields
 
     def __new__(cls, *args, **kwargs):
         out = super().__new__(cls)
@@ -475,32 +532,20 @@ class Node(CNode):
         cls = type(self)
         # print(f"Called Node init {cls.__qualname__:<20} {'-' * 80}")
 
-        # check if accidentally added a node instance instead of field
-        node_instances = [
-            (name, f)
-            for name, f in vars(cls).items()
-            if isinstance(f, Node) and not name.startswith("_")
-        ]
-        if node_instances:
-            raise FieldError(f"Node instances not allowed: {node_instances}")
-
         # Construct Fields
         _, _ = self._setup_fields(cls)
 
         # Call 2-stage constructors
-
-        if self._init:
-            for f_name in ("__preinit__", "__postinit__"):
-                for base in reversed(type(self).mro()):
-                    if hasattr(base, f_name):
-                        f = getattr(base, f_name)
-                        f(self)
+        for f in cls._get_field_recipe().init_funcs:
+            f(self)
 
     def __init__(self):
         super().__init__()
         CNode.transfer_ownership(self)
         assert not hasattr(self, "_is_setup")
         self._is_setup = True
+        # trait -> impls of the direct trait children, in the order they were added
+        self._trait_index: dict[type["Trait"], list["TraitImpl"]] = {}
 
     def __preinit__(self, *args, **kwargs) -> None: ...
 
@@ -538,6 +583,8 @@ class Node(CNode):
                     raise Node._Skipped()
 
         node.parent.connect(self.children, LinkNamedParent(name))
+        if TraitImpl.is_traitimpl(node):
+            self._index_trait(node)
         node._handle_added_to_parent()
 
     def _remove_child(self, node: "Node"):
@@ -588,22 +635,39 @@ class Node(CNode):
                 )
             trait = trait.__trait__
 
-        out = self.get_children(
-            direct_only=True,
-            types=Trait,
-            f_filter=lambda impl: trait.is_traitimpl(impl)
-            and (cast(TraitImpl, impl).is_implemented() or not only_implemented),
-        )
+        # dynamic traits can be added next to each other, first implemented one wins
+        for impl in self._trait_index.get(trait, ()):
+            if not only_implemented or impl.is_implemented():
+                return cast_assert(trait, impl)
+        return None
 
-        assert len(out) <= 1
-        return cast_assert(trait, next(iter(out))) if out else None
+    @staticmethod
+    def _indexed_traits(impl: "TraitImpl") -> list[type["Trait"]]:
+        from faebryk.core.trait import Trait
+
+        # all traits the impl implements
+        return [
+            base
+            for base in impl.__trait__.__mro__
+            if issubclass(base, Trait) and base is not Trait
+        ]
+
+    def _index_trait(self, impl: "TraitImpl"):
+        for trait in self._indexed_traits(impl):
+            self._trait_index.setdefault(trait, []).append(impl)
 
     def del_trait(self, trait: type["Trait"]):
-        impl = self._find_trait_impl(trait, only_implemented=False)
+        impl = self._find_trait_impl(
+            trait, only_implemented=True
+        ) or self._find_trait_impl(trait, only_implemented=False)
         if not impl:
             return
         self._remove_child(impl)
 
+        for t in self._indexed_traits(impl):
+            impls = self._trait_index[t]
+            impls[:] = [i for i in impls if i is not impl]
+
     def try_get_trait[V: "Trait | TraitImpl"](self, trait: Type[V]) -> V | None:
         return self._find_trait_impl(trait, only_implemented=True)
 
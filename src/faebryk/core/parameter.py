@@ -12,13 +12,13 @@ from typing import (
 from typing_extensions import Self
 
 from faebryk.core.graphinterface import GraphInterface
+from faebryk.core.literal import LiteralValue, batch_arithmetic_op
 from faebryk.core.node import Node
 from faebryk.core.trait import Trait
 from faebryk.libs.units import Quantity, UnitsContainer
 from faebryk.libs.util import (
     Tree,
     TwistArgs,
-    cast_assert,
     is_type_pair,
     try_avoid_endless_recursion,
 )
@@ -77,6 +77,21 @@ class Parameter(Node):
     class is_dynamic(TraitT):
         def execute(self) -> None: ...
 
+        def dependencies(self) -> "Sequence[Parameter]":
+            """
+            Parameters the dynamic parameter is derived from.
+            Executed again when one of them got narrowed.
+            """
+            return []
+
+    def __init__(self):
+        super().__init__()
+        # Narrowing forest, mirrors the narrowed_by -> narrows links of the graph
+        # direct narrower
+        self._narrower: Parameter | None = None
+        # union-find parent, compressed towards the most narrow parameter
+        self._narrow_parent: Parameter | None = None
+
     def try_compress(self) -> "Parameter":
         return self
 
@@ -104,6 +119,9 @@ class Parameter(Node):
         def _is_pair[T, U](type1: type[T], type2: type[U]) -> Optional[tuple[T, U]]:
             return is_type_pair(self, other, type1, type2)
 
+        def _is_empty(p: Parameter) -> bool:
+            return isinstance(p, Set) and not p.params
+
         if self is other:
             return self
 
@@ -132,7 +150,7 @@ class Parameter(Node):
             out = self.intersect(*pair)
             if isinstance(out, Operation):
                 raise self.MergeException("not resolvable")
-            if out == Set([]) and not pair[0] == pair[1] == Set([]):
+            if _is_empty(out) and not (pair[0] == pair[1] and _is_empty(pair[1])):
                 raise self.MergeException(
                     f"conflicting sets/ranges: {self!r} {other!r}"
                 )
@@ -144,10 +162,27 @@ class Parameter(Node):
         if self is other:
             return
 
-        if self.narrowed_by.is_connected_to(other.narrows):
+        if self._narrower is other:
             return
+        assert self._narrower is None, "Narrowing tree diverged"
+        assert other._narrow_root() is not self, "Narrowing tree cycle"
+
+        self._narrower = other
+        self._narrow_parent = other
         self.narrowed_by.connect(other.narrows)
 
+    def _narrow_root(self) -> "Parameter":
+        root = self
+        while root._narrow_parent is not None:
+            root = root._narrow_parent
+
+        # path compression
+        p = self
+        while p._narrow_parent is not None and p._narrow_parent is not root:
+            p._narrow_parent, p = root, p._narrow_parent
+
+        return root
+
     @_resolved
     def is_mergeable_with(self: "Parameter", other: "Parameter") -> bool:
         try:
@@ -180,6 +215,10 @@ class Parameter(Node):
         if is_either_instance(Operation):
             return False
 
+        # Resolved values, no need for intermediate nodes
+        if lits := LiteralValue.from_parameters(lhs, rhs):
+            return lits[0].is_subset_of(lits[1])
+
         # Sets
         return lhs & rhs == lhs
 
@@ -222,6 +261,10 @@ class Parameter(Node):
 
             return None
 
+        if lits := LiteralValue.from_parameters(op1, op2):
+            if (out := lits[0].arithmetic_op(lits[1], op)) is not None:
+                return out.to_parameter()
+
         if pair := _is_pair(Constant, Constant):
             return Constant(op(pair[0].value, pair[1].value))
 
@@ -271,6 +314,42 @@ class Parameter(Node):
 
         raise NotImplementedError
 
+    @staticmethod
+    def arithmetic_op_batch(
+        ops1: "Sequence[Parameter.LIT_OR_PARAM]",
+        ops2: "Sequence[Parameter.LIT_OR_PARAM]",
+        op: Callable,
+    ) -> list["Parameter"]:
+        """
+        Elementwise arithmetic_op of two sequences of operands.
+
+        Resolved Constants and Ranges are computed together in one vectorized pass
+        if op is one of operator.add, sub, mul, truediv or pow.
+        """
+        if len(ops1) != len(ops2):
+            raise ValueError("Operands have to be of the same length")
+
+        params = [
+            (
+                Parameter.from_literal(p1).get_most_narrow(),
+                Parameter.from_literal(p2).get_most_narrow(),
+            )
+            for p1, p2 in zip(ops1, ops2)
+        ]
+        lits = [LiteralValue.from_parameters(*pair) for pair in params]
+        results = batch_arithmetic_op(
+            [lit[0] if lit else None for lit in lits],
+            [lit[1] if lit else None for lit in lits],
+            op,
+        )
+
+        return [
+            Parameter.arithmetic_op(*pair, op)
+            if result is None
+            else result.to_parameter()
+            for pair, result in zip(params, results)
+        ]
+
     @staticmethod
     def intersect(op1: "Parameter", op2: "Parameter") -> "Parameter":
         from faebryk.library.Constant import Constant
@@ -281,6 +360,15 @@ class Parameter(Node):
         if op1 == op2:
             return op1
 
+        if lits := LiteralValue.from_parameters(op1, op2):
+            out = lits[0].intersect(lits[1])
+            # keep the operand nodes if they are the result
+            if out is lits[0]:
+                return op1
+            if out is lits[1]:
+                return op2
+            return out.to_parameter()
+
         def _is_pair[T, U](
             type1: type[T], type2: type[U]
         ) -> Optional[tuple[T, U, Callable]]:
@@ -384,7 +472,7 @@ class Parameter(Node):
         return self.intersect(other, self)
 
     def get_most_narrow(self) -> "Parameter":
-        out = self.get_narrowing_chain()[-1]
+        out = self._narrow_root()
 
         com = out.try_compress()
         if com is not out:
@@ -425,11 +513,8 @@ class Parameter(Node):
 
     def get_narrowing_chain(self) -> list["Parameter"]:
         out: list[Parameter] = [self]
-        narrowers = self.narrowed_by.get_connected_nodes([Parameter])
-        if narrowers:
-            assert len(narrowers) == 1, "Narrowing tree diverged"
-            out += cast_assert(Parameter, next(iter(narrowers))).get_narrowing_chain()
-            assert id(self) not in map(id, out[1:]), "Narrowing tree cycle"
+        while (narrower := out[-1]._narrower) is not None:
+            out.append(narrower)
         return out
 
     def get_narrowed_siblings(self) -> set["Parameter"]:
@@ -2,15 +2,30 @@
 # SPDX-License-Identifier: MIT
 
 import io
+import json
 import logging
-from typing import Sequence
+from contextlib import contextmanager
+from typing import Any, Iterator, Sequence
 
 from more_itertools import partition
 from rich.console import Console
 from rich.table import Table
 
-from faebryk.core.cpp import Counter, Path, set_indiv_measure, set_max_paths
+from faebryk.core.cpp import (
+    Counter,
+    Path,
+    PathFinderProfile,
+    get_pathfinder_profile,
+    reset_pathfinder_profile,
+    set_connectivity_index,
+    set_indiv_measure,
+    set_max_paths,
+    set_path_cache,
+    set_pathfinder_profile,
+    set_pathfinder_threads,
+)
 from faebryk.core.cpp import find_paths as find_paths_cpp
+from faebryk.core.cpp import find_paths_many as find_paths_many_cpp
 from faebryk.core.node import Node
 from faebryk.libs.util import ConfigFlag, ConfigFlagInt
 
@@ -32,6 +47,30 @@ MAX_PATHS_NO_WEAK = ConfigFlagInt(
 )
 set_max_paths(int(MAX_PATHS), int(MAX_PATHS_NO_NEW_WEAK), int(MAX_PATHS_NO_WEAK))
 
+# Also in C++
+CONNECTIVITY_INDEX = ConfigFlag(
+    "CONNECTIVITY_INDEX",
+    default=True,
+    descr="Answer unconditional connectivity queries from the union-find index",
+)
+set_connectivity_index(bool(CONNECTIVITY_INDEX))
+
+# Also in C++
+PATH_CACHE = ConfigFlag(
+    "PATH_CACHE",
+    default=True,
+    descr="Cache find_paths results per graph until the graph changes",
+)
+set_path_cache(bool(PATH_CACHE))
+
+# Also in C++
+PATHFINDER_THREADS = ConfigFlagInt(
+    "PATHFINDER_THREADS",
+    default=1,
+    descr="Worker threads for batched path searches (releases the GIL)",
+)
+set_pathfinder_threads(int(PATHFINDER_THREADS))
+
 
 def find_paths(src: Node, dst: Sequence[Node]) -> Sequence[Path]:
     paths, counters = find_paths_cpp(src, dst)
@@ -41,6 +80,106 @@ def find_paths(src: Node, dst: Sequence[Node]) -> Sequence[Path]:
     return paths
 
 
+def find_paths_many[T: Node](srcs: Sequence[T]) -> dict[T, Sequence[Path]]:
+    """
+    Find all paths from each of the given sources in one call.
+    """
+    results = find_paths_many_cpp(list(srcs))
+
+    out = {}
+    for src, (paths, counters) in zip(srcs, results):
+        if logger.isEnabledFor(logging.DEBUG) and counters:
+            logger.debug(Counters(counters))
+        out[src] = paths
+    return out
+
+
+class PathfinderProfileReport:
+    """
+    Pathfinder statistics collected by `pathfinder_profile`.
+    Reads the live statistics while the profile is still running.
+    """
+
+    def __init__(self):
+        self._profile: PathFinderProfile | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        p = self._profile or get_pathfinder_profile()
+        bfs = p.bfs
+        return {
+            "queries": p.queries,
+            "cache_hits": p.cache_hits,
+            "index_hits": p.index_hits,
+            "searches": bfs.searches,
+            "time_s": p.time_s,
+            "bfs": {
+                "paths": bfs.paths,
+                "peak_queue": bfs.peak_queue,
+                "peak_arena_bytes": bfs.peak_arena_bytes,
+                "time_s": {
+                    "setup": bfs.time_setup_s,
+                    "search": bfs.time_search_s,
+                    "edges": bfs.time_edges_s,
+                    "check_visited": bfs.time_check_visited_s,
+                    "new_path": bfs.time_new_path_s,
+                    "set_insert": bfs.time_set_insert_s,
+                    "deque_insert": bfs.time_deque_insert_s,
+                    "non_filter": bfs.time_non_filter_s,
+                    "filter": bfs.time_filter_s,
+                },
+            },
+            "filters": {
+                c.name: {
+                    "in": c.in_cnt,
+                    "weak_in": c.weak_in_cnt,
+                    "out": c.out_cnt,
+                    "out_weaker": c.out_weaker,
+                    "out_stronger": c.out_stronger,
+                    "time_s": c.time_spent_s,
+                }
+                for c in p.counters
+            },
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+_profile_active = False
+
+
+@contextmanager
+def pathfinder_profile() -> Iterator[PathfinderProfileReport]:
+    """
+    Aggregate pathfinder statistics over all find_paths calls in the block.
+    Outside of a profile no statistics are collected.
+
+    ```
+    with pathfinder_profile() as prof:
+        mif.get_connected()
+    prof.to_json()
+    ```
+    """
+    global _profile_active
+    if _profile_active:
+        raise RuntimeError("pathfinder_profile is not reentrant")
+
+    profile = PathfinderProfileReport()
+    _profile_active = True
+    reset_pathfinder_profile()
+    set_pathfinder_profile(True)
+    try:
+        yield profile
+    finally:
+        set_pathfinder_profile(False)
+        profile._profile = get_pathfinder_profile()
+        reset_pathfinder_profile()
+        _profile_active = False
+
+
 class Counters:
     def __init__(self, counters: list[Counter]):
         self.counters: dict[str, Counter] = {c.name: c for c in counters}
@@ -7,6 +7,7 @@ from abc import abstractmethod
 import faebryk.library._F as F
 from faebryk.core.graph import Graph, GraphFunctions
 from faebryk.core.module import Module
+from faebryk.core.moduleinterface import ModuleInterface
 from faebryk.exporters.netlist.netlist import T2Netlist
 from faebryk.libs.util import KeyErrorAmbiguous
 
@@ -104,6 +105,35 @@ def add_or_get_net(interface: F.Electrical):
     return next(iter(nets))
 
 
+def add_or_get_nets(*interfaces: F.Electrical):
+    """
+    Like add_or_get_net, but resolves the connections of all interfaces in one go.
+    """
+    buses = ModuleInterface.get_connected_many(interfaces, include_self=True)
+    nets_out = set()
+    # nets created here are not part of the resolved connections
+    new_nets: dict[F.Electrical, F.Net] = {}
+
+    for interface in interfaces:
+        connected = buses[interface]
+        nets = {
+            p[0]
+            for mif in connected
+            if (p := mif.get_parent()) is not None and isinstance(p[0], F.Net)
+        } | {new_nets[mif] for mif in connected if mif in new_nets}
+        if not nets:
+            net = F.Net()
+            net.part_of.connect(interface)
+            new_nets[interface] = net
+            nets_out.add(net)
+            continue
+        if len(nets) > 1:
+            raise KeyErrorAmbiguous(list(nets), "Multiple nets interconnected")
+        nets_out.add(next(iter(nets)))
+
+    return nets_out
+
+
 def attach_nets_and_kicad_info(G: Graph):
     # group comps & fps
     node_fps = {
@@ -124,6 +154,10 @@ def attach_nets_and_kicad_info(G: Graph):
             continue
         fp.add(can_represent_kicad_footprint_via_attached_component(n, G))
 
-    for fp in node_fps.values():
-        for mif in fp.get_children(direct_only=True, types=F.Pad):
-            add_or_get_net(mif.net)
+    add_or_get_nets(
+        *(
+            mif.net
+            for fp in node_fps.values()
+            for mif in fp.get_children(direct_only=True, types=F.Pad)
+        )
+    )
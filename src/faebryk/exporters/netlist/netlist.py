@@ -39,6 +39,7 @@ def make_t2_netlist_from_graph(G: Graph) -> T2Netlist:
     from faebryk.exporters.netlist.graph import can_represent_kicad_footprint
 
     nets = GraphFunctions(G).nodes_of_type(F.Net)
+    fps_per_net = F.Net.get_fps_many(nets)
 
     t2_nets = [
         T2Netlist.Net(
@@ -49,7 +50,7 @@ def make_t2_netlist_from_graph(G: Graph) -> T2Netlist:
                         component=t.get_kicad_obj(),
                         pin=t.get_pin_name(mif),
                     )
-                    for mif, fp in net.get_fps().items()
+                    for mif, fp in fps_per_net[net].items()
                     if (t := fp.get_trait(can_represent_kicad_footprint)) is not None
                 ],
                 key=lambda v: (v.component.name, v.pin),
@@ -67,22 +67,40 @@ def _get_footprint(identifier: str, fp_lib_path: Path) -> C_footprint:
 class PCB:
     @staticmethod
     def apply_netlist(pcb_path: Path, netlist_path: Path):
-        from faebryk.exporters.pcb.kicad.transformer import gen_uuid
-
-        fp_lib_path = pcb_path.parent / "fp-lib-table"
-
         pcb = C_kicad_pcb_file.loads(pcb_path)
         netlist = C_kicad_netlist_file.loads(netlist_path)
 
+        PCB.apply_netlist_to(pcb, netlist, pcb_path.parent / "fp-lib-table")
+
+        logger.debug(f"Save PCB: {pcb_path}")
+        pcb.dump(pcb_path)
+
+    @staticmethod
+    def apply_netlist_to(
+        pcb: C_kicad_pcb_file, netlist: C_kicad_netlist_file, fp_lib_path: Path
+    ):
+        """
+        Update pcb in place to match the netlist.
+        New footprints are looked up in the fp-lib-table at fp_lib_path.
+        """
+        from faebryk.exporters.pcb.kicad.transformer import gen_uuid
+
         # footprint properties
         def fill_fp_property(
-            fp: C_footprint, property_name: str, layer: str, value: str
+            fp: C_footprint,
+            property_name: str,
+            layer: str,
+            value: str,
+            keep_uuid: bool = False,
         ) -> C_footprint.C_property:
             return C_footprint.C_property(
                 name=property_name,
                 value=value,
                 layer=C_text_layer(layer=layer),
-                uuid=gen_uuid(),
+                # keep the uuid, so reapplying the same netlist is a no-op
+                uuid=fp.propertys[property_name].uuid
+                if keep_uuid and property_name in fp.propertys
+                else gen_uuid(),
                 effects=C_effects(
                     font=C_effects.C_font(size=C_wh(w=1.27, h=1.27), thickness=0.15),
                     hide=True,
@@ -236,6 +254,7 @@ class PCB:
                 property_name="faebryk module name",
                 layer="User.9",
                 value=get_property_value(nl_comp, "faebryk_name", "No faebryk_name"),
+                keep_uuid=True,
             )
 
             pcb_comp.propertys["LCSC"] = fill_fp_property(
@@ -243,6 +262,7 @@ class PCB:
                 property_name="LCSC",
                 layer="User.9",
                 value=get_property_value(nl_comp, "LCSC", "No LCSC number"),
+                keep_uuid=True,
             )
 
             # update pad nets
@@ -333,7 +353,3 @@ class PCB:
             )
 
             pcb.kicad_pcb.footprints.append(pcb_comp)
-
-        # ---
-        logger.debug(f"Save PCB: {pcb_path}")
-        pcb.dumps(pcb_path)
@@ -12,6 +12,7 @@ from itertools import pairwise
 from typing import Any, Callable, Iterable, List, Optional, Sequence, TypeVar
 
 import numpy as np
+from sexpdata import Symbol
 from shapely import Polygon
 from typing_extensions import deprecated
 
@@ -45,7 +46,7 @@ from faebryk.libs.kicad.fileformats import (
     gen_uuid as _gen_uuid,
 )
 from faebryk.libs.kicad.fileformats_common import C_pts
-from faebryk.libs.sexp.dataclass_sexp import dataclass_dfs
+from faebryk.libs.sexp.dataclass_sexp import get_lazy_sexp
 from faebryk.libs.util import KeyErrorNotFound, cast_assert, find, get_key
 
 logger = logging.getLogger(__name__)
@@ -268,18 +269,20 @@ class PCB_Transformer:
     def cleanup(self):
         # delete faebryk objects in pcb
 
-        # find all objects with path_len 2 (direct children of a list in pcb)
-        candidates = [o for o in dataclass_dfs(self.pcb) if len(o[1]) == 2]
-        for obj, path, _ in candidates:
-            if not self.is_marked(obj):
+        # direct children of a list in pcb
+        for f in fields(self.pcb):
+            # don't decode lazy fields without faebryk objects
+            raw = get_lazy_sexp(self.pcb, f.name)
+            if raw is not None and not any(self._is_marked_sexp(o) for o in raw):
                 continue
 
             # delete object by removing it from the container they are in
-            holder = path[-1]
+            holder = getattr(self.pcb, f.name)
             if isinstance(holder, list):
-                holder.remove(obj)
+                holder[:] = [obj for obj in holder if not self.is_marked(obj)]
             elif isinstance(holder, dict):
-                del holder[get_key(obj, holder)]
+                for obj in [obj for obj in holder.values() if self.is_marked(obj)]:
+                    del holder[get_key(obj, holder)]
 
     @staticmethod
     def flipped[T](input_list: list[tuple[T, int]]) -> list[tuple[T, int]]:
@@ -295,6 +298,19 @@ class PCB_Transformer:
             return False
         return is_marked(obj.uuid, "FBRK")
 
+    @staticmethod
+    def _is_marked_sexp(sexp) -> bool:
+        """
+        is_marked for the raw sexp of an object, e.g. (segment ... (uuid "..."))
+        """
+        return any(
+            isinstance(v, list)
+            and len(v) == 2
+            and v[0] == Symbol("uuid")
+            and is_marked(str(v[1]), "FBRK")
+            for v in sexp[1:]
+        )
+
     # Getter ---------------------------------------------------------------------------
     @staticmethod
     def get_fp(cmp: Node) -> Footprint:
@@ -4,8 +4,7 @@
 from enum import Enum
 from typing import Self, SupportsAbs
 
-import numpy as np
-
+from faebryk.core.literal import values_equal
 from faebryk.core.parameter import Parameter, _resolved
 from faebryk.libs.units import Quantity, UnitsContainer, to_si_str
 from faebryk.libs.util import once
@@ -39,12 +38,7 @@ class Constant(Parameter):
         if not isinstance(other, Constant):
             return False
 
-        try:
-            return np.allclose(self.value, other.value)
-        except (TypeError, np.exceptions.DTypePromotionError):
-            ...
-
-        return self.value == other.value
+        return values_equal(self.value, other.value)
 
     @once
     def _hash_val(self):
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+from typing import Iterable
 
 import faebryk.library._F as F
 from faebryk.core.module import Module
@@ -42,9 +43,31 @@ class Net(Module):
         return _()
 
     def get_fps(self):
+        return self._get_fps(self.get_connected_interfaces())
+
+    @classmethod
+    def get_fps_many(
+        cls, nets: Iterable["Net"]
+    ) -> dict["Net", dict[F.Pad, F.Footprint]]:
+        """
+        Like get_fps, but resolves the connections of all nets in one go.
+        """
+        nets = list(nets)
+        connected = F.Electrical.get_connected_many([net.part_of for net in nets])
+        return {
+            net: cls._get_fps(
+                mif
+                for mif in connected[net.part_of]
+                if isinstance(mif, type(net.part_of))
+            )
+            for net in nets
+        }
+
+    @staticmethod
+    def _get_fps(mifs: Iterable[F.Electrical]) -> dict[F.Pad, F.Footprint]:
         return {
             pad: fp
-            for mif in self.get_connected_interfaces()
+            for mif in mifs
             if (fp := mif.get_parent_of_type(F.Footprint)) is not None
             and (pad := mif.get_parent_of_type(F.Pad)) is not None
         }
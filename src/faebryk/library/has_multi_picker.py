@@ -4,7 +4,8 @@
 
 import logging
 from abc import abstractmethod
-from typing import Any, Callable, Mapping
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Mapping, Self
 
 import faebryk.library._F as F
 from faebryk.core.module import Module
@@ -34,6 +35,14 @@ class has_multi_picker(F.has_picker.impl()):
         @abstractmethod
         def pick(self, module: Module): ...
 
+        @classmethod
+        def prefetch(cls, pickers: list[tuple[Module, Self]]) -> ContextManager:
+            """
+            Prepare picking many modules at once, e.g. by querying the candidates
+            of all of them in bulk. Only valid while the context is open.
+            """
+            return nullcontext()
+
     def __init__(self, prio: int, picker: Picker):
         super().__init__()
         self.pickers: list[tuple[int, has_multi_picker.Picker]] = [(prio, picker)]
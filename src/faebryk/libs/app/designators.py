@@ -117,7 +117,7 @@ def load_designators_from_netlist(
 def replace_faebryk_names_with_designators_in_kicad_pcb(graph: Graph, pcbfile: Path):
     logger.info("Load PCB")
     pcb = C_kicad_pcb_file.loads(pcbfile)
-    pcb.dumps(pcbfile.with_suffix(".bak"))
+    pcb.dump(pcbfile.with_suffix(".bak"))
 
     pattern = re.compile(r"^(.*)\[[^\]]*\]$")
     translation = {
@@ -139,4 +139,4 @@ def replace_faebryk_names_with_designators_in_kicad_pcb(graph: Graph, pcbfile: P
         logger.info(f"Translating {name} to {translation[name]}")
         ref_prop.value = translation[name]
 
-    pcb.dumps(pcbfile)
+    pcb.dump(pcbfile)
@@ -70,15 +70,17 @@ def simple_erc(G: Graph):
     for ep in electricpower:
         if ep.lv.is_connected_to(ep.hv):
             raise ERCFaultShort([ep], "shorted power")
-        if ep.has_trait(F.Power.is_power_source):
-            other_sources = [
-                other
-                for other in ep.get_connected()
-                if isinstance(other, F.ElectricPower)
-                and other.has_trait(F.Power.is_power_source)
-            ]
-            if other_sources:
-                raise ERCPowerSourcesShortedError([ep] + other_sources)
+
+    sources = [ep for ep in electricpower if ep.has_trait(F.Power.is_power_source)]
+    for ep, connected in ModuleInterface.get_connected_many(sources).items():
+        other_sources = [
+            other
+            for other in connected
+            if isinstance(other, F.ElectricPower)
+            and other.has_trait(F.Power.is_power_source)
+        ]
+        if other_sources:
+            raise ERCPowerSourcesShortedError([ep] + other_sources)
 
     unresolved_voltage = [
         ep
@@ -92,10 +94,11 @@ def simple_erc(G: Graph):
     # shorted nets
     nets = GraphFunctions(G).nodes_of_type(F.Net)
     logger.info(f"Checking {len(nets)} explicit nets")
+    connected_per_net = ModuleInterface.get_connected_many(net.part_of for net in nets)
     for net in nets:
         collisions = {
             p[0]
-            for mif in net.part_of.get_connected()
+            for mif in connected_per_net[net.part_of]
             if (p := mif.get_parent()) and isinstance(p[0], F.Net)
         }
 
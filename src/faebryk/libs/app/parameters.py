@@ -1,10 +1,12 @@
 # This file is part of the faebryk project
 # SPDX-License-Identifier: MIT
 
+import json
 import logging
-from typing import Iterable, cast
-
-from more_itertools import partition
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable
 
 import faebryk.library._F as F
 from faebryk.core.cpp import Graph
@@ -12,8 +14,7 @@ from faebryk.core.graph import GraphFunctions
 from faebryk.core.module import Module
 from faebryk.core.moduleinterface import ModuleInterface
 from faebryk.core.parameter import Parameter
-from faebryk.libs.test.times import Times
-from faebryk.libs.util import find, groupby
+from faebryk.libs.util import groupby
 
 logger = logging.getLogger(__name__)
 
@@ -43,73 +44,219 @@ def replace_tbd_with_any(module: Module, recursive: bool, loglvl: int | None = N
             replace_tbd_with_any(m, recursive=False, loglvl=loglvl)
 
 
-def resolve_dynamic_parameters(graph: Graph):
-    other_dynamic_params, connection_dynamic_params = partition(
-        lambda param_trait: isinstance(param_trait[1], F.is_dynamic_by_connections),
-        [
-            (param, trait)
-            for param, trait in GraphFunctions(graph).nodes_with_trait(
-                Parameter.is_dynamic
-            )
-        ],
-    )
-
-    # non-connection
-    for _, trait in other_dynamic_params:
-        trait.execute()
-
-    # connection
-    _resolve_dynamic_parameters_connection(
-        cast(
-            list[tuple[Parameter, F.is_dynamic_by_connections]],
-            connection_dynamic_params,
-        )
-    )
+@dataclass
+class BusPropagationReport:
+    representative: str
+    size: int
+    time_s: float
+
+
+@dataclass
+class ParameterPropagationReport:
+    """
+    Statistics of a DynamicParameterSolver.solve run.
+    """
 
+    iterations: int = 0
+    # dynamic traits that were (re-)executed or skipped as up to date
+    executed: int = 0
+    skipped: int = 0
+    # whether the edges of the graph had to be compared from scratch
+    full: bool = True
+    buses: list[BusPropagationReport] = field(default_factory=list)
+    time_s: float = 0
 
-def _resolve_dynamic_parameters_connection(
-    params: Iterable[tuple[Parameter, F.is_dynamic_by_connections]],
-):
-    times = Times()
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
 
-    busses: list[set[ModuleInterface]] = []
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
 
-    params_grouped_by_mif = groupby(params, lambda p: p[1].mif_parent())
 
-    # find for all busses a mif that represents it, and puts its dynamic params here
-    # we use the that connected mifs are the same type and thus have the same params
-    # TODO: limitation: specialization (need to subgroup by type) (see exception)
-    param_bus_representatives: set[tuple[Parameter, F.is_dynamic_by_connections]] = (
-        set()
-    )
+class DynamicParameterSolver:
+    """
+    Worklist solver for the dynamic parameters of a graph.
 
-    while params_grouped_by_mif:
-        bus_representative_mif, bus_representative_params = (
-            params_grouped_by_mif.popitem()
-        )
-        # expensive call
-        paths = bus_representative_mif.get_connected(include_self=True)
-        connections = set(paths.keys())
+    Connection based parameters depend on the interfaces of their bus, other
+    dynamic parameters on the parameters returned by their `dependencies`.
+    Merging parameters enqueues the traits depending on them, until a fixpoint is
+    reached.
 
-        busses.append(connections)
-        if len(set(map(type, connections))) > 1:
+    The solver remembers the buses it resolved and the edges of the graph it has
+    seen, so solving again after an edit of the design only touches new traits and
+    the buses that got new connections.
+    """
+
+    def __init__(self) -> None:
+        self._bus_of: dict[ModuleInterface, frozenset[ModuleInterface]] = {}
+        # trait -> most narrow dependencies at its last execution
+        self._executed: dict[Parameter.is_dynamic, list[Parameter]] = {}
+        self._edge_count = 0
+        self._last_edge: tuple | None = None
+
+    def _changed_interfaces(self, graph: Graph) -> set[ModuleInterface] | None:
+        """
+        Interfaces whose bus might have changed since the last solve.
+
+        :return: None if the edges can't be compared to the ones of the last solve
+        """
+        n = graph.edge_count
+        count, last_edge = self._edge_count, self._last_edge
+        # edges are only appended, unless removed or merged into another graph
+        appended = bool(self._bus_of) and count <= n
+        # only fetch the last edge of the last solve and the ones after it
+        tail = graph.edges_since(max((count if appended else n) - 1, 0))
+        self._edge_count = n
+        self._last_edge = tail[-1] if tail else None
+
+        if not self._bus_of:
+            return set()
+        if not appended:
+            return None
+        if last_edge is not None:
+            (from_, to, _), tail = tail[0], tail[1:]
+            if not (from_ is last_edge[0] and to is last_edge[1]):
+                return None
+
+        changed: set[ModuleInterface] = set()
+        for from_, to, _ in tail:
+            for gif in (from_, to):
+                node = gif.node
+                if not isinstance(node, ModuleInterface) or node in changed:
+                    continue
+                # connections of buses extend to their children
+                changed.update(
+                    node.get_children(
+                        direct_only=False, types=ModuleInterface, include_root=True
+                    )
+                )
+
+        # everything that was on the same bus before
+        for mif in list(changed):
+            changed.update(self._bus_of.get(mif, ()))
+
+        return changed
+
+    def _bus(self, mif: ModuleInterface) -> frozenset[ModuleInterface]:
+        # expensive call
+        bus = frozenset(mif.get_connected(include_self=True).keys())
+        if len(set(map(type, bus))) > 1:
             raise NotImplementedError(
                 "No support for specialized bus with dynamic params"
             )
+        for m in bus:
+            self._bus_of[m] = bus
+        return bus
 
-        for m in connections:
-            if m in params_grouped_by_mif:
-                del params_grouped_by_mif[m]
-        param_bus_representatives |= set(bus_representative_params)
+    def solve(self, graph: Graph) -> ParameterPropagationReport:
+        report = ParameterPropagationReport()
+        start = time.perf_counter()
 
-    times.add("get parameter connections")
+        traits = [
+            trait
+            for _, trait in GraphFunctions(graph).nodes_with_trait(Parameter.is_dynamic)
+        ]
+        changed = self._changed_interfaces(graph)
+        report.full = changed is None
 
-    # exec resolution
-    for _, trait in param_bus_representatives:
-        bus_representative_mif = trait.mif_parent()
-        param_bus = find(busses, lambda bus: bus_representative_mif in bus)
-        trait.exec_for_mifs(param_bus)
+        connection_traits = groupby(
+            (t for t in traits if isinstance(t, F.is_dynamic_by_connections)),
+            lambda t: t.mif_parent(),
+        )
+        other_traits = [
+            t for t in traits if not isinstance(t, F.is_dynamic_by_connections)
+        ]
+
+        # who to notify when a parameter got narrowed
+        # by id, parameters compare by value
+        dependents: dict[int, list[Parameter.is_dynamic]] = defaultdict(list)
+        for trait in other_traits:
+            for dep in trait.dependencies():
+                dependents[id(dep)].append(trait)
+
+        def is_dirty(trait: Parameter.is_dynamic) -> bool:
+            if trait not in self._executed:
+                return True
+            if isinstance(trait, F.is_dynamic_by_connections):
+                return changed is None or trait.mif_parent() in changed
+            narrowed = [d.get_most_narrow() for d in trait.dependencies()]
+            return len(narrowed) != len(self._executed[trait]) or any(
+                a is not b for a, b in zip(narrowed, self._executed[trait])
+            )
+
+        worklist = deque[Parameter.is_dynamic]()
+        for trait in traits:
+            if is_dirty(trait):
+                worklist.append(trait)
+            else:
+                report.skipped += 1
+
+        def notify(params: Iterable[Parameter]):
+            for param in params:
+                for dependent in dependents.get(id(param), []):
+                    if dependent not in worklist:
+                        worklist.append(dependent)
+
+        # interfaces whose bus got resolved in this solve
+        resolved: set[ModuleInterface] = set()
+
+        while worklist:
+            report.iterations += 1
+            trait = worklist.popleft()
+
+            if not isinstance(trait, F.is_dynamic_by_connections):
+                if not is_dirty(trait):
+                    continue
+                trait.execute()
+                self._executed[trait] = [
+                    d.get_most_narrow() for d in trait.dependencies()
+                ]
+                report.executed += 1
+                continue
+
+            mif = trait.mif_parent()
+            if mif in resolved:
+                self._executed[trait] = []
+                continue
 
-    times.add("merge parameters")
-    if logger.isEnabledFor(logging.DEBUG):
-        logger.debug(times)
+            # all interfaces of a bus have the same params, so the dynamic params of
+            # one representative are merged with all the others
+            bus_start = time.perf_counter()
+            bus = self._bus(mif)
+            for t in connection_traits.get(mif, []):
+                t.exec_for_mifs(set(bus))
+                self._executed[t] = []
+                report.executed += 1
+            resolved.update(bus)
+            report.buses.append(
+                BusPropagationReport(
+                    representative=mif.get_full_name(),
+                    size=len(bus),
+                    time_s=time.perf_counter() - bus_start,
+                )
+            )
+
+            notify(
+                param
+                for m in bus
+                for t in connection_traits.get(m, [])
+                for param in [t.get_obj(Parameter)]
+            )
+
+        report.time_s = time.perf_counter() - start
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Resolved dynamic parameters: {report}")
+        return report
+
+
+def resolve_dynamic_parameters(
+    graph: Graph, solver: DynamicParameterSolver | None = None
+) -> ParameterPropagationReport:
+    """
+    Resolve the dynamic parameters (e.g. merge the parameters of connected buses).
+
+    :param solver: keep one around to only resolve what changed on later calls
+    """
+    if solver is None:
+        solver = DynamicParameterSolver()
+    return solver.solve(graph)
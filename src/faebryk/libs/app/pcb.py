@@ -19,10 +19,11 @@ from faebryk.libs.app.kicad_netlist import write_netlist
 from faebryk.libs.app.parameters import resolve_dynamic_parameters
 from faebryk.libs.kicad.fileformats import (
     C_kicad_fp_lib_table_file,
+    C_kicad_netlist_file,
     C_kicad_pcb_file,
     C_kicad_project_file,
 )
-from faebryk.libs.util import ConfigFlag
+from faebryk.libs.util import ConfigFlag, atomic_write
 
 logger = logging.getLogger(__name__)
 
@@ -74,15 +75,24 @@ def apply_design(
     G: Graph,
     app: Module,
     transform: Callable[[PCB_Transformer], Any] | None = None,
+    skip_unchanged: bool = False,
 ):
+    """
+    Apply netlist, layout and routing of app to the pcb at pcb_path.
+    The pcb is loaded and written only once.
+    If skip_unchanged is set, the pcb file is not touched when the result is the
+    same as the file on disk.
+    """
     resolve_dynamic_parameters(G)
 
     logger.info(f"Writing netlist to {netlist_path}")
     changed = write_netlist(G, netlist_path, use_kicad_designators=True)
-    apply_netlist(pcb_path, netlist_path, changed)
 
     logger.info("Load PCB")
-    pcb = C_kicad_pcb_file.loads(pcb_path)
+    pcb_text = pcb_path.read_text()
+    pcb = C_kicad_pcb_file.loads(pcb_text)
+
+    apply_netlist(pcb_path, netlist_path, changed, pcb=pcb)
 
     transformer = PCB_Transformer(pcb.kicad_pcb, G, app)
 
@@ -95,8 +105,15 @@ def apply_design(
     transformer.move_footprints()
     apply_routing(app, transformer)
 
-    logger.info(f"Writing pcbfile {pcb_path}")
-    pcb.dumps(pcb_path)
+    if not skip_unchanged:
+        logger.info(f"Writing pcbfile {pcb_path}")
+        pcb.dump(pcb_path)
+    elif (text := pcb.dumps()) == pcb_text:
+        logger.info("PCB did not change, not writing")
+    else:
+        logger.info(f"Writing pcbfile {pcb_path}")
+        with atomic_write(pcb_path) as f:
+            f.write(text)
 
     print("Reopen PCB in kicad")
     if PCBNEW_AUTO:
@@ -191,7 +208,16 @@ def open_pcb(pcb_path: os.PathLike):
     subprocess.Popen([str(pcbnew), str(pcb_path)], stderr=subprocess.DEVNULL)
 
 
-def apply_netlist(pcb_path: Path, netlist_path: Path, netlist_has_changed: bool = True):
+def apply_netlist(
+    pcb_path: Path,
+    netlist_path: Path,
+    netlist_has_changed: bool = True,
+    pcb: C_kicad_pcb_file | None = None,
+):
+    """
+    Apply the netlist to the pcb at pcb_path.
+    If pcb is given, it is updated in memory instead and not written to disk.
+    """
     from faebryk.exporters.pcb.kicad.pcb import PCB
 
     include_footprints(pcb_path)
@@ -209,4 +235,9 @@ def apply_netlist(pcb_path: Path, netlist_path: Path, netlist_has_changed: bool
 
     # Import netlist into pcb
     logger.info(f"Apply netlist to {pcb_path}")
-    PCB.apply_netlist(pcb_path, netlist_path)
+    if pcb is None:
+        PCB.apply_netlist(pcb_path, netlist_path)
+        return
+
+    netlist = C_kicad_netlist_file.loads(netlist_path)
+    PCB.apply_netlist_to(pcb, netlist, pcb_path.parent / "fp-lib-table")
@@ -1,12 +1,18 @@
-import copy
 import logging
 import math
+import operator
+from bisect import bisect_left, bisect_right
+from functools import cache, lru_cache
 from math import ceil, floor, log10
 from typing import Tuple
 
+import numpy as np
+from pint import DimensionalityError
+
 import faebryk.library._F as F
+from faebryk.core.literal import Interval, IntervalBatch, LiteralValue, Scalar
 from faebryk.core.parameter import Parameter
-from faebryk.libs.units import Quantity
+from faebryk.libs.units import Quantity, Unit
 
 logger = logging.getLogger(__name__)
 
@@ -431,22 +437,56 @@ def repeat_set_over_base(
 class ParamNotResolvedError(Exception): ...
 
 
-_e_series_cache: list[tuple[Parameter, int, set]] = []
+type E_SERIES_RANGE = tuple[float, float, Unit | None]
 
 
-def e_series_intersect[T: float | Quantity](
-    value: Parameter, e_series: E_SERIES = E_SERIES_VALUES.E_ALL
-) -> F.Set:
-    # TODO this got really uglu, need to clean up
+@cache
+def _e_series_table(e_series: frozenset[float]) -> tuple[float, ...]:
+    """Sorted values of one decade of the series"""
+    assert all(v >= 1 and v < 10 for v in e_series)
+    return tuple(sorted(e_series))
 
-    value = value.get_most_narrow()
 
-    for k, i, v in _e_series_cache:
-        if k == value and i == id(e_series):
-            return F.Set(v)
+def e_series_values_in_range(
+    min_val: float, max_val: float, e_series: E_SERIES = E_SERIES_VALUES.E_ALL
+) -> list[float]:
+    """
+    Sorted values of the series within [min_val, max_val].
+    Only the decades spanned by the range are searched, by bisecting the sorted
+    decade table. Bounds are tolerant like the comparison of Constants.
+    """
+
+    table = _e_series_table(frozenset(e_series))
+    bounds = Interval(min_val, max_val)
+
+    # widen the window, the exact (tolerant) check is done below
+    lo = min_val - (1e-8 + 2e-5 * abs(min_val))
+    hi = max_val + (1e-8 + 2e-5 * abs(max_val))
+
+    # TODO ugly
+    if max_val == math.inf:
+        max_val = min_val * 10e3
+
+    out = []
+    for exp in range(floor(log10(min_val)), ceil(log10(max_val)) + 1):
+        base = 10**exp
+        candidates = table[
+            bisect_left(table, lo / base) : bisect_right(table, hi / base)
+        ]
+        out.extend(v for c in candidates if Scalar(v := round(c * base, 13)) in bounds)
+    return out
+
+
+def e_series_range(value: Parameter) -> E_SERIES_RANGE:
+    """
+    Normalised (min, max, unit) of a resolved parameter.
+    Magnitudes are in the compact unit of the minimum.
+    """
+
+    value = value.get_most_narrow()
 
     if isinstance(value, F.Constant):
-        value = F.Range(value)
+        min_val = max_val = value
     elif isinstance(value, F.Set):
         raise NotImplementedError
     elif isinstance(value, (F.Operation, F.TBD)):
@@ -454,12 +494,10 @@ def e_series_intersect[T: float | Quantity](
     elif isinstance(value, F.ANY):
         # TODO
         raise ParamNotResolvedError()
-
-    assert isinstance(value, F.Range)
-
-    min_val = value.min
-    max_val = value.max
-    unit = 1
+    else:
+        assert isinstance(value, F.Range)
+        min_val = value.min
+        max_val = value.max
 
     if not isinstance(min_val, F.Constant) or not isinstance(max_val, F.Constant):
         # TODO
@@ -468,30 +506,44 @@ def e_series_intersect[T: float | Quantity](
     min_val = min_val.value
     max_val = max_val.value
 
-    if isinstance(min_val, Quantity):
-        assert isinstance(max_val, Quantity)
+    if not isinstance(min_val, Quantity):
+        assert isinstance(min_val, (float, int)) and isinstance(max_val, (float, int))
+        return min_val, max_val, None
 
-        min_val_q = min_val.to_compact()
+    assert isinstance(max_val, Quantity)
+    return _compact_range(
+        min_val.magnitude, min_val.units, max_val.magnitude, max_val.units
+    )
 
-        unit = min_val_q.units
-        max_val_q = max_val.to(unit)
-        assert max_val_q.units == unit
 
-        min_val: float = min_val_q.magnitude
-        max_val: float = max_val_q.magnitude
+@lru_cache(maxsize=4096)
+def _compact_range(
+    min_val: float, min_unit: Unit, max_val: float, max_unit: Unit
+) -> E_SERIES_RANGE:
+    min_val_q = Quantity(min_val, min_unit).to_compact()
+    unit = min_val_q.units
+    max_val_q = Quantity(max_val, max_unit).to(unit)
 
-    assert isinstance(min_val, (float, int)) and isinstance(max_val, (float, int))
+    return min_val_q.magnitude, max_val_q.magnitude, unit
 
-    # TODO ugly
-    if max_val == math.inf:
-        max_val = min_val * 10e3
 
-    e_series_values = repeat_set_over_base(
-        e_series, 10, range(floor(log10(min_val)), ceil(log10(max_val)) + 1)
-    )
-    out = value & {e * unit for e in e_series_values}
-    _e_series_cache.append((copy.copy(value), id(e_series), out.params))
-    return out
+@lru_cache(maxsize=1024)
+def e_series_range_values(
+    value_range: E_SERIES_RANGE, e_series: frozenset[float]
+) -> tuple[float | Quantity, ...]:
+    """Cached values of the series within a range from :func:`e_series_range`"""
+
+    min_val, max_val, unit = value_range
+    values = e_series_values_in_range(min_val, max_val, e_series)
+    if unit is None:
+        return tuple(values)
+    return tuple(Quantity(v, unit) for v in values)
+
+
+def e_series_intersect[T: float | Quantity](
+    value: Parameter, e_series: E_SERIES = E_SERIES_VALUES.E_ALL
+) -> F.Set:
+    return F.Set(e_series_range_values(e_series_range(value), frozenset(e_series)))
 
 
 def e_series_discretize_to_nearest(
@@ -509,6 +561,25 @@ def e_series_discretize_to_nearest(
     return F.Constant(min(e_series_values, key=lambda x: abs(x - target)))
 
 
+def _nearest(candidates: list[Parameter], targets: list[Parameter]) -> list[Parameter]:
+    """
+    The closest candidate for every target, like min(candidates, key=abs(c - t)),
+    but compared in one vectorized pass if all of them are numeric Constants.
+    """
+    lits = LiteralValue.from_parameters(*candidates, *targets)
+    try:
+        if lits is None or not all(isinstance(lit, Scalar) for lit in lits):
+            raise ValueError()
+        values = IntervalBatch.from_literals(lits).lower  # type: ignore
+    except (ValueError, TypeError, DimensionalityError):
+        return [min(candidates, key=lambda c: abs(c - t)) for t in targets]
+
+    c, t = values[: len(candidates)], values[len(candidates) :]
+    # first of equally close candidates, like min
+    indices = np.abs(c[None, :] - t[:, None]).argmin(axis=1)
+    return [candidates[i] for i in indices.tolist()]
+
+
 def e_series_ratio(
     RH: Parameter,
     RL: Parameter,
@@ -557,19 +628,29 @@ def e_series_ratio(
 
     target_ratio = oir.as_center_tuple()[0]
 
-    solutions = []
-
-    for rh_val in rh_values.params:
-        rl_ideal = rh_val / (F.Constant(1) / target_ratio - 1)
-
-        rl_nearest_e_val = (
-            min(rl_values.params, key=lambda x: abs(x - rl_ideal))
-            if rl_values
-            else e_series_discretize_to_nearest(rl_ideal, e_values)
-        )
-        real_ratio = rl_nearest_e_val / (rh_val + rl_nearest_e_val)
+    # the same operations for every candidate, computed in batches
+    rh_params = list(rh_values.params)
+    n = len(rh_params)
+    rl_ideals = Parameter.arithmetic_op_batch(
+        rh_params, [F.Constant(1) / target_ratio - 1] * n, operator.truediv
+    )
 
-        solutions.append((real_ratio, (rh_val, rl_nearest_e_val)))
+    if rl_values:
+        rl_nearest = _nearest(list(rl_values.params), rl_ideals)
+    else:
+        rl_nearest = [
+            e_series_discretize_to_nearest(rl_ideal, e_values) for rl_ideal in rl_ideals
+        ]
+
+    real_ratios = Parameter.arithmetic_op_batch(
+        rl_nearest,
+        Parameter.arithmetic_op_batch(rh_params, rl_nearest, operator.add),
+        operator.truediv,
+    )
+    solutions = [
+        (real_ratio, (rh_val, rl_val))
+        for real_ratio, rh_val, rl_val in zip(real_ratios, rh_params, rl_nearest)
+    ]
 
     optimum = min(solutions, key=lambda x: abs(x[0] - target_ratio))
 
@@ -94,7 +94,7 @@ def apply_design_to_pcb(
         PCB_FILE.unlink(missing_ok=True)
         shutil.copytree(example_prj, KICAD_SRC, dirs_exist_ok=True)
 
-    apply_design(PCB_FILE, NETLIST_OUT, G, m, transform)
+    apply_design(PCB_FILE, NETLIST_OUT, G, m, transform, skip_unchanged=True)
 
     return G
 
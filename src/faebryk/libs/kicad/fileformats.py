@@ -17,7 +17,13 @@ from faebryk.libs.kicad.fileformats_common import (
     C_xyz,
     gen_uuid,
 )
-from faebryk.libs.sexp.dataclass_sexp import JSON_File, SEXP_File, SymEnum, sexp_field
+from faebryk.libs.sexp.dataclass_sexp import (
+    JSON_File,
+    SEXP_File,
+    SEXP_Lazy,
+    SymEnum,
+    sexp_field,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -704,7 +710,7 @@ class C_footprint:
 @dataclass
 class C_kicad_pcb_file(SEXP_File):
     @dataclass
-    class C_kicad_pcb:
+    class C_kicad_pcb(SEXP_Lazy):
         @dataclass
         class C_general:
             thickness: float = 1.6
@@ -1123,38 +1129,44 @@ class C_kicad_pcb_file(SEXP_File):
         setup: C_setup = field(default_factory=C_setup)
 
         nets: list[C_net] = field(
-            **sexp_field(multidict=True),
+            **sexp_field(multidict=True, lazy=True),
             default_factory=lambda: [
                 C_kicad_pcb_file.C_kicad_pcb.C_net(number=0, name="")
             ],
         )
         footprints: list[C_pcb_footprint] = field(
-            **sexp_field(multidict=True), default_factory=list
+            **sexp_field(multidict=True, lazy=True), default_factory=list
+        )
+        vias: list[C_via] = field(
+            **sexp_field(multidict=True, lazy=True), default_factory=list
+        )
+        zones: list[C_zone] = field(
+            **sexp_field(multidict=True, lazy=True), default_factory=list
         )
-        vias: list[C_via] = field(**sexp_field(multidict=True), default_factory=list)
-        zones: list[C_zone] = field(**sexp_field(multidict=True), default_factory=list)
         segments: list[C_segment] = field(
-            **sexp_field(multidict=True), default_factory=list
+            **sexp_field(multidict=True, lazy=True), default_factory=list
         )
         arcs: list[C_arc_segment] = field(
-            **sexp_field(multidict=True), default_factory=list
+            **sexp_field(multidict=True, lazy=True), default_factory=list
         )
 
         gr_lines: list[C_line] = field(
-            **sexp_field(multidict=True), default_factory=list
+            **sexp_field(multidict=True, lazy=True), default_factory=list
+        )
+        gr_arcs: list[C_arc] = field(
+            **sexp_field(multidict=True, lazy=True), default_factory=list
         )
-        gr_arcs: list[C_arc] = field(**sexp_field(multidict=True), default_factory=list)
         gr_circles: list[C_circle] = field(
-            **sexp_field(multidict=True), default_factory=list
+            **sexp_field(multidict=True, lazy=True), default_factory=list
         )
         gr_rects: list[C_rect] = field(
-            **sexp_field(multidict=True), default_factory=list
+            **sexp_field(multidict=True, lazy=True), default_factory=list
         )
         gr_texts: list[C_text] = field(
-            **sexp_field(multidict=True), default_factory=list
+            **sexp_field(multidict=True, lazy=True), default_factory=list
         )
         groups: list[C_group] = field(
-            **sexp_field(multidict=True), default_factory=list
+            **sexp_field(multidict=True, lazy=True), default_factory=list
         )
 
     kicad_pcb: C_kicad_pcb
@@ -2,11 +2,16 @@
 # SPDX-License-Identifier: MIT
 
 import functools
+import hashlib
 import json
 import logging
+import os
+import tempfile
 import textwrap
+import time
 from dataclasses import dataclass
-from typing import Iterable
+from pathlib import Path
+from typing import Any, Iterable
 
 import requests
 from dataclasses_json import dataclass_json
@@ -15,10 +20,14 @@ from pint import DimensionalityError
 from faebryk.core.module import Module
 
 # TODO: replace with API-specific data model
-from faebryk.libs.picker.jlcpcb.jlcpcb import Component, MappingParameterDB
+from faebryk.libs.picker.jlcpcb.jlcpcb import (
+    CACHE_FOLDER,
+    Component,
+    MappingParameterDB,
+)
 from faebryk.libs.picker.lcsc import LCSC_NoDataException, LCSC_PinmapException
 from faebryk.libs.picker.picker import PickError
-from faebryk.libs.util import ConfigFlagString, try_or
+from faebryk.libs.util import ConfigFlag, ConfigFlagInt, ConfigFlagString, try_or
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +35,15 @@ DEFAULT_API_URL = "https://components.atopileapi.com"
 DEFAULT_API_TIMEOUT_SECONDS = 30
 API_URL = ConfigFlagString("PICKER_API_URL", DEFAULT_API_URL, "API URL")
 API_KEY = ConfigFlagString("PICKER_API_KEY", "", "API key")
+API_CACHE_TTL = ConfigFlagInt(
+    "PICKER_API_CACHE_TTL", 24 * 60 * 60, "Seconds API responses are cached on disk"
+)
+API_CACHE_SIZE = ConfigFlagInt(
+    "PICKER_API_CACHE_SIZE", 10000, "Max number of API responses cached on disk"
+)
+API_OFFLINE = ConfigFlag(
+    "PICKER_API_OFFLINE", False, "Only serve API responses from the disk cache"
+)
 
 
 class ApiError(Exception): ...
@@ -34,6 +52,12 @@ class ApiError(Exception): ...
 class ApiNotConfiguredError(ApiError): ...
 
 
+class ApiCacheMissError(ApiError):
+    """
+    Response not in the cache while offline
+    """
+
+
 class ApiHTTPError(ApiError):
     def __init__(self, error: requests.exceptions.HTTPError):
         super().__init__()
@@ -173,17 +197,90 @@ class ManufacturerPartParams:
     qty: int
 
 
+class ResponseCache:
+    """
+    Content-addressed cache of API responses on disk.
+
+    Entries are keyed by the request (method, url and canonical JSON of the
+    body) and expire after ttl seconds. When there are more than max_entries,
+    the least recently written ones are evicted.
+    """
+
+    def __init__(self, path: Path, ttl: float, max_entries: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: int | None = None
+
+    @staticmethod
+    def key(method: str, url: str, data: dict | None = None) -> str:
+        request = json.dumps([method, url, data], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str, allow_expired: bool = False) -> Any | None:
+        file = self._file(key)
+        try:
+            if not allow_expired and time.time() - file.stat().st_mtime > self.ttl:
+                return None
+            return json.loads(file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = self._file(key)
+        is_new = not file.exists()
+
+        # atomic, concurrent builds can share the cache
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, file)
+
+        if self._entries is None:
+            self._entries = sum(1 for _ in self.path.glob("*.json"))
+        elif is_new:
+            self._entries += 1
+        if self._entries > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(
+            self.path.glob("*.json"), key=lambda f: try_or(lambda: f.stat().st_mtime, 0)
+        )
+        # evict down to 90% to not scan the folder on every put
+        evict = max(len(entries) - int(self.max_entries * 0.9), 0)
+        for file in entries[:evict]:
+            file.unlink(missing_ok=True)
+        self._entries = len(entries) - evict
+        logger.debug(f"Evicted {evict} cached API responses")
+
+
 class ApiClient:
     @dataclass
     class Config:
         api_url: str = API_URL.get()
         api_key: str = API_KEY.get()
+        cache_path: Path | None = CACHE_FOLDER / Path("picker_api")
+        cache_ttl: float = API_CACHE_TTL.get()
+        cache_size: int = API_CACHE_SIZE.get()
+        offline: bool = API_OFFLINE.get()
 
     config = Config()
 
     def __init__(self):
         self._client = requests.Session()
         self._client.headers["Authorization"] = f"Bearer {self.config.api_key}"
+        self._cache = (
+            ResponseCache(
+                self.config.cache_path, self.config.cache_ttl, self.config.cache_size
+            )
+            if self.config.cache_path is not None
+            else None
+        )
 
     def _get(self, url: str, timeout: float = 10) -> requests.Response:
         try:
@@ -207,6 +304,29 @@ class ApiClient:
 
         return response
 
+    def _fetch(self, method: str, url: str, data: dict | None = None) -> Any:
+        """
+        JSON response of a GET (data is None) or POST request, using the cache
+        """
+        key = ResponseCache.key(method, f"{self.config.api_url}{url}", data)
+
+        if self._cache is not None:
+            cached = self._cache.get(key, allow_expired=self.config.offline)
+            if cached is not None:
+                logger.debug(f"API cache hit: {method} {url}")
+                return cached
+        if self.config.offline:
+            raise ApiCacheMissError(f"Not in cache while offline: {method} {url}")
+
+        if data is None:
+            response = self._get(url).json()
+        else:
+            response = self._post(url, data).json()
+
+        if self._cache is not None:
+            self._cache.put(key, response)
+        return response
+
     @staticmethod
     def ComponentFromResponse(kw: dict) -> Component:
         # TODO very ugly fix
@@ -215,23 +335,17 @@ class ApiClient:
 
     @functools.lru_cache(maxsize=None)
     def fetch_part_by_lcsc(self, lcsc: int) -> list[Component]:
-        response = self._get(f"/v0/component/lcsc/{lcsc}")
-        return [
-            self.ComponentFromResponse(part) for part in response.json()["components"]
-        ]
+        response = self._fetch("GET", f"/v0/component/lcsc/{lcsc}")
+        return [self.ComponentFromResponse(part) for part in response["components"]]
 
     @functools.lru_cache(maxsize=None)
     def fetch_part_by_mfr(self, mfr: str, mfr_pn: str) -> list[Component]:
-        response = self._get(f"/v0/component/mfr/{mfr}/{mfr_pn}")
-        return [
-            self.ComponentFromResponse(part) for part in response.json()["components"]
-        ]
+        response = self._fetch("GET", f"/v0/component/mfr/{mfr}/{mfr_pn}")
+        return [self.ComponentFromResponse(part) for part in response["components"]]
 
     def query_parts(self, method: str, params: BaseParams) -> list[Component]:
-        response = self._post(f"/v0/query/{method}", params.convert_to_dict())
-        return [
-            self.ComponentFromResponse(part) for part in response.json()["components"]
-        ]
+        response = self._fetch("POST", f"/v0/query/{method}", params.convert_to_dict())
+        return [self.ComponentFromResponse(part) for part in response["components"]]
 
     def fetch_resistors(self, params: ResistorParams) -> list[Component]:
         return self.query_parts("resistors", params)
@@ -4,7 +4,7 @@
 import faebryk.library._F as F
 import faebryk.libs.picker.api.picker_lib as picker_lib
 from faebryk.core.module import Module
-from faebryk.libs.picker.api.api import ApiHTTPError
+from faebryk.libs.picker.api.api import ApiCacheMissError, ApiHTTPError
 from faebryk.libs.picker.common import StaticPartPicker
 from faebryk.libs.picker.jlcpcb.jlcpcb import Component
 from faebryk.libs.picker.picker import PickError
@@ -19,6 +19,8 @@ class ApiPicker(F.has_multi_picker.FunctionPicker):
                 raise PickError(str(e), module) from e
             else:
                 raise
+        except ApiCacheMissError as e:
+            raise PickError(str(e), module) from e
 
 
 class StaticApiPartPicker(StaticPartPicker):
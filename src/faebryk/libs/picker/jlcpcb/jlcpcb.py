@@ -7,23 +7,45 @@ import json
 import logging
 import math
 import os
+import sqlite3
 import struct
 import sys
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from textwrap import indent
-from typing import Any, Callable, Generator, Self, Sequence
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Generator,
+    Iterable,
+    Iterator,
+    Self,
+    Sequence,
+)
 
 import patoolib
 import requests
 from pint import DimensionalityError
 from rich.progress import track
 from tortoise import Tortoise
-from tortoise.expressions import Q
-from tortoise.fields import CharField, DatetimeField, IntField, JSONField, TextField
+from tortoise.expressions import Case, Q, Subquery, When
+from tortoise.fields import (
+    CharField,
+    DatetimeField,
+    FloatField,
+    IntField,
+    JSONField,
+    TextField,
+)
 from tortoise.models import Model
+from tortoise.transactions import in_transaction
 
 import faebryk.library._F as F
+from faebryk.core.literal import Interval, LiteralValue, Scalar
 from faebryk.core.module import Module
 from faebryk.core.parameter import Parameter
 from faebryk.libs.picker.lcsc import (
@@ -37,7 +59,7 @@ from faebryk.libs.picker.picker import (
     PickError,
     has_part_picked_defined,
 )
-from faebryk.libs.units import P, UndefinedUnitError
+from faebryk.libs.units import P, Quantity, UndefinedUnitError
 from faebryk.libs.util import at_exit, once, try_or
 
 logger = logging.getLogger(__name__)
@@ -46,6 +68,19 @@ logger = logging.getLogger(__name__)
 BUILD_FOLDER = Path("./build")
 CACHE_FOLDER = BUILD_FOLDER / Path("cache")
 
+# attributes parsed into the component_attributes table when the db is downloaded,
+# others are parsed the first time they are queried
+INDEXED_ATTRIBUTES = [
+    "Resistance",
+    "Capacitance",
+    "Inductance",
+    "Tolerance",
+    "Power(Watts)",
+    "Overload Voltage (Max)",
+    "Voltage Rated",
+    "Rated Current",
+]
+
 
 class JLCPCB_Part(LCSC_Part):
     def __init__(self, partno: str) -> None:
@@ -77,6 +112,111 @@ class MappingParameterDB:
     ignore_at: bool = True
 
 
+def _clean_attribute_field(value_field: str, ignore_at: bool = True) -> str:
+    # parse fields like "850mV@1A"
+    # TODO better to actually parse this
+    if ignore_at:
+        value_field = value_field.split("@")[0]
+
+    # parse fields like "110mA;130mA"
+    # TODO: better data model so we can choose the appropriate value
+    if ";" in value_field:
+        value_field = value_field.split(";")[0]
+
+    return value_field.replace("cd", "candela")
+
+
+@lru_cache(maxsize=65536)
+def _parse_quantity(value_field: str) -> Quantity:
+    # the same few thousand value strings are parsed for every candidate
+    try:
+        return P.Quantity(value_field)
+    except UndefinedUnitError as e:
+        raise ValueError(f"Could not parse value field '{value_field}'") from e
+
+
+def _parse_range(value_field: str) -> tuple[Quantity, Quantity]:
+    # parse fields like "1.5V~2.5V"
+    values = value_field.split("~")
+    if len(values) != 2:
+        raise ValueError(f"Invalid range from value '{value_field}'")
+    return _parse_quantity(values[0]), _parse_quantity(values[1])
+
+
+def _parse_tolerance(tolerance_field: str) -> float:
+    if "ppm" in tolerance_field:
+        return float(tolerance_field.strip("±pm")) / 1e6
+    if "%~+" in tolerance_field:
+        tolerances = [float(t.strip("%+-")) for t in tolerance_field.split("~")]
+        return max(tolerances) / 100
+    if "%" in tolerance_field:
+        return float(tolerance_field.strip("%±")) / 100
+    raise ValueError(f"Could not parse tolerance field '{tolerance_field}'")
+
+
+def _to_base_units(value: Quantity | float) -> tuple[float, str]:
+    """Magnitude in SI base units and the base unit as stored in the db"""
+    if not isinstance(value, Quantity):
+        return float(value), "dimensionless"
+    value = value.to_base_units()
+    return float(value.magnitude), str(value.units)
+
+
+def _attribute_rows(
+    lcsc: int, attributes: dict[str, str], names: Iterable[str]
+) -> Iterator[tuple[int, str, str, float, float, float | None, float | None]]:
+    """
+    Rows of the component_attributes table for the given attributes of a component:
+    (lcsc, name, unit, value_min, value_max, tol_min, tol_max)
+
+    Values are in SI base units and parsed like
+    :meth:`Component.attribute_to_parameter`.
+    tol_min/tol_max are the bounds including the tolerance of the component and
+    NULL if it has none.
+    """
+
+    for name in names:
+        if name not in attributes:
+            continue
+        try:
+            if name == "Tolerance":
+                tolerance = _parse_tolerance(attributes[name])
+                yield lcsc, name, "dimensionless", tolerance, tolerance, None, None
+                continue
+
+            value_field = _clean_attribute_field(attributes[name])
+            if "~" in value_field:
+                lower, upper = _parse_range(value_field)
+                value_min, unit = _to_base_units(lower)
+                value_max, upper_unit = _to_base_units(upper)
+                if unit != upper_unit:
+                    continue
+                # ranges are not widened by the tolerance
+                yield lcsc, name, unit, value_min, value_max, value_min, value_max
+                continue
+
+            value, unit = _to_base_units(_parse_quantity(value_field))
+            tol_min = tol_max = None
+            if "Tolerance" in attributes:
+                tolerance = try_or(
+                    lambda: _parse_tolerance(attributes["Tolerance"]),
+                    catch=ValueError,
+                )
+                if tolerance is not None:
+                    tol_min, tol_max = sorted(
+                        (value - value * tolerance, value + value * tolerance)
+                    )
+            yield lcsc, name, unit, value, value, tol_min, tol_max
+        except (ValueError, DimensionalityError):
+            # unparseable values are not indexed, the full parse reports them
+            continue
+
+
+def _widen(value: float, direction: int) -> float:
+    # same tolerance as the comparison of parameters
+    return value + direction * (1e-8 + 2e-5 * abs(value))
+
+
 class Category(Model):
     id = IntField(primary_key=True)
     category = CharField(max_length=255)
@@ -85,29 +225,11 @@ class Category(Model):
     class Meta:
         table = "categories"
 
-    async def get_ids(
-        self, category: str = "", subcategory: str = ""
-    ) -> list[dict[str, Any]]:
+    async def get_ids(self, category: str = "", subcategory: str = "") -> list[int]:
         """
-        Get the category ids for the given category and subcategory
-
-        :param category: The category to search for, use "" for any
-        :param subcategory: The subcategory to search for, use "" for any
-
-        :return: A list of category ids for the JLCPCB database Component id field
+        See :meth:`JLCPCB_DB.get_category_ids`
         """
-        filter_query = Q()
-        if category != "":
-            filter_query &= Q(category__icontains=category)
-        if subcategory != "":
-            filter_query &= Q(subcategory__icontains=subcategory)
-        category_ids = await self.filter(filter_query).values("id")
-        if len(category_ids) < 1:
-            raise LookupError(
-                f"Could not find a match for category {category} "
-                f"and subcategory {subcategory}",
-            )
-        return [c["id"] for c in category_ids]
+        return JLCPCB_DB.get().get_category_ids(category, subcategory)
 
 
 class Manufacturers(Model):
@@ -119,52 +241,38 @@ class Manufacturers(Model):
 
     async def get_ids(self, manufacturer: str) -> list[int]:
         """
-        Get the manufacturer ids for the given manufacturer
-
-        :param manufacturer: The manufacturer to search for
-
-        :return: A list of manufacturer ids for the JLCPCB database Component id field
+        See :meth:`JLCPCB_DB.get_manufacturer_ids`
         """
-        manufacturer_ids = await self.filter(name__icontains=manufacturer).values("id")
-        if len(manufacturer_ids) < 1:
-            raise LookupError(f"Could not find a match for manufacturer {manufacturer}")
-        return [m["id"] for m in manufacturer_ids]
+        return JLCPCB_DB.get().get_manufacturer_ids(manufacturer)
 
     async def get_from_id(self, manufacturer_id: int) -> str:
-        return (await self.get(id=manufacturer_id)).name
+        return JLCPCB_DB.get().get_manufacturer_name(manufacturer_id)
 
 
-class Component(Model):
-    lcsc = IntField(primary_key=True)
-    category_id = IntField()
-    category = CharField(max_length=255)
-    subcategory = CharField(max_length=255, optional=True)
-    mfr = CharField(max_length=255)
-    package = CharField(max_length=255)
-    joints = IntField()
-    manufacturer_id = IntField()
-    manufacturer_name = CharField(max_length=255, optional=True)
-    basic = IntField()
-    description = CharField(max_length=255)
-    datasheet = CharField(max_length=255)
-    stock = IntField()
-    price = JSONField()
-    last_update = DatetimeField()
-    extra = TextField()
-    flag = IntField()
-    last_on_stock = DatetimeField()
-    preferred = IntField()
-
-    class Meta:
-        table = "components"
+class ComponentData:
+    """
+    Data access of a component, shared by the ORM model and the lightweight
+    ComponentRow
+    """
 
-    class ParseError(Exception):
-        pass
+    lcsc: int
+    basic: int
+    preferred: int
+    manufacturer_id: int
+    price: Any
+    extra: Any
 
     @property
     def partno(self):
         return f"C{self.lcsc}"
 
+    @property
+    def mfr_name(self) -> str:
+        try:
+            return self.manufacturer_name
+        except AttributeError:
+            return JLCPCB_DB.get().get_manufacturer_name(self.manufacturer_id)
+
     def get_price(self, qty: int = 1) -> float:
         """
         Get the price for qty of the component including handling fees
@@ -218,51 +326,22 @@ class Component(Model):
         """
         assert isinstance(self.extra_, dict) and "attributes" in self.extra_
 
-        value_field = self.extra_["attributes"][attribute_name]
-        # parse fields like "850mV@1A"
-        # TODO better to actually parse this
-        if ignore_at:
-            value_field = value_field.split("@")[0]
-
-        # parse fields like "110mA;130mA"
-        # TODO: better data model so we can choose the appropriate value
-        if ";" in value_field:
-            value_field = value_field.split(";")[0]
-
-        value_field = value_field.replace("cd", "candela")
+        value_field = _clean_attribute_field(
+            self.extra_["attributes"][attribute_name], ignore_at
+        )
 
         # parse fields like "1.5V~2.5V"
         if "~" in value_field:
-            values = value_field.split("~")
-            if len(values) != 2:
-                raise ValueError(f"Invalid range from value '{value_field}'")
-            return F.Range(*(P.Quantity(v) for v in values))
+            return F.Range(*_parse_range(value_field))
 
-        # unit hacks
-
-        try:
-            value = P.Quantity(value_field)
-        except UndefinedUnitError as e:
-            raise ValueError(f"Could not parse value field '{value_field}'") from e
+        value = _parse_quantity(value_field)
 
         if not use_tolerance:
             return F.Constant(value)
 
         if "Tolerance" not in self.extra_["attributes"]:
             raise ValueError(f"No Tolerance field in component (lcsc: {self.lcsc})")
-        if "ppm" in self.extra_["attributes"]["Tolerance"]:
-            tolerance = float(self.extra_["attributes"]["Tolerance"].strip("±pm")) / 1e6
-        elif "%~+" in self.extra_["attributes"]["Tolerance"]:
-            tolerances = self.extra_["attributes"]["Tolerance"].split("~")
-            tolerances = [float(t.strip("%+-")) for t in tolerances]
-            tolerance = max(tolerances) / 100
-        elif "%" in self.extra_["attributes"]["Tolerance"]:
-            tolerance = float(self.extra_["attributes"]["Tolerance"].strip("%±")) / 100
-        else:
-            raise ValueError(
-                "Could not parse tolerance field "
-                f"'{self.extra_['attributes']['Tolerance']}'"
-            )
+        tolerance = _parse_tolerance(self.extra_["attributes"]["Tolerance"])
 
         return F.Range.from_center_rel(value, tolerance)
 
@@ -334,6 +413,34 @@ class Component(Model):
             for m in mapping
         ]
 
+
+class Component(Model, ComponentData):
+    lcsc = IntField(primary_key=True)
+    category_id = IntField()
+    category = CharField(max_length=255)
+    subcategory = CharField(max_length=255, optional=True)
+    mfr = CharField(max_length=255)
+    package = CharField(max_length=255)
+    joints = IntField()
+    manufacturer_id = IntField()
+    manufacturer_name = CharField(max_length=255, optional=True)
+    basic = IntField()
+    description = CharField(max_length=255)
+    datasheet = CharField(max_length=255)
+    stock = IntField()
+    price = JSONField()
+    last_update = DatetimeField()
+    extra = TextField()
+    flag = IntField()
+    last_on_stock = DatetimeField()
+    preferred = IntField()
+
+    class Meta:
+        table = "components"
+
+    class ParseError(Exception):
+        pass
+
     def attach(
         self,
         module: Module,
@@ -389,12 +496,48 @@ class Component(Model):
                 f"{indent(module.pretty_params(), ' '*4)}"
             )
 
-    @property
-    def mfr_name(self):
+
+class ComponentRow(ComponentData):
+    """
+    Component as read by the fast path of ComponentQuery, without the ORM
+    conversion of all fields. Fields are read from the row on access.
+    Use :meth:`to_component` for the model, e.g. to attach it.
+    """
+
+    def __init__(self, row: sqlite3.Row):
+        self.row = row
+
+    def __getattr__(self, name: str) -> Any:
         try:
-            return self.manufacturer_name
-        except AttributeError:
-            return asyncio.run(Manufacturers().get_from_id(self.manufacturer_id))
+            return self.row[name]
+        except IndexError:
+            raise AttributeError(name) from None
+
+    @property
+    def price(self) -> Any:
+        return json.loads(self.row["price"])
+
+    def to_component(self) -> Component:
+        return Component._init_from_db(**dict(self.row))
+
+
+class ComponentAttribute(Model):
+    """
+    Parsed numeric attribute of a component, derived from Component.extra
+    See :func:`_attribute_rows`
+    """
+
+    id = IntField(primary_key=True)
+    lcsc = IntField()
+    name = CharField(max_length=255)
+    unit = CharField(max_length=255)
+    value_min = FloatField()
+    value_max = FloatField()
+    tol_min = FloatField(null=True)
+    tol_max = FloatField(null=True)
+
+    class Meta:
+        table = "component_attributes"
 
 
 class ComponentQuery:
@@ -406,24 +549,90 @@ class ComponentQuery:
             self.msg = msg
             super().__init__(f"{msg} for parameter {param!r}")
 
+    # results of queries by their sql, filled by prefetch
+    _prefetched: dict[str, list[ComponentRow]] = {}
+
     def __init__(self):
         # init db connection
         JLCPCB_DB()
 
         self.Q: Q | None = Q()
-        self.results: list[Component] | None = None
+        self.results: list[ComponentRow] | None = None
+
+    def _queryset(self):
+        return Component.filter(self.Q).order_by("lcsc")
+
+    def get_rows(self) -> list[ComponentRow]:
+        """
+        Lightweight results for filtering many candidates, see ComponentRow
+        """
+        if self.results is not None:
+            return self.results
 
-    async def exec(self) -> list[Component]:
-        queryset = Component.filter(self.Q)
-        logger.debug(f"Query results: {await queryset.count()}")
-        self.results = await queryset
+        sql = self._queryset().sql()
+        prefetched = ComponentQuery._prefetched.get(sql)
+        if prefetched is not None:
+            self.results = list(prefetched)
+        else:
+            self.results = [ComponentRow(row) for row in JLCPCB_DB.get().execute(sql)]
+            logger.debug(f"Query results: {len(self.results)}")
         self.Q = None
         return self.results
 
     def get(self) -> list[Component]:
-        if self.results is not None:
-            return self.results
-        return asyncio.run(self.exec())
+        return [row.to_component() for row in self.get_rows()]
+
+    @classmethod
+    @contextmanager
+    def prefetch(
+        cls, *groups: Iterable["ComponentQuery"], chunk_size: int = 100
+    ) -> Generator[None, None, None]:
+        """
+        Execute not yet executed queries with one combined query per group
+        (e.g. per module type) and chunk.
+        While the context is open, get() of any query with the same filters is
+        served from these results.
+        """
+
+        pending = [
+            {
+                sig: q.Q
+                for q in group
+                if q.Q is not None
+                and (sig := q._queryset().sql()) not in cls._prefetched
+            }
+            for group in groups
+        ]
+
+        db = JLCPCB_DB.get()
+        prefetched: dict[str, list[ComponentRow]] = {}
+        for group in pending:
+            sigs = list(group)
+            for i in range(0, len(sigs), chunk_size):
+                chunk = sigs[i : i + chunk_size]
+                queryset = (
+                    Component.filter(Q(*(group[s] for s in chunk), join_type="OR"))
+                    .annotate(
+                        **{
+                            f"match_{j}": Case(When(group[s], then="1"), default="0")
+                            for j, s in enumerate(chunk)
+                        }
+                    )
+                    .order_by("lcsc")
+                )
+                results = [ComponentRow(row) for row in db.execute(queryset.sql())]
+                for j, s in enumerate(chunk):
+                    prefetched[s] = [
+                        c for c in results if str(c.row[f"match_{j}"]) == "1"
+                    ]
+
+        logger.debug(f"Prefetched {len(prefetched)} queries")
+        cls._prefetched.update(prefetched)
+        try:
+            yield
+        finally:
+            for sig in prefetched:
+                cls._prefetched.pop(sig, None)
 
     def filter_by_stock(self, qty: int) -> Self:
         assert self.Q
@@ -456,18 +665,7 @@ class ComponentQuery:
             logger.debug(f"Possible values: {si_vals}")
 
         if tolerance_requirement is not None:
-            cmp = value.get_parent_of_type(Module)
-            assert cmp
-            value = value.get_most_narrow()
-            if not isinstance(value, F.Range):
-                raise PickError(f"Can only pick ranges, not: {value}", cmp)
-            tol = value.as_center_tuple(relative=True)[1]
-            if tol < tolerance_requirement:  # type: ignore
-                raise PickError(
-                    f"Tolerance not supported: {value}, "
-                    f"expected at least {tolerance_requirement}, but is {tol}",
-                    cmp,
-                )
+            value = self._check_tolerance(value, tolerance_requirement)
             self.filter_by_tolerance(tolerance_requirement)
 
         if isinstance(value, F.ANY):
@@ -476,15 +674,124 @@ class ComponentQuery:
 
         return self.filter_by_description(*si_vals)
 
+    def filter_by_value(
+        self,
+        value: Parameter,
+        mapping: MappingParameterDB,
+        tolerance_requirement: float | None = None,
+    ) -> Self:
+        """
+        Filter by the parsed attribute of the mapping being within the range of value
+
+        Same result as checking the parameter of the component against value, but
+        done on the indexed component_attributes table.
+        """
+        assert self.Q
+
+        cmp = value.get_parent_of_type(Module)
+        assert cmp
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Filtering by value:\n{indent(value.get_tree_param().pretty(), ' '*4)}"
+            )
+
+        if tolerance_requirement is not None:
+            value = self._check_tolerance(value, tolerance_requirement)
+            self.filter_by_tolerance(tolerance_requirement)
+
+        value = value.get_most_narrow()
+        if isinstance(value, F.ANY):
+            return self
+        assert not self.results
+
+        literal = LiteralValue.from_parameter(value)
+        if literal is None:
+            raise PickError(f"Could not resolve {value}", cmp)
+        if isinstance(literal, Scalar):
+            lower = upper = literal.value
+        elif isinstance(literal, Interval):
+            lower, upper = literal.bounds
+        else:
+            # sets are only checked on the parsed parameters
+            return self
+
+        (lower, unit), (upper, upper_unit) = map(_to_base_units, (lower, upper))
+        if unit != upper_unit:
+            raise PickError(f"Inconsistent units in {value}", cmp)
+
+        return self._filter_by_attribute(
+            mapping.attr_keys,
+            unit,
+            lower,
+            upper,
+            use_tolerance=mapping.attr_tolerance_key is not None,
+        )
+
     def filter_by_tolerance(self, tolerance: float) -> Self:
         assert self.Q
 
-        tol_int = int(math.floor(tolerance * 100))
-        return self.filter_by_description(f"±{tol_int}%")
+        tol = math.floor(tolerance * 100) / 100
+        return self._filter_by_attribute(["Tolerance"], "dimensionless", tol, tol)
+
+    def _check_tolerance(
+        self, value: Parameter, tolerance_requirement: float
+    ) -> Parameter:
+        cmp = value.get_parent_of_type(Module)
+        assert cmp
+        value = value.get_most_narrow()
+        if not isinstance(value, F.Range):
+            raise PickError(f"Can only pick ranges, not: {value}", cmp)
+        tol = value.as_center_tuple(relative=True)[1]
+        if tol < tolerance_requirement:  # type: ignore
+            raise PickError(
+                f"Tolerance not supported: {value}, "
+                f"expected at least {tolerance_requirement}, but is {tol}",
+                cmp,
+            )
+        return value
+
+    def _filter_by_attribute(
+        self,
+        names: list[str],
+        unit: str | None = None,
+        lower: float = -math.inf,
+        upper: float = math.inf,
+        use_tolerance: bool = False,
+    ) -> Self:
+        """
+        Filter by the parsed attribute values being within [lower, upper]
+        Bounds are in SI base units, see :func:`_attribute_rows`.
+        """
+        assert self.Q
+
+        db = JLCPCB_DB.get()
+        if db.indexed_attributes is None or not db.indexed_attributes.issuperset(names):
+            db.run(db.index_attributes(names))
+
+        query = Q(name__in=names)
+        if unit is not None:
+            query &= Q(unit=unit)
+        if use_tolerance:
+            query &= Q(tol_min__isnull=False)
+        # value_min is within any range the component fits in and is indexed
+        if lower > -math.inf:
+            query &= Q(value_min__gte=_widen(lower, -1))
+            if use_tolerance:
+                query &= Q(tol_min__gte=_widen(lower, -1))
+        if upper < math.inf:
+            query &= Q(value_min__lte=_widen(upper, 1))
+            if use_tolerance:
+                query &= Q(tol_max__lte=_widen(upper, 1))
+            else:
+                query &= Q(value_max__lte=_widen(upper, 1))
+
+        self.Q &= Q(lcsc__in=Subquery(ComponentAttribute.filter(query).values("lcsc")))
+        return self
 
     def filter_by_category(self, category: str, subcategory: str) -> Self:
         assert self.Q
-        category_ids = asyncio.run(Category().get_ids(category, subcategory))
+        category_ids = JLCPCB_DB.get().get_category_ids(category, subcategory)
         self.Q &= Q(category_id__in=category_ids)
         return self
 
@@ -513,7 +820,7 @@ class ComponentQuery:
         return out
 
     def sort_by_price(self, qty: int = 1) -> Self:
-        self.get().sort(key=lambda x: x.get_price(qty))
+        self.get_rows().sort(key=lambda x: x.get_price(qty))
         return self
 
     def filter_by_lcsc_pn(self, partnumber: str) -> Self:
@@ -523,8 +830,11 @@ class ComponentQuery:
 
     def filter_by_specified_parameters(self, mapping: list[MappingParameterDB]) -> Self:
         assert self.Q
+
         keys = [m.attr_keys for m in mapping]
 
+        # only checked on the rows selected by the indexed filters, a subquery on
+        # component_attributes would list every component with the attribute
         extra_query = Q()
         for kl in keys:
             sub_q = Q()
@@ -553,7 +863,7 @@ class ComponentQuery:
         assert self.Q
         if not manufacturer:
             return self
-        manufacturer_ids = asyncio.run(Manufacturers().get_ids(manufacturer))
+        manufacturer_ids = JLCPCB_DB.get().get_manufacturer_ids(manufacturer)
         self.Q &= Q(manufacturer_id__in=manufacturer_ids)
         return self
 
@@ -577,7 +887,7 @@ class ComponentQuery:
         :return: The first component that matches the parameters
         """
 
-        for c in self.get():
+        for c in self.get_rows():
             params = c.get_params(mapping)
 
             if not all(
@@ -608,7 +918,7 @@ class ComponentQuery:
                     f"{c.description:15},"
                 )
 
-            yield c
+            yield c.to_component()
 
     def filter_by_module_params_and_attach(
         self, module: Module, mapping: list[MappingParameterDB], qty: int = 1
@@ -688,6 +998,17 @@ class JLCPCB_DB:
         self.db_file = config.db_path / Path("cache.sqlite3")
         self.connected = False
         self.fresh_db = False
+        self.indexed_attributes: set[str] | None = None
+        # long-lived event loop for the ORM, keeps the connection open
+        self.loop = asyncio.new_event_loop()
+        # read-only connections of the fast path, one per thread
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        # in-memory copies of the small lookup tables, see load_tables
+        self._categories: dict[int, tuple[str, str]] | None = None
+        self._manufacturers: dict[int, str] | None = None
+        self._category_ids: dict[tuple[str, str], list[int]] = {}
+        self._manufacturer_ids: dict[str, list[int]] = {}
 
         no_download_prompt = config.no_download_prompt
 
@@ -711,11 +1032,115 @@ class JLCPCB_DB:
             else:
                 logger.warning("Continuing with outdated JLCPCB database")
 
-        asyncio.run(self._init_db())
+        self.run(self._init_db())
+        self.load_tables()
 
     def __del__(self):
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
         if self.connected:
-            asyncio.run(self._close_db())
+            self.run(self._close_db())
+        self.loop.close()
+
+    def run[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run a coroutine of the ORM on the event loop of the database
+        """
+        return self.loop.run_until_complete(coro)
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> list[sqlite3.Row]:
+        """
+        Execute a read-only query without the ORM
+        """
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                f"{self.db_file.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+            self._connections.append(connection)
+        return connection.execute(sql, params).fetchall()
+
+    def load_tables(self) -> None:
+        """
+        Load the categories and manufacturers tables into memory.
+        They are small and only change with a new download of the database.
+        """
+        self._categories = {
+            row["id"]: (row["category"], row["subcategory"])
+            for row in self.execute(
+                "SELECT id, category, subcategory FROM categories ORDER BY id"
+            )
+        }
+        self._manufacturers = {
+            row["id"]: row["name"]
+            for row in self.execute("SELECT id, name FROM manufacturers ORDER BY id")
+        }
+        self._category_ids.clear()
+        self._manufacturer_ids.clear()
+
+    def get_category_ids(self, category: str = "", subcategory: str = "") -> list[int]:
+        """
+        Get the category ids for the given category and subcategory
+
+        :param category: The category to search for, use "" for any
+        :param subcategory: The subcategory to search for, use "" for any
+
+        :return: A list of category ids for the JLCPCB database Component id field
+        """
+        if self._categories is None:
+            self.load_tables()
+            assert self._categories is not None
+
+        key = (category, subcategory)
+        if key not in self._category_ids:
+            category, subcategory = category.upper(), subcategory.upper()
+            self._category_ids[key] = [
+                id
+                for id, (c, s) in self._categories.items()
+                if category in c.upper() and subcategory in s.upper()
+            ]
+
+        category_ids = self._category_ids[key]
+        if len(category_ids) < 1:
+            raise LookupError(
+                f"Could not find a match for category {key[0]} "
+                f"and subcategory {key[1]}",
+            )
+        return category_ids
+
+    def get_manufacturer_ids(self, manufacturer: str) -> list[int]:
+        """
+        Get the manufacturer ids for the given manufacturer
+
+        :param manufacturer: The manufacturer to search for
+
+        :return: A list of manufacturer ids for the JLCPCB database Component id field
+        """
+        if self._manufacturers is None:
+            self.load_tables()
+            assert self._manufacturers is not None
+
+        if manufacturer not in self._manufacturer_ids:
+            name = manufacturer.upper()
+            self._manufacturer_ids[manufacturer] = [
+                id for id, n in self._manufacturers.items() if name in n.upper()
+            ]
+
+        manufacturer_ids = self._manufacturer_ids[manufacturer]
+        if len(manufacturer_ids) < 1:
+            raise LookupError(f"Could not find a match for manufacturer {manufacturer}")
+        return manufacturer_ids
+
+    def get_manufacturer_name(self, manufacturer_id: int) -> str:
+        if self._manufacturers is None:
+            self.load_tables()
+            assert self._manufacturers is not None
+        return self._manufacturers[manufacturer_id]
 
     async def _init_db(self):
         await Tortoise.init(
@@ -760,9 +1185,91 @@ class JLCPCB_DB:
         logger.info("Deleting out-of-stock components from DB")
         await Component.filter(stock__lt=1).delete()
 
+        logger.info("Parsing component attributes")
+        await self.index_attributes(INDEXED_ATTRIBUTES)
+
         logger.info("Vacuuming DB")
         await Tortoise.get_connection("default").execute_query("VACUUM;")
 
+    async def index_attributes(self, names: Iterable[str]):
+        """
+        Parse the given attributes of all components into the indexed
+        component_attributes table, if not done yet
+        """
+        conn = Tortoise.get_connection("default")
+
+        if self.indexed_attributes is None:
+            await conn.execute_script(
+                """
+                CREATE TABLE IF NOT EXISTS component_attributes (
+                    id INTEGER PRIMARY KEY,
+                    lcsc INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    unit TEXT NOT NULL,
+                    value_min REAL NOT NULL,
+                    value_max REAL NOT NULL,
+                    tol_min REAL,
+                    tol_max REAL
+                );
+                CREATE INDEX IF NOT EXISTS component_attributes_value
+                    ON component_attributes (name, unit, value_min);
+                CREATE TABLE IF NOT EXISTS component_attribute_names (
+                    name TEXT PRIMARY KEY
+                );
+                CREATE INDEX IF NOT EXISTS components_category_stock
+                    ON components (category_id, stock);
+                """
+            )
+            _, rows = await conn.execute_query(
+                "SELECT name FROM component_attribute_names"
+            )
+            self.indexed_attributes = {row[0] for row in rows}
+
+        missing = sorted(set(names) - self.indexed_attributes)
+        if not missing:
+            return
+
+        logger.info(f"Parsing component attributes {missing}")
+        batch_size = 50000
+        last_lcsc = -1
+        like = " OR ".join("extra LIKE ?" for _ in missing)
+        async with in_transaction() as tx:
+            while True:
+                _, rows = await tx.execute_query(
+                    f"SELECT lcsc, extra FROM components WHERE lcsc > ? AND ({like})"
+                    " ORDER BY lcsc LIMIT ?",
+                    [last_lcsc, *(f'%"{name}"%' for name in missing), batch_size],
+                )
+                if not rows:
+                    break
+                last_lcsc = rows[-1][0]
+                values = [
+                    list(row)
+                    for lcsc, extra in rows
+                    for row in _attribute_rows(
+                        lcsc,
+                        try_or(
+                            lambda: json.loads(extra).get("attributes", {}),
+                            default={},
+                        ),
+                        missing,
+                    )
+                ]
+                if values:
+                    await tx.execute_many(
+                        "INSERT INTO component_attributes (lcsc, name, unit, "
+                        "value_min, value_max, tol_min, tol_max) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        values,
+                    )
+            await tx.execute_many(
+                "INSERT OR IGNORE INTO component_attribute_names (name) VALUES (?)",
+                [[name] for name in missing],
+            )
+        # statistics for the query planner to prefer the attribute ranges
+        await conn.execute_script("ANALYZE;")
+        self.indexed_attributes.update(missing)
+
     def download(
         self,
     ):
@@ -834,3 +1341,6 @@ class JLCPCB_DB:
             os.remove(volume_file)
 
         self.fresh_db = True
+        # reloaded from the new database on the next lookup
+        self._categories = None
+        self._manufacturers = None
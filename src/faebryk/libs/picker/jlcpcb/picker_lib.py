@@ -1,11 +1,11 @@
 import logging
+from collections import defaultdict
 from enum import Enum
-from typing import Callable
+from typing import Any, Callable, ContextManager, Iterable
 
 import faebryk.library._F as F
 from faebryk.core.module import Module
 from faebryk.core.parameter import Parameter
-from faebryk.libs.e_series import E_SERIES_VALUES
 from faebryk.libs.picker.jlcpcb.jlcpcb import (
     Component,
     ComponentQuery,
@@ -14,9 +14,14 @@ from faebryk.libs.picker.jlcpcb.jlcpcb import (
 from faebryk.libs.picker.picker import (
     DescriptiveProperties,
     PickError,
+    has_part_picked,
+)
+from faebryk.libs.util import (
+    KeyErrorAmbiguous,
+    KeyErrorNotFound,
+    cast_assert,
+    find,
 )
-from faebryk.libs.picker.util import generate_si_values
-from faebryk.libs.util import KeyErrorAmbiguous, KeyErrorNotFound, cast_assert
 
 logger = logging.getLogger(__name__)
 
@@ -240,6 +245,12 @@ def try_get_param_mapping(module: Module) -> list[MappingParameterDB]:
     return _MAPPINGS_BY_TYPE.get(type(module), [])
 
 
+def get_mapping(
+    mapping: list[MappingParameterDB], param_name: str
+) -> MappingParameterDB:
+    return find(mapping, lambda m: m.param_name == param_name)
+
+
 # Generic pickers ----------------------------------------------------------------------
 
 
@@ -371,202 +382,222 @@ def find_and_attach_by_mfr(module: Module):
 # Type specific pickers ----------------------------------------------------------------
 
 
-def find_resistor(cmp: Module):
-    """
-    Find a resistor part in the JLCPCB database that matches the parameters of the
-    provided resistor
-    """
+def query_resistor(cmp: Module) -> ComponentQuery:
     assert isinstance(cmp, F.Resistor)
     mapping = _MAPPINGS_BY_TYPE[F.Resistor]
 
-    (
+    return (
         ComponentQuery()
         .filter_by_category("Resistors", "Chip Resistor - Surface Mount")
         .filter_by_stock(qty)
-        .filter_by_si_values(
+        .filter_by_value(
             cmp.resistance,
-            generate_si_values(cmp.resistance, "Ω", E_SERIES_VALUES.E96),
+            get_mapping(mapping, "resistance"),
             tolerance_requirement=0.01,
         )
         .filter_by_traits(cmp)
         .filter_by_specified_parameters(mapping)
-        .sort_by_price(qty)
-        .filter_by_module_params_and_attach(cmp, mapping, qty)
     )
 
 
-def find_capacitor(cmp: Module):
-    """
-    Find a capacitor part in the JLCPCB database that matches the parameters of the
-    provided capacitor
-    """
-
+def query_capacitor(cmp: Module) -> ComponentQuery:
     assert isinstance(cmp, F.Capacitor)
     mapping = _MAPPINGS_BY_TYPE[F.Capacitor]
 
     # TODO: add support for electrolytic capacitors.
-    (
+    return (
         ComponentQuery()
         .filter_by_category(
             "Capacitors", "Multilayer Ceramic Capacitors MLCC - SMD/SMT"
         )
         .filter_by_stock(qty)
-        .filter_by_si_values(
+        .filter_by_value(
             cmp.capacitance,
-            generate_si_values(cmp.capacitance, "F", E_SERIES_VALUES.E24),
+            get_mapping(mapping, "capacitance"),
             tolerance_requirement=0.05,
         )
         .filter_by_traits(cmp)
         .filter_by_specified_parameters(mapping)
-        .sort_by_price(qty)
-        .filter_by_module_params_and_attach(cmp, mapping, qty)
     )
 
 
-def find_inductor(cmp: Module):
-    """
-    Find an inductor part in the JLCPCB database that matches the parameters of the
-    provided inductor.
-
-    Note: When the "self_resonant_frequency" parameter is not ANY, only inductors
-    from the HF and SMD categories are used.
-    """
-
+def query_inductor(cmp: Module) -> ComponentQuery:
     assert isinstance(cmp, F.Inductor)
     mapping = _MAPPINGS_BY_TYPE[F.Inductor]
 
-    (
+    return (
         ComponentQuery()
         # Get Inductors (SMD), Power Inductors, TH Inductors, HF Inductors,
         # Adjustable Inductors. HF and Adjustable are basically empty.
         .filter_by_category("Inductors", "Inductors")
         .filter_by_stock(qty)
         .filter_by_traits(cmp)
-        .filter_by_si_values(
+        .filter_by_value(
             cmp.inductance,
-            generate_si_values(cmp.inductance, "H", E_SERIES_VALUES.E24),
+            get_mapping(mapping, "inductance"),
             tolerance_requirement=0.05,
         )
         .filter_by_specified_parameters(mapping)
-        .sort_by_price(qty)
-        .filter_by_module_params_and_attach(cmp, mapping, qty)
     )
 
 
-def find_tvs(cmp: Module):
-    """
-    Find a TVS diode part in the JLCPCB database that matches the parameters of the
-    provided diode
-    """
-
+def query_tvs(cmp: Module) -> ComponentQuery:
     assert isinstance(cmp, F.TVS)
 
     # TODO: handle bidirectional TVS diodes
     # "Bidirectional Channels": "1" in extra['attributes']
 
-    mapping = _MAPPINGS_BY_TYPE[F.TVS]
-
-    (
+    return (
         ComponentQuery()
         .filter_by_category("", "TVS")
         .filter_by_stock(qty)
         .filter_by_traits(cmp)
-        .filter_by_specified_parameters(mapping)
-        .sort_by_price(qty)
-        .filter_by_module_params_and_attach(cmp, mapping, qty)
+        .filter_by_specified_parameters(_MAPPINGS_BY_TYPE[F.TVS])
     )
 
 
-def find_diode(cmp: Module):
-    """
-    Find a diode part in the JLCPCB database that matches the parameters of the
-    provided diode
-    """
-
+def query_diode(cmp: Module) -> ComponentQuery:
     assert isinstance(cmp, F.Diode)
-
     mapping = _MAPPINGS_BY_TYPE[F.Diode]
 
-    (
+    return (
         ComponentQuery()
         .filter_by_category("Diodes", "")
         .filter_by_stock(qty)
-        .filter_by_si_values(
-            cmp.max_current,
-            generate_si_values(cmp.max_current, "A", E_SERIES_VALUES.E3),
-        )
-        .filter_by_si_values(
+        .filter_by_value(cmp.max_current, get_mapping(mapping, "max_current"))
+        .filter_by_value(
             cmp.reverse_working_voltage,
-            generate_si_values(cmp.reverse_working_voltage, "V", E_SERIES_VALUES.E3),
+            get_mapping(mapping, "reverse_working_voltage"),
         )
         .filter_by_traits(cmp)
         .filter_by_specified_parameters(mapping)
-        .sort_by_price(qty)
-        .filter_by_module_params_and_attach(cmp, mapping, qty)
     )
 
 
-def find_led(cmp: Module):
-    """
-    Find a LED part in the JLCPCB database that matches the parameters of the
-    provided LED
-    """
-
+def query_led(cmp: Module) -> ComponentQuery:
     assert isinstance(cmp, F.LED)
-    mapping = _MAPPINGS_BY_TYPE[F.LED]
 
-    (
+    return (
         ComponentQuery()
         .filter_by_category("", "Light Emitting Diodes (LED)")
         .filter_by_stock(qty)
         .filter_by_traits(cmp)
-        .filter_by_specified_parameters(mapping)
+        .filter_by_specified_parameters(_MAPPINGS_BY_TYPE[F.LED])
         .filter_by_attribute_mention(list(enum_to_str(cmp.color, force=False)))
-        .sort_by_price(qty)
-        .filter_by_module_params_and_attach(cmp, mapping, qty)
     )
 
 
-def find_mosfet(cmp: Module):
-    """
-    Find a MOSFET part in the JLCPCB database that matches the parameters of the
-    provided MOSFET
-    """
-
+def query_mosfet(cmp: Module) -> ComponentQuery:
     assert isinstance(cmp, F.MOSFET)
-    mapping = _MAPPINGS_BY_TYPE[F.MOSFET]
 
-    (
+    return (
         ComponentQuery()
         .filter_by_category("", "MOSFET")
         .filter_by_stock(qty)
         .filter_by_traits(cmp)
-        .filter_by_specified_parameters(mapping)
-        .sort_by_price(qty)
-        .filter_by_module_params_and_attach(cmp, mapping, qty)
+        .filter_by_specified_parameters(_MAPPINGS_BY_TYPE[F.MOSFET])
     )
 
 
-def find_ldo(cmp: Module):
-    """
-    Find a LDO part in the JLCPCB database that matches the parameters of the
-    provided LDO
-    """
-
+def query_ldo(cmp: Module) -> ComponentQuery:
     assert isinstance(cmp, F.LDO)
-    mapping = _MAPPINGS_BY_TYPE[F.LDO]
 
-    (
+    return (
         ComponentQuery()
         .filter_by_category("", "LDO")
         .filter_by_stock(qty)
         .filter_by_traits(cmp)
-        .filter_by_specified_parameters(mapping)
+        .filter_by_specified_parameters(_MAPPINGS_BY_TYPE[F.LDO])
+    )
+
+
+TYPE_SPECIFIC_QUERIES: dict[type[Module], Callable[[Module], ComponentQuery]] = {
+    F.Resistor: query_resistor,
+    F.Capacitor: query_capacitor,
+    F.Inductor: query_inductor,
+    F.TVS: query_tvs,
+    F.LED: query_led,
+    F.Diode: query_diode,
+    F.MOSFET: query_mosfet,
+    F.LDO: query_ldo,
+}
+
+
+def _find_and_attach_by_query(cmp: Module, module_type: type[Module]):
+    (
+        TYPE_SPECIFIC_QUERIES[module_type](cmp)
         .sort_by_price(qty)
-        .filter_by_module_params_and_attach(cmp, mapping, qty)
+        .filter_by_module_params_and_attach(cmp, _MAPPINGS_BY_TYPE[module_type], qty)
     )
 
 
+def find_resistor(cmp: Module):
+    """
+    Find a resistor part in the JLCPCB database that matches the parameters of the
+    provided resistor
+    """
+    _find_and_attach_by_query(cmp, F.Resistor)
+
+
+def find_capacitor(cmp: Module):
+    """
+    Find a capacitor part in the JLCPCB database that matches the parameters of the
+    provided capacitor
+    """
+    _find_and_attach_by_query(cmp, F.Capacitor)
+
+
+def find_inductor(cmp: Module):
+    """
+    Find an inductor part in the JLCPCB database that matches the parameters of the
+    provided inductor.
+
+    Note: When the "self_resonant_frequency" parameter is not ANY, only inductors
+    from the HF and SMD categories are used.
+    """
+    _find_and_attach_by_query(cmp, F.Inductor)
+
+
+def find_tvs(cmp: Module):
+    """
+    Find a TVS diode part in the JLCPCB database that matches the parameters of the
+    provided diode
+    """
+    _find_and_attach_by_query(cmp, F.TVS)
+
+
+def find_diode(cmp: Module):
+    """
+    Find a diode part in the JLCPCB database that matches the parameters of the
+    provided diode
+    """
+    _find_and_attach_by_query(cmp, F.Diode)
+
+
+def find_led(cmp: Module):
+    """
+    Find a LED part in the JLCPCB database that matches the parameters of the
+    provided LED
+    """
+    _find_and_attach_by_query(cmp, F.LED)
+
+
+def find_mosfet(cmp: Module):
+    """
+    Find a MOSFET part in the JLCPCB database that matches the parameters of the
+    provided MOSFET
+    """
+    _find_and_attach_by_query(cmp, F.MOSFET)
+
+
+def find_ldo(cmp: Module):
+    """
+    Find a LDO part in the JLCPCB database that matches the parameters of the
+    provided LDO
+    """
+    _find_and_attach_by_query(cmp, F.LDO)
+
+
 # --------------------------------------------------------------------------------------
 
 TYPE_SPECIFIC_LOOKUP = {
@@ -579,3 +610,29 @@ TYPE_SPECIFIC_LOOKUP = {
     F.MOSFET: find_mosfet,
     F.LDO: find_ldo,
 }
+
+
+def prefetch_candidates(
+    pickers: Iterable[tuple[Module, Callable[[Module], Any]]],
+) -> ContextManager[None]:
+    """
+    Query the candidates of many type specific picks at once, with one combined
+    query per module type. See :meth:`ComponentQuery.prefetch`.
+
+    :param pickers: modules and the find function that is going to pick them
+    """
+    module_types = {v: k for k, v in TYPE_SPECIFIC_LOOKUP.items()}
+
+    queries: dict[type[Module], list[ComponentQuery]] = defaultdict(list)
+    for module, finder in pickers:
+        if finder not in module_types or module.has_trait(has_part_picked):
+            continue
+        module_type = module_types[finder]
+        try:
+            queries[module_type].append(TYPE_SPECIFIC_QUERIES[module_type](module))
+        except Exception:
+            # reported by the actual pick, if it ever gets to run
+            logger.debug(f"Not prefetching {module}", exc_info=True)
+            continue
+
+    return ComponentQuery.prefetch(*queries.values())
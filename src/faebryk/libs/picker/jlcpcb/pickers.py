@@ -1,4 +1,5 @@
 import logging
+from typing import ContextManager, Self
 
 import faebryk.library._F as F
 import faebryk.libs.picker.jlcpcb.picker_lib as P
@@ -19,6 +20,10 @@ class JLCPCBPicker(F.has_multi_picker.FunctionPicker):
         except ComponentQuery.Error as e:
             raise PickError(e.args[0], module) from e
 
+    @classmethod
+    def prefetch(cls, pickers: list[tuple[Module, Self]]) -> ContextManager:
+        return P.prefetch_candidates((m, picker.picker) for m, picker in pickers)
+
 
 class StaticJLCPCBPartPicker(StaticPartPicker):
     """
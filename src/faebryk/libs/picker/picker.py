@@ -4,7 +4,8 @@
 import logging
 import pprint
 from abc import ABC, abstractmethod
-from contextlib import contextmanager
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager, nullcontext
 from dataclasses import dataclass
 from enum import StrEnum
 from textwrap import indent
@@ -222,11 +223,39 @@ class PickerProgress:
             yield self
 
 
+@contextmanager
+def prefetch_parts(module: Module):
+    """
+    Let the pickers of all unpicked modules below module prepare their picks in
+    bulk, grouped by picker type. See :meth:`F.has_multi_picker.Picker.prefetch`.
+    Only the highest priority picker of each module prepares, the others might
+    never run (e.g. if the part is already cached).
+    """
+    pickers: dict[type[F.has_multi_picker.Picker], list] = defaultdict(list)
+    for m in module.get_children_modules(types=Module, include_root=True):
+        if m.has_trait(has_part_picked) or not m.has_trait(F.has_picker):
+            continue
+        multi_picker = m.get_trait(F.has_picker)
+        if not isinstance(multi_picker, F.has_multi_picker):
+            continue
+        _, picker = multi_picker.pickers[0]
+        pickers[type(picker)].append((m, picker))
+
+    with ExitStack() as stack:
+        for picker_type, group in pickers.items():
+            stack.enter_context(picker_type.prefetch(group))
+        yield
+
+
 # TODO should be a Picker
-def pick_part_recursively(module: Module):
+def pick_part_recursively(module: Module, prefetch: bool = True):
+    """
+    :param prefetch: let pickers prepare for all modules at once before picking,
+        e.g. by querying candidates in bulk
+    """
     pp = PickerProgress.from_module(module)
     try:
-        with pp.context():
+        with pp.context(), prefetch_parts(module) if prefetch else nullcontext():
             _pick_part_recursively(module, pp)
     except PickErrorChildren as e:
         failed_parts = e.get_all_children()
@@ -1,19 +1,30 @@
 # This file is part of the faebryk project
 # SPDX-License-Identifier: MIT
 
-import faebryk.library._F as F
+from functools import lru_cache
+
 from faebryk.core.module import Module
 from faebryk.core.parameter import Parameter
-from faebryk.library.Set import Set
 from faebryk.libs.e_series import (
     E_SERIES,
+    E_SERIES_RANGE,
     E_SERIES_VALUES,
     ParamNotResolvedError,
-    e_series_intersect,
+    e_series_range,
+    e_series_range_values,
 )
 from faebryk.libs.picker.picker import PickError
 from faebryk.libs.units import to_si_str
-from faebryk.libs.util import cast_assert
+
+
+@lru_cache(maxsize=1024)
+def _si_values(
+    value_range: E_SERIES_RANGE, e_series: frozenset[float], si_unit: str
+) -> tuple[str, ...]:
+    return tuple(
+        to_si_str(v, si_unit).replace("µ", "u").replace("inf", "∞")
+        for v in e_series_range_values(value_range, e_series)
+    )
 
 
 def generate_si_values(
@@ -29,15 +40,10 @@ def generate_si_values(
     value = value.get_most_narrow()
 
     try:
-        intersection = Set(
-            [e_series_intersect(value, e_series or E_SERIES_VALUES.E_ALL)]
-        ).params
+        value_range = e_series_range(value)
     except ParamNotResolvedError as e:
         raise PickError(f"Could not resolve {value} in {e_series}", module) from e
 
-    return [
-        to_si_str(cast_assert(F.Constant, r).value, si_unit)
-        .replace("µ", "u")
-        .replace("inf", "∞")
-        for r in intersection
-    ]
+    return list(
+        _si_values(value_range, frozenset(e_series or E_SERIES_VALUES.E_ALL), si_unit)
+    )
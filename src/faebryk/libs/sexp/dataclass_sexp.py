@@ -4,13 +4,12 @@ from enum import Enum, IntEnum, StrEnum
 from os import PathLike
 from pathlib import Path
 from types import UnionType
-from typing import Any, Callable, Iterator, Union, get_args, get_origin
+from typing import Any, Callable, Iterator, TextIO, Union, get_args, get_origin
 
-import sexpdata
 from sexpdata import Symbol
 
-from faebryk.libs.sexp.util import prettify_sexp_string
-from faebryk.libs.util import cast_assert, duplicates, groupby, zip_non_locked
+from faebryk.libs.sexp import parser, writer
+from faebryk.libs.util import atomic_write, cast_assert, duplicates
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +38,9 @@ class sexp_field(dict[str, Any]):
     :param int order: Order of the field in the sexp, lower is first,
     can be less than 0. Only used if not positional.
     :param Callable[[Any], Any] | None preprocessor: Run before conversion
+    :param bool lazy: If True, the multidict is only decoded on first access and
+    re-emitted verbatim if never accessed. The dataclass has to inherit from
+    SEXP_Lazy.
     """
 
     positional: bool = False
@@ -47,20 +49,27 @@ class sexp_field(dict[str, Any]):
     assert_value: Any | None = None
     order: int = 0
     preprocessor: Callable[[Any], Any] | None = None
+    lazy: bool = False
 
     def __post_init__(self):
         super().__init__({"metadata": {"sexp": self}})
 
         assert not (self.positional and self.multidict)
+        assert (not self.lazy) or self.multidict, "Lazy only supported for multidict"
         assert (self.key is None) or self.multidict, "Key only supported for multidict"
 
     @classmethod
     def from_field(cls, f: Field):
-        out = f.metadata.get("sexp", cls())
+        out = f.metadata.get("sexp")
+        if out is None:
+            return _DEFAULT_SEXP_FIELD
         assert isinstance(out, cls)
         return out
 
 
+_DEFAULT_SEXP_FIELD = sexp_field()
+
+
 class SymEnum(StrEnum): ...
 
 
@@ -74,53 +83,76 @@ def _prettify_stack(stack: list[tuple[str, type]] | None) -> str:
     return ".".join(s[0] for s in stack)
 
 
-def _convert(
-    val,
-    t,
-    stack: list[tuple[str, type]] | None = None,
-    name: str | None = None,
-    sp: sexp_field | None = None,
-):
-    if name is None:
-        name = "<" + t.__name__ + ">"
-    if stack is None:
-        stack = []
-    substack = stack + [(name, t)]
+# Decoding -----------------------------------------------------------------------------
+
+type _Stack = list[tuple[str, type]]
+type _Converter = Callable[[Any, _Stack], Any]
+
+_YES = Symbol("yes")
+_NO = Symbol("no")
+_EMPTY_SYMBOL = Symbol("")
+
+_converters: dict[Any, _Converter] = {}
 
+
+def _get_converter(t) -> _Converter:
+    """
+    Converter for values of type t, compiled once per type
+    """
     try:
-        # Run preprocessor, if it exists
-        if sp and sp.preprocessor:
-            val = sp.preprocessor(val)
+        return _converters[t]
+    except KeyError:
+        pass
+    converter = _converters[t] = _compile_converter(t)
+    return converter
+
+
+def _compile_converter(t) -> _Converter:
+    # Recurse (GenericAlias e.g list[])
+    if (origin := get_origin(t)) is not None:
+        args = get_args(t)
+        if origin is list:
+            (arg,) = args
+
+            def _list(val, stack):
+                return [_convert(_val, arg, stack) for _val in val]
+
+            return _list
+        if origin is tuple:
+
+            def _tuple(val, stack):
+                return tuple(_convert(_val, _t, stack) for _val, _t in zip(val, args))
+
+            return _tuple
+        if origin in (Union, UnionType) and len(args) == 2 and args[1] is type(None):
+            arg = args[0]
+
+            def _optional(val, stack):
+                return _convert(val, arg, stack) if val is not None else None
 
-        # Recurse (GenericAlias e.g list[])
-        if (origin := get_origin(t)) is not None:
-            args = get_args(t)
-            if origin is list:
-                return [_convert(_val, args[0], substack) for _val in val]
-            if origin is tuple:
-                return tuple(
-                    _convert(_val, _t, substack) for _val, _t in zip(val, args)
-                )
-            if (
-                origin in (Union, UnionType)
-                and len(args) == 2
-                and args[1] is type(None)
-            ):
-                return _convert(val, args[0], substack) if val is not None else None
+            return _optional
 
+        def _not_supported(val, stack):
             raise NotImplementedError(f"{origin} not supported")
 
-        #
-        if is_dataclass(t):
-            return _decode(val, t, substack)
+        return _not_supported
 
-        # Primitive
+    #
+    if is_dataclass(t):
 
-        # Unpack list if single atom
-        if isinstance(val, list) and len(val) == 1 and not isinstance(val[0], list):
-            val = val[0]
+        def _dataclass(val, stack):
+            return _decode(val, t, stack)
+
+        return _dataclass
+
+    # Primitive
+    if issubclass(t, bool):
+
+        def _bool(val, stack):
+            # Unpack list if single atom
+            if isinstance(val, list) and len(val) == 1 and not isinstance(val[0], list):
+                val = val[0]
 
-        if issubclass(t, bool):
             # See parseMaybeAbsentBool in kicad
             # Default: (hide) hide None
             # True: (hide yes)
@@ -129,8 +161,8 @@ def _convert(
             # hide, None -> automatically filtered
 
             # (hide yes) (hide no)
-            if val in [Symbol("yes"), Symbol("no")]:
-                return val == Symbol("yes")
+            if val == _YES or val == _NO:
+                return val == _YES
 
             # (hide)
             if val == []:
@@ -138,26 +170,156 @@ def _convert(
 
             raise ValueError(f"Invalid value for bool: {val}")
 
+        return _bool
+
+    def _primitive(val, stack):
+        # Unpack list if single atom
+        if isinstance(val, list) and len(val) == 1 and not isinstance(val[0], list):
+            val = val[0]
+
         if isinstance(val, Symbol):
             return t(str(val))
 
         return t(val)
+
+    return _primitive
+
+
+def _convert(
+    val,
+    t,
+    stack: _Stack | None = None,
+    name: str | None = None,
+    sp: sexp_field | None = None,
+):
+    if name is None:
+        name = "<" + t.__name__ + ">"
+    if stack is None:
+        stack = []
+    # shared by the whole decode, only copied for error messages
+    stack.append((name, t))
+
+    try:
+        # Run preprocessor, if it exists
+        if sp and sp.preprocessor:
+            val = sp.preprocessor(val)
+
+        return _get_converter(t)(val, stack)
     except DecodeError:
         raise
     except Exception as e:
         raise DecodeError(
-            f"Failed to decode {_prettify_stack(substack)} ({t}) with {val} "
+            f"Failed to decode {_prettify_stack(stack)} ({t}) with {val} "
         ) from e
+    finally:
+        stack.pop()
 
 
 netlist_obj = str | Symbol | int | float | bool | list
 netlist_type = list[netlist_obj]
 
 
+def _may_hold_dataclass(t) -> bool:
+    if is_dataclass(t):
+        return True
+    if (origin := get_origin(t)) is not None:
+        return any(_may_hold_dataclass(arg) for arg in get_args(t)) or (
+            origin not in (list, tuple, dict, Union, UnionType)
+        )
+    return not (isinstance(t, type) and issubclass(t, (str, int, float, Enum)))
+
+
+@dataclass
+class _FieldPlan:
+    field: Field
+    sp: sexp_field
+    origin: Any
+    args: tuple
+    # missing multidict without default, see _decode
+    init_empty: bool
+    # missing positional empty StrEnum, see _decode
+    empty_str_enum: bool
+    may_hold_dataclass: bool
+    lazy: bool
+
+    @classmethod
+    def compile(cls, f: Field) -> "_FieldPlan":
+        sp = sexp_field.from_field(f)
+        return cls(
+            field=f,
+            sp=sp,
+            origin=get_origin(f.type),
+            args=get_args(f.type),
+            init_empty=sp.multidict and not (f.default_factory or f.default),
+            empty_str_enum=isinstance(f.type, type)
+            and issubclass(f.type, StrEnum)
+            and "" in f.type,
+            may_hold_dataclass=_may_hold_dataclass(f.type),
+            lazy=sp.lazy,
+        )
+
+
+@dataclass
+class _DecodePlan:
+    """
+    Everything _decode needs to know about a dataclass type, compiled once per type
+    """
+
+    fields: tuple[Field, ...]
+    key_fields: dict[str, _FieldPlan]
+    positional_fields: list[_FieldPlan]
+    # sexp key -> name of key field, (pad ...) is collected into pads
+    keys: dict[Symbol, str]
+    asserts: list[tuple[str, Any]]
+    parent_fields: list[str]
+
+    @classmethod
+    def compile(cls, t: type) -> "_DecodePlan":
+        fs = fields(t)
+        plans = [_FieldPlan.compile(f) for f in fs]
+        if any(p.lazy for p in plans) and not issubclass(t, SEXP_Lazy):
+            raise TypeError(f"{t} has lazy fields but is not a SEXP_Lazy")
+        key_fields = {p.field.name: p for p in plans if not p.sp.positional}
+
+        keys = {Symbol(name): name for name in key_fields}
+        keys.update(
+            {
+                Symbol(name.removesuffix("s")): name
+                for name in key_fields
+                if name.endswith("s")
+            }
+        )
+
+        return cls(
+            fields=fs,
+            key_fields=key_fields,
+            positional_fields=[p for p in plans if p.sp.positional],
+            keys=keys,
+            asserts=[
+                (p.field.name, p.sp.assert_value)
+                for p in plans
+                if p.sp.assert_value is not None
+            ],
+            parent_fields=[p.field.name for p in plans if p.may_hold_dataclass],
+        )
+
+
+_decode_plans: dict[type, _DecodePlan] = {}
+
+
+def _get_decode_plan(t: type) -> _DecodePlan:
+    try:
+        return _decode_plans[t]
+    except KeyError:
+        pass
+    plan = _decode_plans[t] = _DecodePlan.compile(t)
+    return plan
+
+
 def _decode[T](
     sexp: netlist_type,
     t: type[T],
-    stack: list[tuple[str, type]] | None = None,
+    stack: _Stack | None = None,
 ) -> T:
     if logger.isEnabledFor(logging.DEBUG):
         logger.debug(f"parse into: {t.__name__} {'-'*40}")
@@ -168,196 +330,279 @@ def _decode[T](
         # is_dataclass(t) trips mypy
         raise TypeError(f"{t} is not a dataclass type")
 
+    if stack is None:
+        stack = []
+
     value_dict = {}
 
     # Fields
-    fs = fields(t)
-    key_fields = {f.name: f for f in fs if not sexp_field.from_field(f).positional}
-    positional_fields = {
-        i: f for i, f in enumerate(fs) if sexp_field.from_field(f).positional
-    }
+    plan = _get_decode_plan(t)
+    key_fields = plan.key_fields
+    keys = plan.keys
 
     # Values
-    unprocessed_indices = set()
-    ungrouped_key_values = []
-    # I'd prefer to do this through a filter/comprehension, but I don't see a good way
-    for i, val in enumerate(sexp):
+    key_values: dict[str, list] = {}
+    pos_values = []
+    unprocessed_values = []
+    for val in sexp:
         if isinstance(val, list):
-            if len(val):
-                if isinstance(key := val[0], Symbol):
-                    if str(key) + "s" in key_fields or str(key) in key_fields:
-                        ungrouped_key_values.append(val)
-                        continue
-
-        unprocessed_indices.add(i)
-
-    key_values = groupby(
-        ungrouped_key_values,
-        lambda val: (
-            str(val[0]) + "s" if str(val[0]) + "s" in key_fields else str(val[0])
-        ),
-    )
-    pos_values = {
-        i: val
-        for i, val in enumerate(sexp)
-        if isinstance(val, (str, int, float, Symbol, bool))
-        or (isinstance(val, list) and (not len(val) or not isinstance(val[0], Symbol)))
-        # and i in positional_fields
-        # and positional_fields[i].name not in value_dict
-    }
-    unprocessed_indices = unprocessed_indices - set(pos_values.keys())
+            if len(val) and isinstance(key := val[0], Symbol):
+                if (s_name := keys.get(key)) is not None:
+                    if s_name in key_values:
+                        key_values[s_name].append(val)
+                    else:
+                        key_values[s_name] = [val]
+                else:
+                    unprocessed_values.append(val)
+                continue
+        elif not isinstance(val, (str, int, float, Symbol, bool)):
+            unprocessed_values.append(val)
+            continue
+        pos_values.append(val)
 
     if logger.isEnabledFor(logging.DEBUG):
         logger.debug(f"processing: {_prettify_stack(stack)}")
         logger.debug(f"key_fields: {list(key_fields.keys())}")
         logger.debug(
-            f"positional_fields: {list(f.name for f in positional_fields.values())}"
+            f"positional_fields: {[p.field.name for p in plan.positional_fields]}"
         )
         logger.debug(f"key_values: {list(key_values.keys())}")
         logger.debug(f"pos_values: {pos_values}")
-
-    if len(unprocessed_indices):
-        unprocessed_values = [sexp[i] for i in unprocessed_indices]
         # This is separate from the above loop to make it easier to debug during dev
-        if logger.isEnabledFor(logging.DEBUG):
+        if unprocessed_values:
             logger.debug(f"unprocessed values: {unprocessed_values}")
 
     # Parse --------------------------------------------------------------
 
     # Key-Value
-    for s_name, f in key_fields.items():
-        name = f.name
-        sp = sexp_field.from_field(f)
+    lazy_values: dict[str, list] = {}
+    for s_name, p in key_fields.items():
         if s_name not in key_values:
-            if sp.multidict and not (f.default_factory or f.default):
-                base_type = get_origin(f.type) or f.type
-                value_dict[name] = base_type()
+            if p.init_empty:
+                base_type = p.origin or p.field.type
+                value_dict[p.field.name] = base_type()
             # will be automatically filled by factory
             continue
 
         values = key_values[s_name]
-        if sp.multidict:
-            origin = get_origin(f.type)
-            args = get_args(f.type)
-            if origin is list:
-                val_t = args[0]
-                value_dict[name] = [
-                    _convert(_val[1:], val_t, stack, name, sp) for _val in values
-                ]
-            elif origin is dict:
-                if not sp.key:
-                    raise ValueError(f"Key function required for multidict: {f.name}")
-                key_t = args[0]
-                val_t = args[1]
-                converted_values = [
-                    _convert(_val[1:], val_t, stack, name, sp) for _val in values
-                ]
-                values_with_key = [(sp.key(_val), _val) for _val in converted_values]
-
-                if not all(isinstance(k, key_t) for k, _ in values_with_key):
-                    raise KeyError(
-                        f"Key function returned invalid type in field {f.name}:"
-                        f" {key_t=} types={[v[0] for v in values_with_key]}"
-                    )
-                if d := duplicates(values_with_key, key=lambda v: v[0]):
-                    raise ValueError(f"Duplicate keys: {d}")
-                value_dict[name] = dict(values_with_key)
-            else:
-                raise NotImplementedError(
-                    f"Multidict not supported for {origin} in field {f}"
-                )
-        else:
-            assert len(values) == 1, f"Duplicate key: {name}"
-            out = _convert(values[0][1:], f.type, stack, name, sp)
-            # if val is None, use default
-            if out is not None:
-                value_dict[name] = out
+        if p.lazy:
+            lazy_values[p.field.name] = values
+            continue
+        out = _decode_key_field(p, values, stack)
+        # if val is None, use default
+        if out is not None:
+            value_dict[p.field.name] = out
 
     # Positional
-    for f, v in (it := zip_non_locked(positional_fields.values(), pos_values.values())):
-        sp = sexp_field.from_field(f)
+    positional_fields = plan.positional_fields
+    i_field = i_val = 0
+    while i_field < len(positional_fields) and i_val < len(pos_values):
+        p = positional_fields[i_field]
+        f = p.field
+        v = pos_values[i_val]
+        i_field += 1
+
         # special case for missing positional empty StrEnum fields
-        if isinstance(f.type, type) and issubclass(f.type, StrEnum):
-            if "" in f.type and not isinstance(v, Symbol):
-                value_dict[f.name] = _convert(Symbol(""), f.type, stack, f.name, sp)
-                # only advance field iterator
-                # if no more positional fields, there shouldn't be any more values
-                if it.next(0) is None:
-                    raise ValueError(f"Unexpected symbol {v}")
-                continue
+        if p.empty_str_enum and not isinstance(v, Symbol):
+            value_dict[f.name] = _convert(_EMPTY_SYMBOL, f.type, stack, f.name, p.sp)
+            # only advance to the next field
+            # if no more positional fields, there shouldn't be any more values
+            if i_field >= len(positional_fields):
+                raise ValueError(f"Unexpected symbol {v}")
+            continue
 
         # positional list = var args
-        origin = get_origin(f.type)
-        if origin is list:
-            vs = []
-            next_val = v
+        if p.origin is list:
             # consume all values
-            while next_val is not None:
-                vs.append(next_val)
-                next_val = it.next(1, None)
-            out = _convert(vs, f.type, stack, f.name, sp)
+            out = _convert(pos_values[i_val:], f.type, stack, f.name, p.sp)
+            i_val = len(pos_values)
         else:
-            out = _convert(v, f.type, stack, f.name, sp)
+            out = _convert(v, f.type, stack, f.name, p.sp)
+            i_val += 1
 
         value_dict[f.name] = out
 
     # Check assertions ----------------------------------------------------
-    for f in fs:
-        sp = sexp_field.from_field(f)
-        if sp.assert_value is not None:
-            assert value_dict[f.name] == sp.assert_value, (
-                f"Fileformat assertion! {f.name} has to be"
-                f" {sp.assert_value} but is {value_dict[f.name]}"
-            )
+    for name, assert_value in plan.asserts:
+        assert value_dict[name] == assert_value, (
+            f"Fileformat assertion! {name} has to be"
+            f" {assert_value} but is {value_dict[name]}"
+        )
 
     if logger.isEnabledFor(logging.DEBUG):
         logger.debug(f"value_dict: {value_dict}")
 
     try:
         out = t(**value_dict)
-        # set parent pointers for all dataclasses in the tree
-        for k, v in value_dict.items():
-            if isinstance(v, list):
-                vs = v
-            else:
-                vs = [v]
-            for v_ in vs:
-                if is_dataclass(v_):
-                    setattr(v_, "_parent", out)
-        return out
     except TypeError as e:
         raise TypeError(f"Failed to create {t} with {value_dict}") from e
 
+    if lazy_values:
+        # drop the defaults, the raw values are decoded by SEXP_Lazy on access
+        for name in lazy_values:
+            del out.__dict__[name]
+        out.__dict__["_sexp_lazy"] = lazy_values
+
+    # set parent pointers for all dataclasses in the tree
+    for name in plan.parent_fields:
+        if (v := value_dict.get(name)) is not None:
+            _set_parent(v, out)
+    return out
+
+
+def _set_parent(v, parent) -> None:
+    for v_ in v if isinstance(v, list) else (v,):
+        if hasattr(type(v_), "__dataclass_fields__"):
+            setattr(v_, "_parent", parent)
+
+
+def _decode_key_field(p: _FieldPlan, values: list, stack: _Stack) -> Any:
+    f = p.field
+    name = f.name
+    sp = p.sp
+
+    if not sp.multidict:
+        assert len(values) == 1, f"Duplicate key: {name}"
+        return _convert(values[0][1:], f.type, stack, name, sp)
+
+    origin = p.origin
+    if origin is list:
+        val_t = p.args[0]
+        return [_convert(_val[1:], val_t, stack, name, sp) for _val in values]
+    if origin is dict:
+        if not sp.key:
+            raise ValueError(f"Key function required for multidict: {f.name}")
+        key_t, val_t = p.args
+        converted_values = [
+            _convert(_val[1:], val_t, stack, name, sp) for _val in values
+        ]
+        values_with_key = [(sp.key(_val), _val) for _val in converted_values]
+
+        if not all(isinstance(k, key_t) for k, _ in values_with_key):
+            raise KeyError(
+                f"Key function returned invalid type in field {f.name}:"
+                f" {key_t=} types={[v[0] for v in values_with_key]}"
+            )
+        if d := duplicates(values_with_key, key=lambda v: v[0]):
+            raise ValueError(f"Duplicate keys: {d}")
+        return dict(values_with_key)
+
+    raise NotImplementedError(f"Multidict not supported for {origin} in field {f}")
+
+
+def _decode_lazy(obj: "SEXP_Lazy", name: str) -> Any:
+    t = type(obj)
+    p = _get_decode_plan(t).key_fields[name]
+    values = obj.__dict__["_sexp_lazy"][name]
+
+    out = _decode_key_field(p, values, [(f"<{t.__name__}>", t)])
+    _set_parent(out, obj)
+    setattr(obj, name, out)
+    del obj.__dict__["_sexp_lazy"][name]
+    return out
+
+
+class SEXP_Lazy:
+    """
+    Base for dataclasses with lazy fields, see sexp_field.
+    Until first access, the raw sexp of a lazy field is kept in _sexp_lazy.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        # only called if the attribute is not set (yet)
+        lazy = self.__dict__.get("_sexp_lazy")
+        if not lazy or name not in lazy:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        return _decode_lazy(self, name)
+
+
+def get_lazy_sexp(obj, name: str) -> netlist_type | None:
+    """
+    Raw sexp of a lazy field that has not been decoded yet, else None
+    """
+    if name in obj.__dict__:
+        return None
+    return obj.__dict__.get("_sexp_lazy", {}).get(name)
+
+
+# Encoding -----------------------------------------------------------------------------
+
+type _Encoder = Callable[[Any], netlist_obj | None]
+
+_encoders: dict[type, _Encoder] = {}
+
+
+def _compile_encoder(t: type) -> _Encoder:
+    if is_dataclass(t):
+        return _encode
+    if issubclass(t, (list, tuple)):
+        return lambda val: [_convert2(v) for v in val]
+    if issubclass(t, dict):
+        return lambda val: [_convert2(v) for v in val.values()]
+    if issubclass(t, SymEnum):
+        return Symbol
+    if issubclass(t, StrEnum):
+        return str
+    if issubclass(t, IntEnum):
+        return int
+    if issubclass(t, Enum):
+        return Symbol
+    if issubclass(t, bool):
+        return lambda val: _YES if val else _NO
+    if issubclass(t, float):
+        return lambda val: int(val) if val.is_integer() else val
+    if issubclass(t, (str, int)):
+        return lambda val: val
+
+    return str
+
 
 def _convert2(val: Any) -> netlist_obj | None:
     if val is None:
         return None
-    if is_dataclass(val):
-        return _encode(val)
-    if isinstance(val, list):
-        return [_convert2(v) for v in val]
-    if isinstance(val, tuple):
-        return [_convert2(v) for v in val]
-    if isinstance(val, dict):
-        return [_convert2(v) for v in val.values()]
-    if isinstance(val, SymEnum):
-        return Symbol(val)
-    if isinstance(val, StrEnum):
-        return str(val)
-    if isinstance(val, IntEnum):
-        return int(val)
-    if isinstance(val, Enum):
-        return Symbol(val)
-    if isinstance(val, bool):
-        return Symbol("yes" if val else "no")
-    if isinstance(val, float):
-        if val.is_integer():
-            return int(val)
-        return val
-    if isinstance(val, (str, int)):
-        return val
-
-    return str(val)
+    t = type(val)
+    try:
+        encoder = _encoders[t]
+    except KeyError:
+        encoder = _encoders[t] = _compile_encoder(t)
+    return encoder(val)
+
+
+@dataclass
+class _EncodeField:
+    name: str
+    positional: bool
+    multidict: bool
+    origin: Any
+    # sexp key of the field, multidict entries use the singular
+    key: Symbol
+    lazy: bool
+
+
+_encode_plans: dict[type, list[_EncodeField]] = {}
+
+
+def _get_encode_plan(t: type) -> list[_EncodeField]:
+    try:
+        return _encode_plans[t]
+    except KeyError:
+        pass
+
+    fs = [(f, sexp_field.from_field(f)) for f in fields(t)]
+    plan = _encode_plans[t] = [
+        _EncodeField(
+            name=f.name,
+            positional=sp.positional,
+            multidict=sp.multidict,
+            origin=get_origin(f.type),
+            key=Symbol(f.name.removesuffix("s") if sp.multidict else f.name),
+            lazy=sp.lazy,
+        )
+        for f, sp in sorted(fs, key=lambda x: (not x[1].positional, x[1].order))
+    ]
+    return plan
 
 
 def _encode(t) -> netlist_type:
@@ -365,49 +610,47 @@ def _encode(t) -> netlist_type:
         raise TypeError(f"{t} is not a dataclass type")
 
     sexp: netlist_type = []
+    append = sexp.append
 
-    def _append(_val):
-        if val is None:
+    def _append_kv(key: Symbol, v):
+        converted = _convert2(v)
+        if converted is None:
             return
-        sexp.append(_val)
+        if isinstance(converted, list):
+            append([key, *converted])
+            return
+        append([key, converted])
 
-    fs = [(f, sexp_field.from_field(f)) for f in fields(t)]
+    for f in _get_encode_plan(type(t)):
+        if f.lazy and (raw := get_lazy_sexp(t, f.name)) is not None:
+            # never accessed, emit as read
+            sexp.extend(raw)
+            continue
 
-    for f, sp in sorted(fs, key=lambda x: (not x[1].positional, x[1].order)):
-        name = f.name
-        val = getattr(t, name)
+        val = getattr(t, f.name)
+        if val is None and not f.multidict:
+            continue
 
-        if sp.positional:
+        if f.positional:
             if isinstance(val, list):
-                for v in val:
-                    _append(_convert2(v))
+                sexp.extend(_convert2(v) for v in val)
                 continue
-            _append(_convert2(val))
+            append(_convert2(val))
             continue
 
-        def _append_kv(name, v):
-            converted = _convert2(v)
-            if converted is None:
-                return
-            if isinstance(converted, list):
-                _append([Symbol(name), *converted])
-                return
-            _append([Symbol(name), converted])
-
-        if sp.multidict:
+        if f.multidict:
             if isinstance(val, list):
-                assert get_origin(f.type) is list
+                assert f.origin is list
                 _val = val
             elif isinstance(val, dict):
-                assert get_origin(f.type) is dict
-                _val = val
+                assert f.origin is dict
                 _val = val.values()
             else:
                 raise TypeError()
             for v in _val:
-                _append_kv(f.name.removesuffix("s"), v)
+                _append_kv(f.key, v)
         else:
-            _append_kv(f.name, val)
+            _append_kv(f.key, val)
 
     if logger.isEnabledFor(logging.DEBUG):
         logger.debug(f"Dumping {type(t).__name__} {'-'*40}")
@@ -423,16 +666,18 @@ def loads[T](s: str | Path | list, t: type[T]) -> T:
     if isinstance(s, Path):
         text = s.read_text()
     if isinstance(text, str):
-        sexp = sexpdata.loads(text)
+        sexp = parser.loads(text)
 
     return _decode([sexp], t)
 
 
+def dump(obj, fp: TextIO):
+    writer.dump(_encode(obj)[0], fp)
+
+
 def dumps(obj, path: PathLike | None = None) -> str:
     path = Path(path) if path else None
-    sexp = _encode(obj)[0]
-    text = sexpdata.dumps(sexp)
-    text = prettify_sexp_string(text)
+    text = writer.dumps(_encode(obj)[0])
     if path:
         path.write_text(text)
     return text
@@ -456,6 +701,18 @@ class SEXP_File:
     def dumps(self, path: PathLike | None = None):
         return dumps(self, path)
 
+    def dump(self, path: PathLike | TextIO):
+        """
+        Like dumps, but streams the text into path instead of building it.
+        Files are replaced atomically, on failure the old file is kept.
+        """
+        if not isinstance(path, (str, PathLike)):
+            return dump(self, path)
+
+        sexp = _encode(self)[0]
+        with atomic_write(Path(path)) as f:
+            writer.dump(sexp, f)
+
 
 def get_parent[T](obj, t: type[T]) -> T:
     assert hasattr(obj, "_parent")
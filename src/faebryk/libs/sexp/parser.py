@@ -0,0 +1,105 @@
+# This file is part of the faebryk project
+# SPDX-License-Identifier: MIT
+
+import logging
+import re
+from typing import Any
+
+import sexpdata
+from sexpdata import String
+
+logger = logging.getLogger(__name__)
+
+"""
+Fast s-expression parser for the subset used by KiCAD files.
+Produces the same nested lists as sexpdata.loads, but scans the text with a
+single regex and converts every distinct atom only once per parse, so repeated
+symbols and numbers share one object.
+Anything outside of the subset (quotes, comments, [] brackets, escapes in
+symbols, malformed input) is handed to sexpdata.
+"""
+
+# same as sexpdata, which uses string.whitespace
+_WS = r" \t\n\r\x0b\x0c"
+_TOKEN = re.compile(
+    rf"[{_WS}]*("
+    # brackets
+    r"[()]"
+    # strings
+    r'|"(?:[^"\\]|\\.)*"'
+    # atoms
+    rf"|[^{_WS}()\[\]\"';\\][^{_WS}()\[\]\";\\]*"
+    # anything else, not supported
+    rf"|[^{_WS}]"
+    r")",
+    re.DOTALL,
+)
+_ESCAPE = re.compile(r"\\.", re.DOTALL)
+_UNSUPPORTED = frozenset("'[];\\\"")
+
+
+class _Unsupported(Exception): ...
+
+
+def _unquote(match: re.Match) -> str:
+    return String.unquote(match.group())
+
+
+def _atom(token: str) -> Any:
+    # see sexpdata.Parser.atom
+    if token == "t":
+        return True
+    try:
+        return int(token)
+    except ValueError:
+        try:
+            return float(token)
+        except ValueError:
+            return sexpdata.Symbol(token)
+
+
+def _parse(text: str) -> Any:
+    atoms: dict[str, Any] = {}
+    stack: list[list] = []
+    current: list = []
+
+    for token in _TOKEN.findall(text):
+        c = token[0]
+        if c == "(":
+            stack.append(current)
+            sub: list = []
+            current.append(sub)
+            current = sub
+        elif c == ")":
+            if not stack:
+                raise _Unsupported()
+            current = stack.pop()
+        elif c == '"' and len(token) > 1:
+            token = token[1:-1]
+            if "\\" in token:
+                token = _ESCAPE.sub(_unquote, token)
+            current.append(token)
+        elif c in _UNSUPPORTED:
+            raise _Unsupported()
+        elif (atom := atoms.get(token)) is not None:
+            current.append(atom)
+        elif token == "nil":
+            # not shared, lists are mutable
+            current.append([])
+        else:
+            current.append(atoms.setdefault(token, _atom(token)))
+
+    if stack or len(current) != 1:
+        raise _Unsupported()
+    return current[0]
+
+
+def loads(text: str) -> Any:
+    """
+    Parse a single s-expression, drop-in for sexpdata.loads with default options
+    """
+    try:
+        return _parse(text)
+    except _Unsupported:
+        logger.debug("Falling back to sexpdata")
+        return sexpdata.loads(text)
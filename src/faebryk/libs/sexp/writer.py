@@ -0,0 +1,121 @@
+# This file is part of the faebryk project
+# SPDX-License-Identifier: MIT
+
+import io
+import re
+from typing import Any, TextIO
+
+import sexpdata
+from sexpdata import String, Symbol
+
+"""
+Streaming s-expression writer for KiCAD files.
+Produces the same text as prettify_sexp_string(sexpdata.dumps(sexp)), but
+walks the tree once and writes the formatted text in chunks, so the cost is
+linear in the size of the output.
+Formatting: every list except the root starts on a new line indented by four
+spaces per level, closing brackets stay on the line of the last element.
+"""
+
+_INDENT = "    "
+# number of parts buffered before they are written to the file
+_CHUNK = 1 << 14
+
+_SYMBOL_SPECIAL = re.compile(r"[\\'`\"()\[\] ,?;#]")
+_STRING_SPECIAL = re.compile(r'[\\"\b\f\n\r\t]')
+
+
+class _Writer:
+    def __init__(self, fp: TextIO):
+        self._fp = fp
+        self._parts: list[str] = []
+        self._atoms: dict[type, dict[Any, str]] = {Symbol: {}, str: {}}
+        # the root line is not stripped by prettify_sexp_string
+        self._first_line = True
+
+    def _flush(self, keep_last: bool = True):
+        # the last part is kept to decide on the next separator
+        parts = self._parts
+        end = len(parts) - 1 if keep_last else len(parts)
+        self._fp.write("".join(parts[:end]))
+        del parts[:end]
+
+    def _atom(self, obj) -> str:
+        t = type(obj)
+        if t is int or t is float:
+            return str(obj)
+        if t is bool:
+            return "t" if obj else "()"
+
+        cache = self._atoms.get(t)
+        if cache is not None and (out := cache.get(obj)) is not None:
+            return out
+
+        if t is Symbol:
+            out = Symbol.quote(obj) if _SYMBOL_SPECIAL.search(obj) else str(obj)
+        elif t is str or t is String:
+            out = (
+                '"' + (String.quote(obj) if _STRING_SPECIAL.search(obj) else obj) + '"'
+            )
+        else:
+            out = sexpdata.tosexp(obj)
+
+        if cache is not None:
+            cache[obj] = out
+        return out
+
+    def _list(self, sexp: list | tuple, level: int):
+        parts = self._parts
+        append = parts.append
+        prefix = "\n" + _INDENT * (level + 1)
+
+        append("(")
+        for i, x in enumerate(sexp):
+            # False and None are written as ()
+            if isinstance(x, (list, tuple)) or x is None or x is False:
+                if self._first_line:
+                    if i and parts[-1] != " ":
+                        append(" ")
+                    self._first_line = False
+                elif parts[-1] == " ":
+                    # trailing whitespace is stripped
+                    parts.pop()
+                append(prefix)
+                if x is None or x is False:
+                    append("()")
+                else:
+                    self._list(x, level + 1)
+                continue
+
+            # repeated spaces are collapsed (e.g. after an empty symbol)
+            if i and parts[-1] != " ":
+                append(" ")
+            if atom := self._atom(x):
+                append(atom)
+
+        append(")")
+        if len(parts) > _CHUNK:
+            self._flush()
+
+    def write(self, sexp):
+        if isinstance(sexp, (list, tuple)):
+            self._list(sexp, 0)
+        else:
+            self._parts.append(self._atom(sexp))
+        self._flush(keep_last=False)
+
+
+def dump(sexp, fp: TextIO):
+    """
+    Write a single s-expression to fp in the KiCAD format
+    """
+    _Writer(fp).write(sexp)
+
+
+def dumps(sexp) -> str:
+    """
+    Format a single s-expression in the KiCAD format
+    """
+    out = io.StringIO()
+    dump(sexp, out)
+    return out.getvalue()
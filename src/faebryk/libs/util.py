@@ -8,9 +8,11 @@ import itertools
 import logging
 import os
 import select
+import shutil
 import subprocess
 import sys
 import time
+import uuid
 from abc import abstractmethod
 from collections import defaultdict
 from contextlib import contextmanager
@@ -32,6 +34,7 @@ from typing import (
     Sequence,
     SupportsFloat,
     SupportsInt,
+    TextIO,
     Type,
     get_origin,
 )
@@ -1240,6 +1243,27 @@ def global_lock(lock_file_path: Path, timeout_s: float | None = None):
         lock_file_path.unlink(missing_ok=True)
 
 
+@contextmanager
+def atomic_write(path: Path) -> Iterator[TextIO]:
+    """
+    Write to a temporary file next to path that replaces path once the block
+    finished, on failure path is left untouched.
+    Existing files keep their mode, new ones get the default mode (umask).
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w") as f:
+            yield f
+        if path.exists():
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 def typename(x: object | type) -> str:
     if not isinstance(x, type):
         x = type(x)
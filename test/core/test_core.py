@@ -47,6 +47,26 @@ class TestGraph(unittest.TestCase):
 
         self.assertEqual(gif1.G, gif2.G)
 
+    def test_edges_since(self):
+        from faebryk.core.graphinterface import GraphInterface as GIF
+
+        gifs = [GIF() for _ in range(4)]
+        gifs[0].connect(gifs[1])
+        G = gifs[0].G
+        n = G.edge_count
+
+        gifs[1].connect(gifs[2])
+        gifs[2].connect(gifs[3])
+        G = gifs[0].G
+        self.assertEqual(G.edge_count, n + 2)
+        self.assertEqual(G.edges_since(n), G.edges[n:])
+        self.assertEqual(
+            [(from_, to) for from_, to, _ in G.edges_since(n)],
+            [(gifs[1], gifs[2]), (gifs[2], gifs[3])],
+        )
+        self.assertEqual(G.edges_since(G.edge_count), [])
+        self.assertEqual(G.edges_since(G.edge_count + 1), [])
+
     def test_node_gifs(self):
         from faebryk.core.node import Node
 
@@ -84,6 +104,66 @@ class TestGraph(unittest.TestCase):
         children = n.get_children(direct_only=True, types=Node)
         self.assertEqual(children, {n.SN1, n.SN2, n.SN3[0], n.SN3[1], n.SN4})
 
+    def test_fab_ll_field_recipe_per_class(self):
+        calls = []
+
+        class N(Node):
+            SN1: Node
+
+            def __preinit__(self):
+                calls.append(type(self))
+
+        class M(N):
+            SN2 = L.list_field(2, Node)
+
+        n1, n2, m = N(), N(), M()
+        self.assertIsNot(n1.SN1, n2.SN1)
+        self.assertEqual(m.get_children(direct_only=True, types=Node), {m.SN1, *m.SN2})
+        self.assertEqual(calls, [N, N, M, M])
+
+        # not inherited from the base recipe
+        self.assertIsNot(N._get_field_recipe(), M._get_field_recipe())
+        self.assertNotIn("SN2", N._get_field_recipe().clsfields)
+        self.assertIn("SN2", M._get_field_recipe().clsfields)
+
+    def test_graph_type_and_trait_index(self):
+        import faebryk.library._F as F
+        from faebryk.core.graph import GraphFunctions
+
+        class App(Node):
+            resistors = L.list_field(3, F.Resistor)
+            cap: F.Capacitor
+
+        app = App()
+        app.resistors[0].del_trait(F.can_attach_to_footprint)
+        # merges the graph of the new node into the app graph
+        extra = F.Resistor()
+        app.resistors[1].unnamed[0].connect(extra.unnamed[0])
+
+        G = app.get_graph()
+        nodes = G.node_projection()
+        gf = GraphFunctions(G)
+
+        for t in (F.Resistor, F.Electrical, Node):
+            self.assertEqual(
+                gf.nodes_of_type(t), {n for n in nodes if isinstance(n, t)}
+            )
+        self.assertEqual(
+            gf.nodes_of_types((F.Resistor, F.Capacitor)),
+            {n for n in nodes if isinstance(n, (F.Resistor, F.Capacitor))},
+        )
+
+        for trait in (F.can_attach_to_footprint, F.has_designator_prefix):
+            self.assertEqual(
+                set(gf.nodes_with_trait(trait)),
+                {(n, n.get_trait(trait)) for n in nodes if n.has_trait(trait)},
+            )
+        self.assertNotIn(
+            app.resistors[0],
+            dict(gf.nodes_with_trait(F.can_attach_to_footprint)),
+        )
+        self.assertIn(extra, dict(gf.nodes_with_trait(F.can_attach_to_footprint)))
+
     def test_fab_ll_chain_names(self):
         root = Node()
         x = root
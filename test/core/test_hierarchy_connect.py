@@ -1,12 +1,22 @@
 # This file is part of the faebryk project
 # SPDX-License-Identifier: MIT
 
+import json
 import logging
 from itertools import chain
 
 import pytest
 
 import faebryk.library._F as F
+from faebryk.core.cpp import (
+    get_pathfinder_profile,
+    set_connectivity_index,
+    set_frozen_adjacency,
+    set_max_paths,
+    set_path_cache,
+    set_pathfinder_threads,
+)
+from faebryk.core.graph import FROZEN_ADJACENCY, GraphFunctions
 from faebryk.core.link import (
     LinkDirect,
     LinkDirectConditional,
@@ -15,6 +25,15 @@ from faebryk.core.link import (
 )
 from faebryk.core.module import Module
 from faebryk.core.moduleinterface import IMPLIED_PATHS, ModuleInterface
+from faebryk.core.pathfinder import (
+    CONNECTIVITY_INDEX,
+    MAX_PATHS,
+    MAX_PATHS_NO_NEW_WEAK,
+    MAX_PATHS_NO_WEAK,
+    PATH_CACHE,
+    PATHFINDER_THREADS,
+    pathfinder_profile,
+)
 from faebryk.libs.app.erc import ERCPowerSourcesShortedError, simple_erc
 from faebryk.libs.app.parameters import resolve_dynamic_parameters
 from faebryk.libs.library import L
@@ -560,5 +579,169 @@ def test_regression_rp2040_usb_diffpair_full():
     resolve_dynamic_parameters(app.get_graph())
 
 
+def _get_connected_all(mifs: list[ModuleInterface], index: bool):
+    set_connectivity_index(index)
+    set_path_cache(False)
+    try:
+        return {mif: set(mif.get_connected(include_self=True)) for mif in mifs}
+    finally:
+        set_connectivity_index(bool(CONNECTIVITY_INDEX))
+        set_path_cache(bool(PATH_CACHE))
+
+
+def test_connectivity_index_fused_power():
+    power = F.ElectricPower()
+    fused = power.fused()
+    load = F.ElectricPower()
+    fused.connect(load)
+
+    # lv is not influenced by the shallow link, hv is
+    assert load.lv.is_connected_to(power.lv)
+    assert not load.hv.is_connected_to(power.hv)
+
+    mifs = [power.hv, power.lv, fused.hv, fused.lv, load.hv, load.lv]
+    assert _get_connected_all(mifs, True) == _get_connected_all(mifs, False)
+
+
+def test_connectivity_index_parity():
+    class App(Module):
+        uart: F.UART_Base
+        uarts = L.list_field(3, F.UART_Base)
+        power = L.list_field(2, F.ElectricPower)
+
+        def __preinit__(self) -> None:
+            self.uart.connect(self.uarts[0])
+            self.uarts[0].rx.signal.connect(self.uarts[1].rx.signal)
+            self.uarts[1].connect_shallow(self.uarts[2])
+            self.uarts[2].tx.reference.connect(self.power[0])
+            self.power[0].fused().connect(self.power[1])
+
+    app = App()
+    mifs = list(GraphFunctions(app.get_graph()).nodes_of_type(F.Electrical))
+    assert _get_connected_all(mifs, True) == _get_connected_all(mifs, False)
+
+
+def test_get_connected_many():
+    power = F.ElectricPower()
+    power.fused().connect(F.ElectricPower())
+    mifs = times(3, F.Electrical)
+    mifs[0].connect(mifs[1], power.hv)
+
+    srcs = [power, power.hv, power.lv, *mifs, mifs[0]]
+    connected = ModuleInterface.get_connected_many(srcs)
+    assert connected.keys() == set(srcs)
+    for mif in srcs:
+        assert connected[mif].keys() == mif.get_connected().keys()
+
+
+def test_get_connected_many_threaded():
+    class App(Module):
+        uarts = L.list_field(3, F.UART_Base)
+        power = L.list_field(2, F.ElectricPower)
+
+        def __preinit__(self) -> None:
+            self.uarts[0].connect(self.uarts[1])
+            self.uarts[1].connect_shallow(self.uarts[2])
+            self.uarts[2].tx.reference.connect(self.power[0])
+            self.power[0].fused().connect(self.power[1])
+
+    app = App()
+    mifs = list(GraphFunctions(app.get_graph()).nodes_of_type(ModuleInterface))
+
+    set_connectivity_index(False)
+    set_path_cache(False)
+    try:
+        expected = ModuleInterface.get_connected_many(mifs)
+        set_pathfinder_threads(4)
+        connected = ModuleInterface.get_connected_many(mifs)
+    finally:
+        set_connectivity_index(bool(CONNECTIVITY_INDEX))
+        set_path_cache(bool(PATH_CACHE))
+        set_pathfinder_threads(int(PATHFINDER_THREADS))
+
+    assert {k: v.keys() for k, v in connected.items()} == {
+        k: v.keys() for k, v in expected.items()
+    }
+
+
+@pytest.mark.skipif(not PATH_CACHE, reason="PATH_CACHE is not set")
+def test_path_cache():
+    mifs = times(3, F.Electrical)
+    mifs[0].connect(mifs[1])
+    cache = mifs[0].get_graph().path_cache
+
+    hits, misses = cache.hits, cache.misses
+    assert mifs[0].get_connected().keys() == {mifs[1]}
+    assert mifs[0].get_connected().keys() == {mifs[1]}
+    assert mifs[0].is_connected_to(mifs[1])
+    assert (cache.hits - hits, cache.misses - misses) == (2, 1)
+
+    # invalidated by graph changes
+    generation = mifs[0].get_graph().generation
+    mifs[1].connect(mifs[2])
+    cache = mifs[0].get_graph().path_cache
+    assert mifs[0].get_graph().generation != generation
+    assert mifs[0].get_connected().keys() == {mifs[1], mifs[2]}
+
+    # invalidated by other path limits
+    set_connectivity_index(False)
+    try:
+        mifs[0].get_connected()
+        misses = cache.misses
+        set_max_paths(1, 1, 1)
+        assert mifs[0].get_connected().keys() != {mifs[1], mifs[2]}
+        assert cache.misses == misses + 1
+    finally:
+        set_max_paths(
+            int(MAX_PATHS), int(MAX_PATHS_NO_NEW_WEAK), int(MAX_PATHS_NO_WEAK)
+        )
+        set_connectivity_index(bool(CONNECTIVITY_INDEX))
+    assert mifs[0].get_connected().keys() == {mifs[1], mifs[2]}
+
+
+def test_frozen_adjacency():
+    power = F.ElectricPower()
+    power.fused().connect(F.ElectricPower())
+    mifs = [power, power.hv, power.lv]
+
+    set_frozen_adjacency(True)
+    try:
+        frozen = _get_connected_all(mifs, False)
+        # rebuilt after mutation
+        power.hv.connect(power.lv)
+        frozen_post = _get_connected_all(mifs, False)
+    finally:
+        set_frozen_adjacency(bool(FROZEN_ADJACENCY))
+
+    assert frozen_post == _get_connected_all(mifs, False)
+    assert frozen != frozen_post
+
+
+def test_pathfinder_profile():
+    power = F.ElectricPower()
+    power.fused().connect(F.ElectricPower())
+
+    with pathfinder_profile() as prof:
+        power.get_connected()
+        power.get_connected()
+        power.lv.get_connected()
+        with pytest.raises(RuntimeError):
+            with pathfinder_profile():
+                pass
+
+    out = json.loads(prof.to_json())
+    assert out["queries"] == 3
+    assert out["cache_hits"] + out["index_hits"] + out["searches"] == 3
+    # buses are always searched
+    assert out["searches"] >= 1
+    assert out["bfs"]["paths"] == out["filters"]["total"]["in"] > 0
+    assert out["bfs"]["peak_queue"] > 0
+
+    # nothing collected outside of the profile
+    power.hv.get_connected()
+    assert get_pathfinder_profile().queries == 0
+    assert prof.to_dict() == out
+
+
 if __name__ == "__main__":
     test_regression_rp2040_usb_diffpair()
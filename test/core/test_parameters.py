@@ -358,6 +358,178 @@ class TestParameters(unittest.TestCase):
     def test_units(self):
         self.assertEqual(F.Constant(1e-9 * P.F), 1 * P.nF)
 
+    def test_literal_values(self):
+        from faebryk.core.literal import Discrete, Interval, LiteralValue, Scalar
+
+        def values():
+            return [
+                F.Constant(2),
+                F.Constant(5),
+                F.Range(1, 10),
+                F.Range(2, 3),
+                F.Range(4, 20),
+                F.Set([1, 2]),
+                F.Set([2, 3, 12]),
+                F.Set([]),
+            ]
+
+        # rows: lhs, columns: rhs
+        subset_table = [
+            "10110110",
+            "01101000",
+            "00100000",
+            "00110000",
+            "00001000",
+            "00100100",
+            "00000010",
+            "11111111",
+        ]
+        for lhs, row in zip(values(), subset_table):
+            for rhs, expected in zip(values(), row):
+                lits = LiteralValue.from_parameters(lhs, rhs)
+                assert lits is not None
+                self.assertEqual(
+                    lits[0].is_subset_of(lits[1]), expected == "1", f"{lhs} <= {rhs}"
+                )
+                self.assertEqual(lhs.is_subset_of(rhs), expected == "1")
+
+        self.assertEqual(
+            LiteralValue.from_parameter(F.Range(10 * P.V, 1 * P.V)),
+            Interval(1 * P.V, 10 * P.V),
+        )
+        self.assertEqual(
+            LiteralValue.from_parameter(F.Set([1, F.Constant(1), 2])),
+            Discrete(frozenset({Scalar(1), Scalar(2)})),
+        )
+        self.assertIsNone(LiteralValue.from_parameter(F.Range(F.TBD(), 1)))
+        self.assertIsNone(LiteralValue.from_parameter(F.ANY()))
+        with self.assertRaises(AttributeError):
+            Scalar(1).value = 2  # type: ignore
+
+        # only the result is promoted to a node
+        self.assertEqual(
+            F.Range(1 * P.V, 2 * P.V) * F.Constant(2), F.Range(2 * P.V, 4 * P.V)
+        )
+        self.assertTrue(
+            F.Range(1 * P.kohm, 2 * P.kohm).is_subset_of((0 * P.ohm, 1 * P.Mohm))
+        )
+        self.assertFalse(F.Constant(3 * P.V).is_subset_of(F.Set([1 * P.V, 2 * P.V])))
+        c = F.Constant(3)
+        self.assertIs(F.Range(1, 5).merge(c), c)
+
+    def test_arithmetic_op_batch(self):
+        import operator
+
+        from faebryk.core.literal import IntervalBatch, LiteralValue
+
+        ops1 = [
+            F.Range(1 * P.V, 2 * P.V),
+            F.Constant(3 * P.mV),
+            F.Range(1 * P.kV, 2 * P.kV),
+            F.Range(F.TBD(), 1 * P.V),
+            F.Set([1 * P.V, 2 * P.V]),
+        ]
+        ops2 = [
+            F.Constant(2 * P.V),
+            F.Range(1 * P.mV, 2 * P.V),
+            (1 * P.V, 2 * P.V),
+            1 * P.V,
+            1 * P.V,
+        ]
+        for op in [operator.add, operator.sub, operator.mul, operator.truediv]:
+            batched = Parameter.arithmetic_op_batch(ops1, ops2, op)
+            for p1, p2, result in zip(ops1, ops2, batched):
+                expected = op(p1, p2).get_most_narrow()
+                result = result.get_most_narrow()
+                if LiteralValue.from_parameter(expected) is None:
+                    self.assertIs(type(result), type(expected))
+                else:
+                    self.assertEqual(result, expected, f"{op} {p1} {p2}")
+
+        self.assertEqual(
+            Parameter.arithmetic_op_batch(
+                [F.Range(1, 2), 3 * P.V], [2, 2], operator.pow
+            ),
+            [F.Range(1, 4), F.Constant(9 * P.V**2)],
+        )
+        with self.assertRaises(ZeroDivisionError):
+            Parameter.arithmetic_op_batch([F.Constant(1)], [0], operator.truediv)
+
+        # same as the literal set operations
+        values = [F.Constant(2), F.Range(1, 10), F.Range(2, 3), F.Range(3, 20)]
+        lits = [LiteralValue.from_parameter(v) for v in values]
+        lhs = IntervalBatch.from_literals([a for a in lits for _ in lits])  # type: ignore
+        rhs = IntervalBatch.from_literals(lits * len(lits))  # type: ignore
+        self.assertEqual(
+            lhs.is_subset_of(rhs).tolist(),
+            [a.is_subset_of(b) for a in lits for b in lits],  # type: ignore
+        )
+        self.assertEqual(
+            lhs.intersect(rhs),
+            [a.intersect(b) for a in lits for b in lits],  # type: ignore
+        )
+
+    def test_narrowing_forest(self):
+        params = [F.TBD() for _ in range(200)]
+        for p1, p2 in zip(params, params[1:]):
+            p2.merge(p1)
+        c = F.Constant(1)
+        params[-1].merge(c)
+
+        for p in params:
+            self.assertIs(p.get_most_narrow(), c)
+        self.assertEqual(params[0].get_narrowing_chain(), [*params, c])
+        # still mirrored into the graph
+        self.assertEqual(params[-1].get_narrowed_siblings(), {params[-2]})
+        self.assertTrue(params[0].narrowed_by.is_connected_to(params[1].narrows))
+
+        # narrowing the root later is seen from the whole tree
+        r = F.Range(0, 2)
+        r.merge(params[0])
+        self.assertIs(r.get_most_narrow(), c)
+
+        with self.assertRaises(AssertionError):
+            c._narrowed(params[0])
+
+    def test_dynamic_parameters_incremental(self):
+        from faebryk.libs.app.parameters import DynamicParameterSolver
+        from faebryk.libs.library import L
+
+        class App(Module):
+            powers = L.list_field(4, F.ElectricPower)
+
+        app = App()
+        p = app.powers
+        p[0].connect(p[1])
+        p[2].connect(p[3])
+        p[0].voltage.merge(F.Range(1 * P.V, 5 * P.V))
+        p[1].voltage.merge(3 * P.V)
+
+        solver = DynamicParameterSolver()
+        report = solver.solve(app.get_graph())
+        self.assertEqual(p[0].voltage.get_most_narrow(), 3 * P.V)
+        self.assertEqual(sorted(b.size for b in report.buses), [2, 2])
+        self.assertEqual(report.executed, 2)
+
+        # nothing changed
+        report = solver.solve(app.get_graph())
+        self.assertEqual((report.buses, report.executed, report.full), ([], 0, False))
+        self.assertEqual(report.skipped, 4)
+
+        # only the joined buses are touched
+        other = F.ElectricPower()
+        other.connect(p[2])
+        report = solver.solve(app.get_graph())
+        self.assertEqual([b.size for b in report.buses], [3])
+        self.assertIsInstance(p[3].voltage.get_most_narrow(), F.TBD)
+        p[3].voltage.merge(3 * P.V)
+        self.assertEqual(other.voltage.get_most_narrow(), 3 * P.V)
+
+        p[1].connect(p[2])
+        report = solver.solve(app.get_graph())
+        self.assertEqual([b.size for b in report.buses], [5])
+        self.assertEqual(report.to_dict()["buses"][0]["size"], 5)
+
 
 if __name__ == "__main__":
     unittest.main()
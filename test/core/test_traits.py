@@ -209,3 +209,70 @@ def test_trait_impl_exception():
 
     t1 = obj.add(trait1impl())
     assert obj.get_trait(trait1impl) is t1
+
+
+def test_trait_dynamic_implemented():
+    obj = Node()
+
+    class trait1(Trait):
+        pass
+
+    class trait1impl(trait1.impl()):
+        enabled = False
+
+        def is_implemented(self):
+            return self.enabled
+
+    impl = obj.add(trait1impl())
+    assert not obj.has_trait(trait1)
+    assert obj.try_get_trait(trait1) is None
+
+    impl.enabled = True
+    assert obj.get_trait(trait1) is impl
+
+
+def test_trait_index_after_delete():
+    obj = Node()
+
+    class trait1(Trait):
+        pass
+
+    class trait2(trait1):
+        pass
+
+    class trait3(trait1):
+        pass
+
+    impl2 = obj.add(trait2.impl()())
+    impl3 = obj.add(trait3.impl()())
+    assert obj.get_trait(trait2) is impl2
+    assert obj.get_trait(trait3) is impl3
+
+    obj.del_trait(trait2)
+    assert not obj.has_trait(trait2)
+    assert obj.get_trait(trait1) is impl3
+
+
+def test_trait_index_dynamic_before_implemented():
+    obj = Node()
+
+    class trait1(Trait):
+        pass
+
+    class dynamic(trait1.impl()):
+        def is_implemented(self):
+            return False
+
+    class static(trait1.impl()):
+        pass
+
+    hidden = obj.add(dynamic())
+    impl = obj.add(static())
+    assert obj.has_trait(trait1)
+    assert obj.try_get_trait(trait1) is impl
+
+    # removes the implemented one, the hidden one stays indexed
+    obj.del_trait(trait1)
+    assert not obj.has_trait(trait1)
+    hidden.is_implemented = lambda: True
+    assert obj.get_trait(trait1) is hidden
@@ -0,0 +1,164 @@
+# This file is part of the faebryk project
+# SPDX-License-Identifier: MIT
+
+import shutil
+import tempfile
+import unittest
+from copy import deepcopy
+from pathlib import Path
+from unittest.mock import patch
+
+import faebryk.library._F as F  # noqa: F401
+from faebryk.core.module import Module
+from faebryk.exporters.pcb.kicad.pcb import PCB
+from faebryk.libs.app.pcb import apply_design
+from faebryk.libs.kicad.fileformats import (
+    C_kicad_footprint_file,
+    C_kicad_netlist_file,
+    C_kicad_pcb_file,
+)
+from faebryk.libs.units import P
+from faebryk.libs.util import find
+
+TEST_DIR = find(
+    Path(__file__).parents,
+    lambda p: p.name == "test" and (p / "common/resources").is_dir(),
+)
+TEST_FILES = TEST_DIR / "common/resources"
+PCBFILE = TEST_FILES / "test.kicad_pcb"
+
+C_netlist = C_kicad_netlist_file.C_netlist
+
+
+def _netlist_from_pcb(
+    pcb: C_kicad_pcb_file, renames: dict[str, str]
+) -> C_kicad_netlist_file:
+    nets: dict[str, list[C_netlist.C_nets.C_net.C_node]] = {}
+    comps = []
+    for fp in pcb.kicad_pcb.footprints:
+        ref = fp.propertys["Reference"].value
+        comps.append(
+            C_netlist.C_components.C_component(
+                ref=ref,
+                value=fp.propertys["Value"].value,
+                footprint=fp.name,
+                tstamps="",
+            )
+        )
+        for pad in fp.pads:
+            if pad.net and pad.net.name:
+                nets.setdefault(renames.get(pad.net.name, pad.net.name), []).append(
+                    C_netlist.C_nets.C_net.C_node(ref=ref, pin=pad.name)
+                )
+
+    return C_kicad_netlist_file(
+        C_netlist(
+            version="E",
+            components=C_netlist.C_components(comps=comps),
+            nets=C_netlist.C_nets(
+                nets=[
+                    C_netlist.C_nets.C_net(code=i, name=name, nodes=nodes)
+                    for i, (name, nodes) in enumerate(nets.items(), start=1)
+                ]
+            ),
+        )
+    )
+
+
+class TestApplyNetlist(unittest.TestCase):
+    def test_in_memory(self):
+        pcb = C_kicad_pcb_file.loads(PCBFILE)
+        netlist = _netlist_from_pcb(pcb, {"B1-1-R1-2": "VBAT"})
+
+        PCB.apply_netlist_to(pcb, netlist, TEST_FILES / "fp-lib-table")
+
+        net = find(pcb.kicad_pcb.nets, lambda n: n.number == 1)
+        self.assertEqual(net.name, "VBAT")
+        self.assertFalse(any(n.name == "B1-1-R1-2" for n in pcb.kicad_pcb.nets))
+        pad_nets = {
+            (fp.propertys["Reference"].value, p.name): p.net.name
+            for fp in pcb.kicad_pcb.footprints
+            for p in fp.pads
+            if p.net
+        }
+        self.assertEqual(pad_nets[("R1", "2")], "VBAT")
+        self.assertEqual(pad_nets[("B1", "1")], "VBAT")
+        self.assertEqual(len(pcb.kicad_pcb.footprints), 4)
+
+        # applying the same netlist again does not change the pcb
+        text = pcb.dumps()
+        PCB.apply_netlist_to(pcb, netlist, TEST_FILES / "fp-lib-table")
+        self.assertEqual(pcb.dumps(), text)
+
+    def test_added_footprints_get_new_uuids(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            shutil.copy(TEST_FILES / "fp-lib-table", tmp / "fp-lib-table")
+
+            # library footprint that already has an LCSC property
+            fp_file = C_kicad_footprint_file.loads(TEST_FILES / "test.kicad_mod")
+            lib_prop = deepcopy(fp_file.footprint.propertys["Description"])
+            lib_prop.name = "LCSC"
+            fp_file.footprint.propertys["LCSC"] = lib_prop
+            fp_file.dumps(tmp / "test_lcsc.kicad_mod")
+
+            pcb = C_kicad_pcb_file.loads(PCBFILE)
+            netlist = _netlist_from_pcb(pcb, {})
+            for ref in ["X1", "X2"]:
+                netlist.export.components.comps.append(
+                    C_netlist.C_components.C_component(
+                        ref=ref, value="X", footprint="here:test_lcsc", tstamps=""
+                    )
+                )
+
+            PCB.apply_netlist_to(pcb, netlist, tmp / "fp-lib-table")
+
+        uuids = [
+            fp.propertys["LCSC"].uuid
+            for fp in pcb.kicad_pcb.footprints
+            if fp.propertys["Reference"].value in ["X1", "X2"]
+        ]
+        self.assertEqual(len(uuids), 2)
+        self.assertEqual(len(set(uuids) | {lib_prop.uuid}), 3)
+
+
+class TestApplyDesign(unittest.TestCase):
+    def test_skip_unchanged(self):
+        class App(Module):
+            r: F.Resistor
+
+            def __preinit__(self):
+                self.r.resistance.merge(F.Constant(10 * P.kohm))
+                self.r.get_trait(F.can_attach_to_footprint).attach(
+                    F.KicadFootprint("here:test", ["1", "2"])
+                )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            for name in ["fp-lib-table", "test.kicad_mod", "test.kicad_pro"]:
+                shutil.copy(TEST_FILES / name, tmp / name)
+            pcb_path = tmp / "test.kicad_pcb"
+            shutil.copy(PCBFILE, pcb_path)
+            netlist_path = tmp / "test.net"
+
+            app = App()
+            with patch("faebryk.libs.app.pcb.PCBNEW_AUTO", False):
+                before = pcb_path.stat()
+                apply_design(
+                    pcb_path, netlist_path, app.get_graph(), app, skip_unchanged=True
+                )
+                first = pcb_path.stat()
+                apply_design(
+                    pcb_path, netlist_path, app.get_graph(), app, skip_unchanged=True
+                )
+                second = pcb_path.stat()
+
+        # the changed pcb replaced the old file, the unchanged one is not written
+        self.assertNotEqual(first.st_ino, before.st_ino)
+        self.assertEqual(
+            (second.st_ino, second.st_mtime_ns), (first.st_ino, first.st_mtime_ns)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
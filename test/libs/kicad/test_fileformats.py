@@ -21,6 +21,8 @@ from faebryk.libs.sexp.dataclass_sexp import (
     JSON_File,
     SEXP_File,
     dataclass_dfs,
+    get_lazy_sexp,
+    get_parent,
 )
 from faebryk.libs.util import ConfigFlag, find, not_none
 
@@ -179,6 +181,34 @@ def test_empty_enum_positional():
     ]
 
 
+def test_lazy():
+    pcb = C_kicad_pcb_file.loads(PCBFILE)
+    kicad_pcb = pcb.kicad_pcb
+    assert get_lazy_sexp(kicad_pcb, "footprints") is not None
+    assert get_lazy_sexp(kicad_pcb, "nets") is not None
+    # not in the file
+    assert get_lazy_sexp(kicad_pcb, "segments") is None
+
+    # untouched sections are dumped as read
+    untouched = C_kicad_pcb_file.loads(pcb.dumps()).kicad_pcb
+    assert untouched.footprints == kicad_pcb.footprints
+    assert get_lazy_sexp(kicad_pcb, "nets") is not None
+
+    # decoded on first access
+    fp = kicad_pcb.footprints[0]
+    assert get_lazy_sexp(kicad_pcb, "footprints") is None
+    assert get_parent(fp, C_kicad_pcb_file.C_kicad_pcb) is kicad_pcb
+    assert kicad_pcb.footprints[0] is fp
+    fp.name = "lib:changed"
+
+    # assigned before access
+    kicad_pcb.nets = [C_kicad_pcb_file.C_kicad_pcb.C_net(number=0, name="")]
+
+    reloaded = C_kicad_pcb_file.loads(pcb.dumps()).kicad_pcb
+    assert reloaded.footprints[0].name == "lib:changed"
+    assert reloaded.nets == kicad_pcb.nets
+
+
 @pytest.mark.parametrize(
     ("parser", "path"),
     [
@@ -0,0 +1,159 @@
+# This file is part of the faebryk project
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from faebryk.libs.picker.api.api import (
+    ApiCacheMissError,
+    ApiClient,
+    FootprintCandidate,
+    ResistorParams,
+    ResponseCache,
+)
+
+COMPONENT = {
+    "lcsc": 25744,
+    "category_id": 1,
+    "mfr": "0402WGF1002TCE",
+    "package": "0402",
+    "joints": 2,
+    "manufacturer_id": 1,
+    "basic": 1,
+    "description": "10kΩ ±1% 62.5mW 0402",
+    "datasheet": "",
+    "stock": 1000,
+    "price": [{"qFrom": 1, "qTo": None, "price": 0.001}],
+    "last_update": 0,
+    "extra": {"attributes": {"Resistance": "10kΩ"}},
+    "flag": 0,
+    "last_on_stock": 0,
+    "preferred": 0,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests: list[tuple[str, str, dict | None]] = []
+
+    def _respond(self, data: dict | None):
+        self.requests.append((self.command, self.path, data))
+        body = json.dumps({"components": [COMPONENT]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(None)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self._respond(json.loads(self.rfile.read(length)))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestApiCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self._tmp.name)
+
+        _Handler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self._config = ApiClient.config
+        ApiClient.config = ApiClient.Config(
+            api_url=f"http://127.0.0.1:{self.server.server_port}",
+            api_key="",
+            cache_path=self.cache_path,
+            cache_ttl=60,
+            cache_size=100,
+            offline=False,
+        )
+
+    def tearDown(self):
+        ApiClient.config = self._config
+        self.server.shutdown()
+        self.server.server_close()
+        self._tmp.cleanup()
+
+    def _params(self, resistance: str) -> ResistorParams:
+        return ResistorParams(
+            footprint_candidates=[FootprintCandidate("0402", 2)],
+            qty=1,
+            resistances=[resistance],
+        )
+
+    def test_hit_miss(self):
+        parts = ApiClient().fetch_resistors(self._params("10kΩ"))
+        self.assertEqual([p.lcsc for p in parts], [25744])
+        self.assertEqual(len(_Handler.requests), 1)
+
+        # new client, e.g. the next build
+        client = ApiClient()
+        parts = client.fetch_resistors(self._params("10kΩ"))
+        self.assertEqual([p.lcsc for p in parts], [25744])
+        self.assertEqual(len(_Handler.requests), 1)
+
+        client.fetch_resistors(self._params("22kΩ"))
+        client.fetch_part_by_lcsc(25744)
+        self.assertEqual(
+            [(method, path) for method, path, _ in _Handler.requests],
+            [
+                ("POST", "/v0/query/resistors"),
+                ("POST", "/v0/query/resistors"),
+                ("GET", "/v0/component/lcsc/25744"),
+            ],
+        )
+        self.assertEqual(_Handler.requests[1][2]["resistances"], ["22kΩ"])
+        ApiClient().fetch_part_by_lcsc(25744)
+        self.assertEqual(len(_Handler.requests), 3)
+
+    def test_ttl_and_offline(self):
+        ApiClient().fetch_resistors(self._params("10kΩ"))
+        for file in self.cache_path.glob("*.json"):
+            expired = time.time() - 120
+            os.utime(file, (expired, expired))
+
+        ApiClient.config.offline = True
+        # expired entries are still served offline
+        parts = ApiClient().fetch_resistors(self._params("10kΩ"))
+        self.assertEqual([p.lcsc for p in parts], [25744])
+        with self.assertRaises(ApiCacheMissError):
+            ApiClient().fetch_resistors(self._params("22kΩ"))
+        self.assertEqual(len(_Handler.requests), 1)
+
+        ApiClient.config.offline = False
+        ApiClient().fetch_resistors(self._params("10kΩ"))
+        self.assertEqual(len(_Handler.requests), 2)
+
+    def test_eviction(self):
+        cache = ResponseCache(self.cache_path, ttl=60, max_entries=10)
+        keys = [ResponseCache.key("GET", f"/{i}") for i in range(11)]
+        for i, key in enumerate(keys):
+            cache.put(key, i)
+            file = self.cache_path / f"{key}.json"
+            os.utime(file, (time.time() - 11 + i, time.time() - 11 + i))
+
+        self.assertEqual(len(list(self.cache_path.glob("*.json"))), 9)
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertEqual(cache.get(keys[-1]), 10)
+
+        # canonical
+        self.assertEqual(
+            ResponseCache.key("POST", "/q", {"a": 1, "b": 2}),
+            ResponseCache.key("POST", "/q", {"b": 2, "a": 1}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
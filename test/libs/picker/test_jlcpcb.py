@@ -0,0 +1,232 @@
+# This file is part of the faebryk project
+# SPDX-License-Identifier: MIT
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import faebryk.library._F as F
+import faebryk.libs.picker.jlcpcb.jlcpcb as P_jlcpcb
+from faebryk.libs.picker.jlcpcb.jlcpcb import (
+    JLCPCB_DB,
+    Component,
+    ComponentQuery,
+    MappingParameterDB,
+    _attribute_rows,
+)
+from faebryk.libs.picker.jlcpcb.picker_lib import (
+    _MAPPINGS_BY_TYPE,
+    TYPE_SPECIFIC_QUERIES,
+    find_resistor,
+    get_mapping,
+    prefetch_candidates,
+    query_resistor,
+)
+from faebryk.libs.units import P
+
+RATINGS = {"Power(Watts)": "62.5mW", "Overload Voltage (Max)": "50V"}
+COMPONENTS = {
+    # lcsc: (stock, attributes)
+    1: (100, {"Resistance": "10kΩ", "Tolerance": "±1%"} | RATINGS),
+    2: (100, {"Resistance": "10kΩ", "Tolerance": "±5%"} | RATINGS),
+    3: (100, {"Resistance": "12kΩ", "Tolerance": "±1%"} | RATINGS),
+    4: (100, {"Resistance": "9.9kΩ", "Tolerance": "±1%"} | RATINGS),
+    5: (100, {"Resistance": "10.1kΩ"}),
+    6: (0, {"Resistance": "10kΩ", "Tolerance": "±1%"} | RATINGS),
+    7: (100, {"Resistance": "10kΩ@1A", "Tolerance": "±1%"} | RATINGS),
+}
+
+
+def _create_db(path: Path):
+    con = sqlite3.connect(path / "cache.sqlite3")
+    con.executescript(
+        """
+        CREATE TABLE categories (
+            id INTEGER PRIMARY KEY, category TEXT, subcategory TEXT
+        );
+        CREATE TABLE manufacturers (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE components (
+            lcsc INTEGER PRIMARY KEY, category_id INTEGER, mfr TEXT, package TEXT,
+            joints INTEGER, manufacturer_id INTEGER, basic INTEGER,
+            description TEXT, datasheet TEXT, stock INTEGER, price TEXT,
+            last_update INTEGER, extra TEXT, flag INTEGER,
+            last_on_stock INTEGER, preferred INTEGER
+        );
+        INSERT INTO categories VALUES (1, 'Resistors', 'Chip Resistor - Surface Mount');
+        INSERT INTO categories VALUES (2, 'Capacitors', 'MLCC');
+        INSERT INTO manufacturers VALUES (1, 'Acme');
+        """
+    )
+    con.executemany(
+        "INSERT INTO components VALUES "
+        "(?, 1, 'R', '0402', 2, 1, 0, '', '', ?, '[]', 0, ?, 0, 0, 0)",
+        [
+            (lcsc, stock, json.dumps({"attributes": attributes}))
+            for lcsc, (stock, attributes) in COMPONENTS.items()
+        ],
+    )
+    con.commit()
+    con.close()
+
+
+class TestJLCPCBQuery(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        path = Path(self._tmp.name)
+        _create_db(path)
+        self._config = JLCPCB_DB.config
+        JLCPCB_DB.config = JLCPCB_DB.Config(db_path=path, no_download_prompt=True)
+        JLCPCB_DB.failed = None
+
+    def tearDown(self):
+        JLCPCB_DB.close()
+        JLCPCB_DB.config = self._config
+        self._tmp.cleanup()
+
+    def _query(self) -> ComponentQuery:
+        return (
+            ComponentQuery()
+            .filter_by_category("Resistors", "Chip Resistor")
+            .filter_by_stock(1)
+        )
+
+    def test_filter_by_value(self):
+        r = F.Resistor()
+        r.resistance.merge(F.Range.from_center_rel(10 * P.kohm, 0.02))
+        mapping = get_mapping(_MAPPINGS_BY_TYPE[F.Resistor], "resistance")
+
+        parts = self._query().filter_by_value(r.resistance, mapping).get()
+        self.assertEqual({c.lcsc for c in parts}, {1, 4, 7})
+
+        # the pushed down filter agrees with the parsed parameters
+        for c in parts:
+            self.assertTrue(
+                c.get_parameter(mapping).is_subset_of(r.resistance.get_most_narrow())
+            )
+
+        parts = (
+            self._query()
+            .filter_by_value(r.resistance, mapping, tolerance_requirement=0.01)
+            .get()
+        )
+        self.assertEqual({c.lcsc for c in parts}, {1, 4, 7})
+
+        r = F.Resistor()
+        r.resistance.merge(F.Constant(10.1 * P.kohm))
+        parts = self._query().filter_by_value(r.resistance, mapping).get()
+        self.assertEqual(parts, [])
+        parts = (
+            self._query()
+            .filter_by_value(
+                r.resistance, MappingParameterDB("resistance", ["Resistance"])
+            )
+            .get()
+        )
+        self.assertEqual({c.lcsc for c in parts}, {5})
+
+        # indexed attributes are remembered in the db
+        JLCPCB_DB.close()
+        db = JLCPCB_DB.get()
+        db.run(db.index_attributes([]))
+        self.assertEqual(db.indexed_attributes, {"Resistance", "Tolerance"})
+
+    def test_attribute_rows(self):
+        rows = list(
+            _attribute_rows(
+                1,
+                {"Resistance": "10kΩ", "Tolerance": "±1%", "Voltage": "5V~1A"},
+                ["Resistance", "Voltage", "Tolerance"],
+            )
+        )
+        # mismatching units of the range are skipped
+        self.assertEqual([name for _, name, *_ in rows], ["Resistance", "Tolerance"])
+        for bad in ["-", "5V/", "foo"]:
+            self.assertEqual(list(_attribute_rows(1, {"R": bad}, ["R"])), [])
+
+        # bugs are not swallowed
+        with patch.object(P_jlcpcb, "_parse_quantity", side_effect=KeyError):
+            with self.assertRaises(KeyError):
+                list(_attribute_rows(1, {"R": "10kΩ"}, ["R"]))
+
+    def test_filter_by_specified_parameters(self):
+        parts = (
+            self._query()
+            .filter_by_specified_parameters(_MAPPINGS_BY_TYPE[F.Resistor][:2])
+            .get()
+        )
+        self.assertEqual({c.lcsc for c in parts}, {1, 2, 3, 4, 7})
+
+    def test_lookup_tables(self):
+        db = JLCPCB_DB.get()
+        self.assertEqual(db.get_category_ids("resistors", "chip"), [1])
+        self.assertEqual(db.get_category_ids(), [1, 2])
+        self.assertEqual(db.get_manufacturer_ids("acme"), [1])
+        self.assertEqual(db.get_manufacturer_name(1), "Acme")
+        with self.assertRaises(LookupError):
+            db.get_category_ids("Inductors")
+        with self.assertRaises(LookupError):
+            db.get_manufacturer_ids("Nobody")
+
+        # served from memory
+        with patch.object(JLCPCB_DB, "execute", side_effect=AssertionError):
+            self.assertEqual(db.get_category_ids("Resistors", "Chip Resistor"), [1])
+            query = self._query().filter_by_manufacturer("Acme")
+        parts = query.get_rows()
+        self.assertTrue(parts)
+        with patch.object(JLCPCB_DB, "execute", side_effect=AssertionError):
+            self.assertEqual({c.mfr_name for c in parts}, {"Acme"})
+
+    def test_rows(self):
+        query = self._query()
+        orm_parts = JLCPCB_DB.get().run(query._queryset())
+        rows = query.sort_by_price().get_rows()
+        self.assertEqual(
+            [c.lcsc for c in rows],
+            [c.lcsc for c in sorted(orm_parts, key=lambda c: c.get_price(1))],
+        )
+
+        # rows read the same data as the models they are converted to
+        for row, part in zip(rows, query.get()):
+            self.assertIsInstance(part, Component)
+            self.assertEqual(row.lcsc, part.lcsc)
+            self.assertEqual(row.price, part.price)
+            self.assertEqual(row.extra_, part.extra_)
+            self.assertEqual(row.partno, part.partno)
+
+    def test_prefetch(self):
+        resistors = [F.Resistor() for _ in range(3)]
+        for r, value in zip(
+            resistors,
+            [
+                F.Range.from_center_rel(10 * P.kohm, 0.02),
+                F.Range.from_center_rel(10 * P.kohm, 0.02),
+                F.Range.from_center_rel(12 * P.kohm, 0.05),
+            ],
+        ):
+            r.resistance.merge(value)
+
+        expected = [[c.lcsc for c in query_resistor(r).get()] for r in resistors]
+        self.assertEqual(expected, [[1, 4, 7], [1, 4, 7], [3]])
+
+        with prefetch_candidates((r, find_resistor) for r in resistors):
+            # one entry per distinct query
+            self.assertEqual(len(ComponentQuery._prefetched), 2)
+            with patch.object(JLCPCB_DB, "execute", side_effect=AssertionError):
+                self.assertEqual(
+                    [[c.lcsc for c in query_resistor(r).get()] for r in resistors],
+                    expected,
+                )
+        self.assertEqual(ComponentQuery._prefetched, {})
+
+        # broken modules are left to the actual pick
+        def query(module):
+            if module is resistors[0]:
+                raise ZeroDivisionError()
+            return query_resistor(module)
+
+        with patch.dict(TYPE_SPECIFIC_QUERIES, {F.Resistor: query}):
+            with prefetch_candidates((r, find_resistor) for r in resistors):
+                self.assertEqual(len(ComponentQuery._prefetched), 2)
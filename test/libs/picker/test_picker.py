@@ -0,0 +1,77 @@
+# This file is part of the faebryk project
+# SPDX-License-Identifier: MIT
+
+import unittest
+from contextlib import contextmanager
+
+import faebryk.library._F as F
+from faebryk.core.module import Module
+from faebryk.libs.library import L
+from faebryk.libs.picker.picker import (
+    Part,
+    has_part_picked,
+    has_part_picked_defined,
+    has_part_picked_remove,
+    pick_part_recursively,
+)
+
+
+class TestPicker(unittest.TestCase):
+    def test_prefetch(self):
+        events = []
+
+        class RecordingPicker(F.has_multi_picker.Picker):
+            def pick(self, module: Module):
+                events.append(("pick", module))
+                module.add(
+                    has_part_picked_defined(
+                        Part("P1", has_part_picked_remove.RemovePart.NoSupplier())
+                    )
+                )
+
+            @classmethod
+            @contextmanager
+            def prefetch(cls, pickers):
+                events.append(("prefetch", {m for m, _ in pickers}))
+                yield
+                events.append(("done", None))
+
+        class App(Module):
+            resistors = L.list_field(3, F.Resistor)
+
+        app = App()
+        for r in app.resistors:
+            r.add(F.has_multi_picker(0, RecordingPicker()))
+
+        pick_part_recursively(app)
+
+        self.assertEqual(events[0], ("prefetch", set(app.resistors)))
+        self.assertEqual(events[-1], ("done", None))
+        self.assertEqual(
+            {m for e, m in events[1:-1]}, set(app.resistors), "picked in context"
+        )
+        self.assertTrue(all(r.has_trait(has_part_picked) for r in app.resistors))
+
+        events.clear()
+        app = App()
+        for r in app.resistors:
+            r.add(F.has_multi_picker(0, RecordingPicker()))
+        pick_part_recursively(app, prefetch=False)
+        self.assertEqual({e for e, _ in events}, {"pick"})
+
+        # only the picker tried first prepares
+        class OtherPicker(RecordingPicker):
+            @classmethod
+            @contextmanager
+            def prefetch(cls, pickers):
+                events.append(("other prefetch", {m for m, _ in pickers}))
+                yield
+
+        events.clear()
+        app = App()
+        for i, r in enumerate(app.resistors):
+            r.add(F.has_multi_picker(0, RecordingPicker()))
+            r.add(F.has_multi_picker(-1 if i == 0 else 1, OtherPicker()))
+        pick_part_recursively(app)
+        self.assertIn(("other prefetch", {app.resistors[0]}), events)
+        self.assertIn(("prefetch", set(app.resistors[1:])), events)
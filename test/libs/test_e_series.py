@@ -7,9 +7,13 @@ from itertools import pairwise
 import faebryk.library._F as F
 from faebryk.libs.e_series import (
     E_SERIES_VALUES,
+    _nearest,
     e_series_intersect,
     e_series_ratio,
+    e_series_values_in_range,
 )
+from faebryk.libs.picker.util import generate_si_values
+from faebryk.libs.units import P
 
 
 class TestESeries(unittest.TestCase):
@@ -43,6 +47,36 @@ class TestESeries(unittest.TestCase):
             F.Set([]),
         )
 
+    def test_values_in_range(self):
+        self.assertEqual(
+            e_series_values_in_range(1.5, 150, {1, 1.5, 9.9}),
+            [1.5, 9.9, 10, 15, 99, 100, 150],
+        )
+        # bounds are as tolerant as Constant comparison
+        self.assertEqual(
+            e_series_values_in_range(1.500001, 98.99999, {1, 1.5, 9.9}),
+            [1.5, 9.9, 10, 15, 99],
+        )
+        self.assertEqual(e_series_values_in_range(0.011, 0.014, {1, 1.5}), [])
+
+    def test_intersect_quantity(self):
+        self.assertEqual(
+            e_series_intersect(F.Range(9.5 * P.kohm, 11 * P.kohm), E_SERIES_VALUES.E24),
+            F.Set([F.Constant(10 * P.kohm), F.Constant(11 * P.kohm)]),
+        )
+
+    def test_generate_si_values(self):
+        r = F.Resistor()
+        r.resistance.merge(F.Range.from_center_rel(10 * P.kohm, 0.1))
+        self.assertEqual(
+            generate_si_values(r.resistance, "Ω", E_SERIES_VALUES.E12),
+            ["10kΩ"],
+        )
+        self.assertEqual(
+            generate_si_values(r.resistance, "Ω", E_SERIES_VALUES.E24),
+            ["9.1kΩ", "10kΩ", "11kΩ"],
+        )
+
     def test_ratio(self):
         self.assertEqual(
             e_series_ratio(
@@ -62,6 +96,23 @@ class TestESeries(unittest.TestCase):
             ),
             (F.Constant(9.09e3), F.Constant(115)),
         )
+        self.assertEqual(
+            e_series_ratio(
+                F.Range(10 * P.kohm, 99 * P.kohm),
+                F.Range(10 * P.kohm, 99 * P.kohm),
+                F.Range.from_center_rel(0.33, 0.01),
+                E_SERIES_VALUES.E96,
+            ),
+            (F.Constant(23.2 * P.kohm), F.Constant(11.5 * P.kohm)),
+        )
+
+    def test_nearest(self):
+        candidates = [F.Constant(v * P.ohm) for v in [100, 120, 150, 180]]
+        targets = [F.Constant(v) for v in [0.09 * P.kohm, 135 * P.ohm, 1 * P.kohm]]
+        self.assertEqual(
+            _nearest(candidates, targets),
+            [candidates[0], candidates[1], candidates[3]],
+        )
 
     def test_sets(self):
         E = E_SERIES_VALUES
@@ -0,0 +1,214 @@
+# This file is part of the faebryk project
+# SPDX-License-Identifier: MIT
+
+import io
+import logging
+import tempfile
+import unittest
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import sexpdata
+from sexpdata import Symbol
+
+from faebryk.libs.sexp import parser, writer
+from faebryk.libs.sexp.dataclass_sexp import (
+    DecodeError,
+    SEXP_File,
+    SymEnum,
+    dumps,
+    get_parent,
+    loads,
+    sexp_field,
+)
+from faebryk.libs.sexp.util import prettify_sexp_string
+from faebryk.libs.test.times import Times
+from faebryk.libs.util import find
+
+logger = logging.getLogger(__name__)
+
+TEST_DIR = find(
+    Path(__file__).parents,
+    lambda p: p.name == "test" and (p / "common/resources").is_dir(),
+)
+TEST_FILES = TEST_DIR / "common/resources"
+SEXP_FILES = [
+    TEST_FILES / name
+    for name in [
+        "fp-lib-table",
+        "test.kicad_mod",
+        "test.kicad_pcb",
+        "test.kicad_sch",
+        "test.kicad_sym",
+        "test.net",
+        "test_e.net",
+    ]
+]
+
+
+def _same(a, b) -> bool:
+    # sexpdata.Symbol("a") == "a" is False, but check types of all atoms anyway
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+class TestSexpParser(unittest.TestCase):
+    def test_same_as_sexpdata(self):
+        for text in [
+            '(a "b c" 1 -2.5 1e3 (d) () nil t "" "x\\"y\\\\z\\n")',
+            '(kicad_pcb (version 20240108) (generator "pcbnew") (uuid "0-1"))',
+            "(a\t(b\r\n c)  )  \n",
+            "(a 'b)",
+            "(a ; comment\n b)",
+            "(a [b])",
+            "(a\\ b c)",
+            "(a nbsp\xa0atom)",
+        ]:
+            self.assertTrue(
+                _same(parser.loads(text), sexpdata.loads(text)), msg=repr(text)
+            )
+
+        for path in SEXP_FILES:
+            text = path.read_text()
+            self.assertTrue(
+                _same(parser.loads(text), sexpdata.loads(text)), msg=str(path)
+            )
+
+    def test_errors(self):
+        for text in ["(a", "(a))", '(a "b)', "(a) (b)"]:
+            # malformed input is reported by sexpdata
+            with self.assertRaises(Exception):
+                parser.loads(text)
+
+    def test_interned(self):
+        a, b = parser.loads("((at 1 2) (at 1 3))")
+        self.assertIs(a[0], b[0])
+        self.assertIs(a[1], b[1])
+        self.assertEqual(a[0], Symbol("at"))
+
+        # mutable atoms are not shared
+        a, b = parser.loads("(nil nil)")
+        self.assertIsNot(a, b)
+
+    def test_performance(self):
+        times = Times()
+        for path in SEXP_FILES:
+            text = path.read_text()
+            times.add("_read")
+            sexpdata.loads(text)
+            times.add(f"sexpdata: {path.name}")
+            parser.loads(text)
+            times.add(f"parser: {path.name}")
+
+        logger.info(f"\n{times}")
+
+
+class TestSexpWriter(unittest.TestCase):
+    def _reference(self, sexp) -> str:
+        return prettify_sexp_string(sexpdata.dumps(sexp))
+
+    def test_same_as_prettify(self):
+        for sexp in [
+            [Symbol("a")],
+            [Symbol("a"), [Symbol("b"), 1, -2.5], "c d", [[]], None, True, False],
+            [Symbol("a"), Symbol(""), Symbol("b"), [Symbol("")], Symbol("")],
+            [Symbol("a"), "x\\z\n(", Symbol("s p"), [Symbol("b"), "  "]],
+            [[Symbol("a")], Symbol("b"), [Symbol("c"), [Symbol("d")]], 1],
+        ]:
+            self.assertEqual(writer.dumps(sexp), self._reference(sexp), msg=sexp)
+
+        for path in SEXP_FILES:
+            sexp = parser.loads(path.read_text())
+            self.assertEqual(writer.dumps(sexp), self._reference(sexp), msg=path)
+
+        # prettify_sexp_string does not know about escaped quotes
+        self.assertEqual(
+            writer.dumps([Symbol("a"), 'x"(  "', [Symbol("b")]]),
+            '(a "x\\"(  \\"" \n    (b))',
+        )
+
+    def test_chunked(self):
+        sexp = [Symbol("a")]
+        for i in range(20000):
+            sexp += [Symbol("b"), Symbol(""), [i]]
+        out = io.StringIO()
+        writer.dump(sexp, out)
+        self.assertEqual(out.getvalue(), self._reference(sexp))
+
+
+@dataclass
+class C_pad:
+    class E_type(SymEnum):
+        smd = "smd"
+        thru_hole = "thru_hole"
+
+    name: str = field(**sexp_field(positional=True))
+    type: E_type = field(**sexp_field(positional=True))
+    at: tuple[float, float] = field(**sexp_field(order=-1))
+    hide: bool | None = None
+
+
+@dataclass
+class C_footprint:
+    name: str = field(**sexp_field(positional=True))
+    pads: list[C_pad] = field(**sexp_field(multidict=True), default_factory=list)
+    layers: list[str] = field(default_factory=list)
+
+
+@dataclass
+class C_file(SEXP_File):
+    footprint: C_footprint
+
+
+class TestDataclassSexp(unittest.TestCase):
+    TEXT = (
+        '(footprint "R1" (layers "F.Cu" "B.Cu")'
+        ' (pad "1" smd (at 1 -0.5) (hide yes))'
+        ' (pad "2" thru_hole (at 2.5 0)))'
+    )
+
+    def test_loads_dumps(self):
+        fp = C_file.loads(self.TEXT).footprint
+        self.assertEqual(fp.name, "R1")
+        self.assertEqual(fp.layers, ["F.Cu", "B.Cu"])
+        self.assertEqual(
+            [(p.name, p.type, p.at, p.hide) for p in fp.pads],
+            [
+                ("1", C_pad.E_type.smd, (1.0, -0.5), True),
+                ("2", C_pad.E_type.thru_hole, (2.5, 0.0), None),
+            ],
+        )
+        self.assertIs(get_parent(fp.pads[0], C_footprint), fp)
+
+        # decoded with the same compiled plans every time
+        self.assertEqual(C_file.loads(self.TEXT).footprint, fp)
+        self.assertEqual(loads(dumps(C_file(fp)), C_file).footprint, fp)
+
+        out = io.StringIO()
+        C_file(fp).dump(out)
+        self.assertEqual(out.getvalue(), dumps(C_file(fp)))
+
+    def test_dump_keeps_file_on_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "test.kicad_mod"
+            C_file.loads(self.TEXT).dump(path)
+            text = path.read_text()
+            self.assertEqual(text, dumps(C_file.loads(self.TEXT)))
+
+            broken = C_file.loads(self.TEXT)
+            broken.footprint.pads = None  # type: ignore
+            with self.assertRaises(TypeError):
+                broken.dump(path)
+            self.assertEqual(path.read_text(), text)
+            self.assertEqual(list(Path(tmp).iterdir()), [path])
+
+    def test_decode_error(self):
+        with self.assertRaisesRegex(DecodeError, "footprint.pads.at"):
+            C_file.loads('(footprint "R1" (pad "1" smd (at x 0)))')
+
+
+if __name__ == "__main__":
+    unittest.main()
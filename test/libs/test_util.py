@@ -1,11 +1,19 @@
 # This file is part of the faebryk project
 # SPDX-License-Identifier: MIT
 
+import tempfile
 import unittest
 from itertools import combinations
+from pathlib import Path
 
 from faebryk.libs.logging import setup_basic_logging
-from faebryk.libs.util import SharedReference, assert_once, once, zip_non_locked
+from faebryk.libs.util import (
+    SharedReference,
+    assert_once,
+    atomic_write,
+    once,
+    zip_non_locked,
+)
 
 
 class TestUtil(unittest.TestCase):
@@ -129,6 +137,32 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(a.a, 3)
         self.assertRaises(AssertionError, a.do_with_arg, 2)
 
+    def test_atomic_write(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            path = tmp / "file"
+            ref = tmp / "ref"
+            ref.touch()
+
+            with atomic_write(path) as f:
+                f.write("a")
+            self.assertEqual(path.read_text(), "a")
+            # new files get the same mode as any other file created by open
+            self.assertEqual(path.stat().st_mode, ref.stat().st_mode)
+
+            path.chmod(0o640)
+            with self.assertRaises(RuntimeError):
+                with atomic_write(path) as f:
+                    f.write("b")
+                    raise RuntimeError()
+            self.assertEqual(path.read_text(), "a")
+            self.assertEqual(sorted(tmp.iterdir()), [path, ref])
+
+            with atomic_write(path) as f:
+                f.write("c")
+            self.assertEqual(path.read_text(), "c")
+            self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+
 
 if __name__ == "__main__":
     setup_basic_logging()